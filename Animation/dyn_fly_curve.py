@@ -1,10 +1,11 @@
 import maya.cmds as cmds
+from Environment.height_query import obtener_consulta
 import math
 import random
 
 def crear_curva_dinamica(nombre="curva_vuelo", radio=60, altura_base=20,
                             num_loops=2, num_espirales=2, num_puntos=100,
-                            intensidad=1.2):
+                            intensidad=1.2, despeje_terreno=None, terreno="terreno"):
     """
     Crea una curva tipo montaña rusa con loops, espirales y giros extremos
     
@@ -16,6 +17,8 @@ def crear_curva_dinamica(nombre="curva_vuelo", radio=60, altura_base=20,
         num_espirales: Número de espirales tipo sacacorchos
         num_puntos: Cantidad de puntos (más = más suave)
         intensidad: Multiplicador de dramatismo (0.5 = suave, 2.0 = extremo)
+        despeje_terreno: Altura mínima sobre el suelo (None = no se comprueba el terreno)
+        terreno: Nombre del terreno cuya consulta de altura se usa para el despeje
     """
     
     # Eliminar curva previa si existe
@@ -93,6 +96,14 @@ def crear_curva_dinamica(nombre="curva_vuelo", radio=60, altura_base=20,
     # Agregar punto final que conecte con el inicio
     puntos.append(puntos[0])
     
+    # Mantener el despeje sobre el terreno (una sola consulta vectorizada para todos los puntos)
+    if despeje_terreno is not None:
+        consulta = obtener_consulta(terreno)
+        if consulta is not None:
+            puntos = [tuple(p) for p in consulta.elevar_puntos(puntos, despeje_terreno).tolist()]
+        else:
+            cmds.warning(f"No hay consulta de altura para '{terreno}', se omite el despeje.")
+    
     # Crear la curva NURBS
     curva = cmds.curve(p=puntos, degree=3, name=nombre)
     
@@ -1,10 +1,11 @@
 import maya.cmds as cmds
+from Environment.height_query import obtener_consulta
 import math
 import random
 
 def crear_curva_vuelo(nombre="curva_vuelo", radio=65, altura_base=15, 
                       variacion_altura=8, num_puntos=50, ondulaciones=4,
-                      tipo="circular"):
+                      tipo="circular", despeje_terreno=None, terreno="terreno"):
     """
     Crea una curva suave para que el avión la siga en su vuelo
     
@@ -16,6 +17,8 @@ def crear_curva_vuelo(nombre="curva_vuelo", radio=65, altura_base=15,
         num_puntos: Cantidad de puntos de control (más = más suave)
         ondulaciones: Número de subidas/bajadas en el recorrido
         tipo: "circular", "eliptica", o "aleatorio"
+        despeje_terreno: Altura mínima sobre el suelo (None = no se comprueba el terreno)
+        terreno: Nombre del terreno cuya consulta de altura se usa para el despeje
     """
     
     # Eliminar curva previa si existe
@@ -54,6 +57,14 @@ def crear_curva_vuelo(nombre="curva_vuelo", radio=65, altura_base=15,
         
         puntos.append((x, y, z))
     
+    # Mantener el despeje sobre el terreno (una sola consulta vectorizada para todos los puntos)
+    if despeje_terreno is not None:
+        consulta = obtener_consulta(terreno)
+        if consulta is not None:
+            puntos = [tuple(p) for p in consulta.elevar_puntos(puntos, despeje_terreno).tolist()]
+        else:
+            cmds.warning(f"No hay consulta de altura para '{terreno}', se omite el despeje.")
+    
     # Crear la curva NURBS
     curva = cmds.curve(p=puntos, degree=3, name=nombre)
     
@@ -1,20 +1,78 @@
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import numpy as np
 import random
 import math
-from Utils.soft_edges import soften_edges_en_grupo
+from Utils.normales import obtener_finalizador
+from Environment.height_query import obtener_consulta
+from Environment.cloud_mesh import malla_nube
+from Environment.poisson import centros_nubes_poisson, offsets_partes_poisson
 
-def crear_nube(nombre="nube", posicion=(0, 0, 0), escala=5, densidad=10):
+# Parámetros de bisel compartidos por las nubes clásicas y los prototipos instanciados
+PARAMETROS_BISEL = dict(
+    fraction=0.2,           # Tamaño del bisel (20% del edge)
+    offsetAsFraction=True,
+    autoFit=True,
+    depth=1,
+    mitering=0,             # Sin mitering para bordes más suaves
+    miterAlong=0,
+    chamfer=True,
+    segments=2,             # Segmentos del bisel
+    worldSpace=True,
+    smoothingAngle=30,
+    subdivideNgons=True,
+    mergeVertices=True,
+    mergeVertexTolerance=0.0001,
+    miteringAngle=180,
+    angleTolerance=180,
+)
+
+MODOS_NUBES = ("cubos", "instancias", "instancer", "malla")
+DISTRIBUCIONES_NUBES = ("aleatoria", "poisson")
+
+
+def _rng_numpy():
+    """Generador NumPy derivado del estado de `random`, para que random.seed() siga mandando."""
+    return np.random.default_rng(random.getrandbits(32))
+
+
+def _partes_nube(posicion, escala, densidad, distribucion="aleatoria"):
+    """
+    Transformaciones aleatorias de las partes de una nube.
+    Con distribucion="poisson" los desplazamientos son ruido azul (puede haber menos
+    de `densidad` partes si no caben a la separación mínima).
+
+    Returns:
+        Lista de tuplas (traslacion, tamanio, rotacion).
+    """
+    if distribucion == "poisson":
+        offsets = offsets_partes_poisson(escala, densidad, _rng_numpy()).tolist()
+    else:
+        offsets = None
+
+    partes = []
+    for i in range(densidad if offsets is None else len(offsets)):
+        if offsets is None:
+            offset_x = random.uniform(-escala, escala)
+            offset_y = random.uniform(-escala * 0.3, escala * 0.3)
+            offset_z = random.uniform(-escala * 0.7, escala * 0.7)
+        else:
+            offset_x, offset_y, offset_z = offsets[i]
+        tamanio = random.uniform(escala * 0.3, escala * 0.8)
+        rotacion = (random.uniform(0, 360), random.uniform(0, 360), random.uniform(0, 360))
+        traslacion = (posicion[0] + offset_x, posicion[1] + offset_y, posicion[2] + offset_z)
+        partes.append((traslacion, tamanio, rotacion))
+    return partes
+
+
+def crear_nube(nombre="nube", posicion=(0, 0, 0), escala=5, densidad=10, distribucion="aleatoria"):
     """
     Crea una nube volumétrica usando cubos biselados agrupados
     """
     grupo_nube = cmds.group(empty=True, name=nombre)
+    partes = _partes_nube(posicion, escala, densidad, distribucion)
     
-    for i in range(densidad):
-        offset_x = random.uniform(-escala, escala)
-        offset_y = random.uniform(-escala * 0.3, escala * 0.3)
-        offset_z = random.uniform(-escala * 0.7, escala * 0.7)
-        tamanio = random.uniform(escala * 0.3, escala * 0.8)
-        
+    for i, (traslacion, tamanio, rotacion) in enumerate(partes):
         # Crear cubo en lugar de esfera
         cubo = cmds.polyCube(
             w=tamanio, 
@@ -26,51 +84,161 @@ def crear_nube(nombre="nube", posicion=(0, 0, 0), escala=5, densidad=10):
         
         # Aplicar bevel a las aristas del cubo
         try:
-            cmds.polyBevel3(
-                cubo,
-                fraction=0.2,           # Tamaño del bisel (20% del edge)
-                offsetAsFraction=True,
-                autoFit=True,
-                depth=1,
-                mitering=0,             # Sin mitering para bordes más suaves
-                miterAlong=0,
-                chamfer=True,
-                segments=2,             # Segmentos del bisel
-                worldSpace=True,
-                smoothingAngle=30,
-                subdivideNgons=True,
-                mergeVertices=True,
-                mergeVertexTolerance=0.0001,
-                miteringAngle=180,
-                angleTolerance=180,
-                ch=True
-            )
+            cmds.polyBevel3(cubo, ch=True, **PARAMETROS_BISEL)
         except Exception as e:
             cmds.warning(f"No se pudo aplicar bevel al cubo {cubo}: {e}")
         
         # Posicionar el cubo
-        cmds.move(posicion[0] + offset_x, 
-                 posicion[1] + offset_y, 
-                 posicion[2] + offset_z, 
-                 cubo)
+        cmds.move(*traslacion, cubo)
         
         # Rotación aleatoria para más variedad
-        cmds.rotate(
-            random.uniform(0, 360),
-            random.uniform(0, 360),
-            random.uniform(0, 360),
-            cubo
-        )
+        cmds.rotate(*rotacion, cubo)
         
         cmds.parent(cubo, grupo_nube)
     
     return grupo_nube
 
 
-def crear_campo_nubes(num_nubes=10, radio_distribucion=100, altura_min=-18, altura_max=0):
+def crear_nube_malla(nombre, posicion, escala, densidad, segmentos=2, distribucion="aleatoria"):
+    """
+    Crea la nube como una sola malla: los cubos biselados se calculan en NumPy
+    (Environment.cloud_mesh) y se crean con una llamada a MFnMesh.create, con normales
+    suaves ya calculadas (sin polyCube, polyBevel3, move, rotate ni parent por parte).
+    """
+    partes = _partes_nube(posicion, escala, densidad, distribucion)
+    traslaciones = np.array([traslacion for traslacion, _, _ in partes])
+    tamanios = np.array([tamanio for _, tamanio, _ in partes])
+    rotaciones = np.array([rotacion for _, _, rotacion in partes])
+
+    vertices, caras, normales = malla_nube(traslaciones, tamanios, rotaciones,
+                                           PARAMETROS_BISEL["fraction"], segmentos)
+
+    fn_mesh = om.MFnMesh()
+    transform = fn_mesh.create(
+        om.MPointArray(vertices.tolist()),
+        om.MIntArray([4] * len(caras)),
+        om.MIntArray(caras.ravel().tolist()),
+    )
+    fn_mesh.setVertexNormals(om.MVectorArray(normales.tolist()),
+                             om.MIntArray(range(len(vertices))), om.MSpace.kObject)
+
+    nube = cmds.rename(om.MFnDagNode(transform).fullPathName(), nombre)
+    cmds.sets(nube, e=True, forceElement="initialShadingGroup")
+    obtener_finalizador().marcar(nube, etapa="nubes_malla")
+    return nube
+
+
+def crear_prototipos_nube(grupo_padre, num_prototipos=3):
+    """
+    Crea una vez los cubos biselados unitarios que comparten todas las partes de nube.
+    Cada prototipo tiene un bisel ligeramente distinto para dar variedad; quedan ocultos
+    y sin historial dentro de un grupo bajo `grupo_padre`.
+
+    Returns:
+        Lista de nombres de los prototipos.
+    """
+    grupo = cmds.group(empty=True, name="nube_prototipos", parent=grupo_padre)
+    prototipos = []
+
+    for i in range(num_prototipos):
+        cubo = cmds.polyCube(w=1, h=1, d=1, sx=1, sy=1, sz=1, name=f"nube_prototipo_{i}")[0]
+        bisel = dict(PARAMETROS_BISEL, fraction=0.15 + 0.1 * i / max(num_prototipos - 1, 1),
+                     worldSpace=False)
+        try:
+            cmds.polyBevel3(cubo, ch=False, **bisel)
+        except Exception as e:
+            cmds.warning(f"No se pudo aplicar bevel al prototipo {cubo}: {e}")
+        prototipos.append(cmds.parent(cubo, grupo)[0])
+
+    obtener_finalizador().suavizar(prototipos, etapa="nubes_prototipos")
+    cmds.setAttr(grupo + ".visibility", 0)
+    return prototipos
+
+
+def crear_nube_instanciada(nombre, posicion, escala, densidad, prototipos, distribucion="aleatoria"):
+    """
+    Igual que crear_nube pero cada parte es una instancia de un prototipo ya biselado:
+    solo se crea un transform por parte (sin polyCube ni polyBevel3).
+    """
+    grupo_nube = cmds.group(empty=True, name=nombre)
+    partes = _partes_nube(posicion, escala, densidad, distribucion)
+
+    for i, (traslacion, tamanio, rotacion) in enumerate(partes):
+        parte = cmds.instance(random.choice(prototipos), name=f"{nombre}_parte_{i}")[0]
+        parte = cmds.parent(parte, grupo_nube)[0]
+        cmds.xform(parte, translation=traslacion, rotation=rotacion,
+                   scale=(tamanio, tamanio, tamanio), worldSpace=True)
+
+    return grupo_nube
+
+
+def crear_instancer_nubes(nombre, partes, prototipos):
+    """
+    Coloca todas las partes de todas las nubes con un único particleInstancer:
+    un solo nodo de partículas con posición, rotación, escala y prototipo por partícula.
+    Pensado para campos de miles de nubes.
+
+    Args:
+        partes: Lista de tuplas (traslacion, tamanio, rotacion) de _partes_nube.
+        prototipos: Prototipos creados con crear_prototipos_nube.
+    """
+    particulas = cmds.particle(position=[traslacion for traslacion, _, _ in partes], name=nombre)[0]
+    shape = cmds.listRelatives(particulas, shapes=True)[0]
+    cmds.setAttr(shape + ".isDynamic", 0)
+
+    datos = {
+        "rotacionPP": ("vectorArray", [rotacion for _, _, rotacion in partes]),
+        "escalaPP": ("vectorArray", [(tamanio, tamanio, tamanio) for _, tamanio, _ in partes]),
+        "prototipoPP": ("doubleArray", [random.randrange(len(prototipos)) for _ in partes]),
+    }
+    for atributo, (tipo, valores) in datos.items():
+        for sufijo in ("", "0"):
+            cmds.addAttr(shape, longName=atributo + sufijo, dataType=tipo)
+        cmds.setAttr(f"{shape}.{atributo}", valores, type=tipo)
+        cmds.setAttr(f"{shape}.{atributo}0", valores, type=tipo)
+    cmds.saveInitialState(shape)
+
+    instancer = cmds.particleInstancer(
+        shape, addObject=True, object=prototipos, cycle="None",
+        rotation="rotacionPP", scale="escalaPP", objectIndex="prototipoPP",
+        name=nombre + "_instancer"
+    )
+    return particulas, instancer
+
+
+def _centro_aleatorio(radio_distribucion, altura_min, altura_max):
+    """Centro uniforme en ángulo y distancia (distribución original, sin control de solape)."""
+    angulo = random.uniform(0, 2 * math.pi)
+    distancia = random.uniform(radio_distribucion * 0.3, radio_distribucion)
+    y = random.uniform(altura_min, altura_max)
+    return math.cos(angulo) * distancia, y, math.sin(angulo) * distancia
+
+
+def crear_campo_nubes(num_nubes=10, radio_distribucion=100, altura_min=-18, altura_max=0,
+                      despeje_terreno=None, terreno="terreno", modo="cubos", num_prototipos=3,
+                      distribucion="aleatoria", separacion=None, caida_radial=0.0, caida_altura=0.0):
     """
     Crea múltiples nubes distribuidas alrededor de la escena
+
+    Args:
+        despeje_terreno: Distancia mínima sobre el suelo (None = no se comprueba el terreno).
+        terreno: Nombre del terreno cuya consulta de altura se usa para el despeje.
+        modo: "cubos" (un polyCube + polyBevel3 por parte), "instancias" (instancias de
+            prototipos biselados una sola vez), "instancer" (un particleInstancer para
+            todo el campo, para miles de nubes) o "malla" (una malla por nube generada
+            en NumPy).
+        num_prototipos: Prototipos biselados distintos en los modos instanciados.
+        distribucion: "aleatoria" (ángulo/distancia uniformes) o "poisson" (ruido azul sin
+            grumos para centros y partes; las posiciones dentro del terreno se rechazan).
+        separacion: Distancia mínima entre centros en modo poisson (None = automática).
+        caida_radial: 0-1, la densidad de nubes baja hacia el borde del campo (poisson).
+        caida_altura: 0-1, la densidad baja hacia los extremos de la banda de alturas (poisson).
     """
+    if modo not in MODOS_NUBES:
+        raise ValueError(f"Modo de nubes desconocido: {modo}. Opciones: {MODOS_NUBES}")
+    if distribucion not in DISTRIBUCIONES_NUBES:
+        raise ValueError(f"Distribución desconocida: {distribucion}. Opciones: {DISTRIBUCIONES_NUBES}")
+
     nombre_grupo = "campo_nubes"
 
     # ELIMINAR GRUPO PREVIO SI EXISTE
@@ -79,33 +247,82 @@ def crear_campo_nubes(num_nubes=10, radio_distribucion=100, altura_min=-18, altu
         cmds.delete(nombre_grupo)
     
     grupo_nubes = cmds.group(empty=True, name=nombre_grupo)
+    prototipos = None
+    if modo in ("instancias", "instancer"):
+        prototipos = crear_prototipos_nube(grupo_nubes, num_prototipos)
+    partes_instancer = []
+    
+    despeje = despeje_terreno or 0.0
+    if distribucion == "poisson":
+        # El rechazo dentro del terreno se hace siempre que haya consulta de altura
+        consulta = obtener_consulta(terreno)
+        centros = centros_nubes_poisson(
+            num_nubes, radio_distribucion, altura_min, altura_max, _rng_numpy(),
+            separacion=separacion, caida_radial=caida_radial, caida_altura=caida_altura,
+            suelo=consulta.altura if consulta is not None else None,
+            despeje=despeje,
+        ).tolist()
+        if len(centros) < num_nubes:
+            cmds.warning(f"Solo caben {len(centros)} nubes con la separación indicada.")
+        num_nubes = len(centros)
+    else:
+        # Cada centro se sortea dentro del bucle, intercalado con la escala y la densidad de
+        # su nube como siempre, para que la misma semilla reproduzca los campos anteriores
+        centros = None
+        consulta = obtener_consulta(terreno) if despeje_terreno is not None else None
+        if despeje_terreno is not None and consulta is None:
+            cmds.warning(f"No hay consulta de altura para '{terreno}', se omite el despeje.")
     
     for i in range(num_nubes):
-        angulo = random.uniform(0, 2 * math.pi)
-        distancia = random.uniform(radio_distribucion * 0.3, radio_distribucion)
-        
-        x = math.cos(angulo) * distancia
-        z = math.sin(angulo) * distancia
-        y = random.uniform(altura_min, altura_max)
+        if centros is not None:
+            x, y, z = centros[i]
+        else:
+            x, y, z = _centro_aleatorio(radio_distribucion, altura_min, altura_max)
         escala = random.uniform(4, 8)
         
+        # Mismo despeje en ambas distribuciones: el centro más el margen de la propia nube
+        if consulta is not None:
+            suelo = float(consulta.altura(x, z))
+            y = max(y, suelo + despeje + escala * 0.3)
+        
+        densidad = random.randint(6, 10)
+        
+        if modo == "instancer":
+            partes_instancer.extend(_partes_nube((x, y, z), escala, densidad, distribucion))
+            continue
+        
+        if modo == "instancias":
+            nube = crear_nube_instanciada(f"nube_{i+1}", (x, y, z), escala, densidad, prototipos,
+                                          distribucion)
+            cmds.parent(nube, grupo_nubes)
+            continue
+        
+        if modo == "malla":
+            nube = crear_nube_malla(f"nube_{i+1}", (x, y, z), escala, densidad,
+                                    distribucion=distribucion)
+            cmds.parent(nube, grupo_nubes)
+            continue
+        
         nube = crear_nube(
             nombre=f"nube_{i+1}", 
             posicion=(x, y, z), 
             escala=escala,
-            densidad=random.randint(6, 10)
+            densidad=densidad,
+            distribucion=distribucion
         )
-        
-        # Suavizar bordes
-        try:
-            cmds.polySoftEdge(nube, angle=180, ch=False)
-        except Exception as e:
-            cmds.warning(f"No se pudo suavizar la nube {nube}: {e}")
-        
         cmds.parent(nube, grupo_nubes)
     
-    print(f"Campo de nubes creado con {num_nubes} nubes. Grupo: '{nombre_grupo}'")
-    soften_edges_en_grupo(nombre_grupo, angle=180, keep_history=False)
+    if modo == "instancer" and partes_instancer:
+        particulas, instancer = crear_instancer_nubes("nubes_particulas", partes_instancer, prototipos)
+        cmds.parent(particulas, grupo_nubes)
+        cmds.parent(instancer, grupo_nubes)
+    
+    print(f"Campo de nubes creado con {num_nubes} nubes (modo '{modo}', "
+          f"distribución '{distribucion}'). Grupo: '{nombre_grupo}'")
+    # Suavizado de aristas de todo el campo en una sola pasada (cada malla una vez)
+    conteo = obtener_finalizador().suavizar(grupo_nubes, etapa="nubes")
+    print(f"Normales: {conteo['procesadas']} mallas suavizadas, {conteo['omitidas']} ya finalizadas "
+          f"({conteo['segundos']:.3f} s)")
     return grupo_nubes
 
 
@@ -0,0 +1,139 @@
+"""
+Kernel NumPy de geometría de nubes: cubos biselados con su desplazamiento, rotación y
+escala, combinados en una sola malla por nube. Devuelve arrays de vértices, caras y
+normales que Environment.cloud entrega a Maya en una única llamada a MFnMesh.create.
+Sin dependencias de Maya.
+"""
+
+import math
+import numpy as np
+
+# Cara del cubo: (eje normal, signo); los otros dos ejes recorren la rejilla
+_CARAS_CUBO = ((0, 1), (0, -1), (1, 1), (1, -1), (2, 1), (2, -1))
+
+
+def _coordenadas_bisel(fraccion, segmentos_cara):
+    """
+    Coordenadas 1D de la rejilla de cada cara de un cubo de lado 1.
+    Los puntos del bisel se colocan con tan() para que, al proyectarlos sobre el
+    redondeo, queden repartidos a ángulos iguales.
+    """
+    interior = 0.5 - fraccion
+    angulos = np.arange(segmentos_cara + 1) * (math.pi / 4.0) / segmentos_cara
+    positivas = interior + fraccion * np.tan(angulos)
+    positivas[-1] = 0.5  # tan(pi/4) exacto
+    return np.concatenate([-positivas[::-1], positivas])
+
+
+def _rejilla_cubo(m):
+    """
+    Índices enteros (i, j, k) de los vértices de la superficie de un cubo con m puntos por
+    lado, y quads (F, 4) orientados hacia fuera. Los vértices compartidos entre caras se
+    fusionan.
+    """
+    u, v = np.meshgrid(np.arange(m - 1), np.arange(m - 1), indexing="ij")
+    u, v = u.ravel(), v.ravel()
+    esquinas = [(u, v), (u + 1, v), (u + 1, v + 1), (u, v + 1)]
+
+    indices = []
+    for eje, signo in _CARAS_CUBO:
+        eje_u, eje_v = (eje + 1) % 3, (eje + 2) % 3
+        fijo = m - 1 if signo > 0 else 0
+        quad = []
+        for cu, cv in esquinas:
+            punto = np.empty((len(u), 3), dtype=np.int64)
+            punto[:, eje] = fijo
+            punto[:, eje_u] = cu
+            punto[:, eje_v] = cv
+            quad.append(punto)
+        if signo < 0:
+            quad = quad[::-1]
+        indices.append(np.stack(quad, axis=1))
+
+    indices = np.concatenate(indices).reshape(-1, 3)
+    unicos, inversa = np.unique(indices, axis=0, return_inverse=True)
+    return unicos, inversa.reshape(-1, 4)
+
+
+def cubo_biselado(fraccion=0.2, segmentos=2):
+    """
+    Cubo de lado 1 centrado en el origen con las aristas biseladas (redondeadas).
+
+    Args:
+        fraccion: Anchura del bisel en cada cara, como fracción del lado (0-0.5).
+        segmentos: Segmentos alrededor de cada arista (se redondea a par).
+
+    Returns:
+        Tupla (vertices (V, 3), caras (F, 4), normales (V, 3)).
+    """
+    fraccion = float(np.clip(fraccion, 0.0, 0.5))
+    segmentos_cara = max(1, int(math.ceil(segmentos / 2.0)))
+    coordenadas = _coordenadas_bisel(fraccion, segmentos_cara)
+
+    enteros, caras = _rejilla_cubo(len(coordenadas))
+    puntos = coordenadas[enteros]
+
+    # Proyectar sobre la caja redondeada: núcleo interior + radio en la dirección del punto
+    interior = np.clip(puntos, -(0.5 - fraccion), 0.5 - fraccion)
+    direccion = puntos - interior
+    longitud = np.linalg.norm(direccion, axis=1, keepdims=True)
+    normales = direccion / np.maximum(longitud, 1e-12)
+    if fraccion > 0.0:
+        puntos = interior + fraccion * normales
+
+    return puntos, caras, normales
+
+
+def matrices_rotacion(rotaciones):
+    """
+    Matrices (N, 3, 3) para rotaciones euler en grados con orden xyz (el de Maya por defecto),
+    para aplicar como puntos @ matriz (vectores fila).
+    """
+    rx, ry, rz = np.radians(np.asarray(rotaciones, dtype=np.float64)).T
+    cx, sx, cy, sy, cz, sz = np.cos(rx), np.sin(rx), np.cos(ry), np.sin(ry), np.cos(rz), np.sin(rz)
+    uno, cero = np.ones_like(rx), np.zeros_like(rx)
+
+    mx = np.stack([uno, cero, cero, cero, cx, sx, cero, -sx, cx], axis=-1).reshape(-1, 3, 3)
+    my = np.stack([cy, cero, -sy, cero, uno, cero, sy, cero, cy], axis=-1).reshape(-1, 3, 3)
+    mz = np.stack([cz, sz, cero, -sz, cz, cero, cero, cero, uno], axis=-1).reshape(-1, 3, 3)
+    return mx @ my @ mz
+
+
+def partes_nube_aleatorias(rng, posicion, escala, densidad):
+    """
+    Versión NumPy de las transformaciones aleatorias de las partes de una nube
+    (mismas distribuciones que Environment.cloud).
+
+    Returns:
+        Tupla (traslaciones (N, 3), tamanios (N,), rotaciones (N, 3)).
+    """
+    limites = np.array([escala, escala * 0.3, escala * 0.7])
+    traslaciones = np.asarray(posicion, dtype=np.float64) + rng.uniform(-limites, limites, (densidad, 3))
+    tamanios = rng.uniform(escala * 0.3, escala * 0.8, densidad)
+    rotaciones = rng.uniform(0.0, 360.0, (densidad, 3))
+    return traslaciones, tamanios, rotaciones
+
+
+def malla_nube(traslaciones, tamanios, rotaciones, fraccion=0.2, segmentos=2):
+    """
+    Combina todos los cubos biselados de una nube en una sola malla.
+
+    Args:
+        traslaciones: (N, 3) centro de cada parte.
+        tamanios: (N,) lado de cada parte.
+        rotaciones: (N, 3) rotación euler xyz en grados.
+        fraccion, segmentos: Bisel de los cubos (como en cubo_biselado).
+
+    Returns:
+        Tupla (vertices (N*V, 3), caras (N*F, 4), normales (N*V, 3)).
+    """
+    base, caras_base, normales_base = cubo_biselado(fraccion, segmentos)
+    traslaciones = np.asarray(traslaciones, dtype=np.float64).reshape(-1, 3)
+    tamanios = np.asarray(tamanios, dtype=np.float64).reshape(-1)
+    matrices = matrices_rotacion(np.asarray(rotaciones).reshape(-1, 3))
+
+    vertices = (base[None] * tamanios[:, None, None]) @ matrices + traslaciones[:, None, :]
+    normales = normales_base[None] @ matrices
+    caras = caras_base[None] + (np.arange(len(tamanios)) * len(base))[:, None, None]
+
+    return vertices.reshape(-1, 3), caras.reshape(-1, 4), normales.reshape(-1, 3)
@@ -0,0 +1,148 @@
+"""
+Erosión térmica e hidráulica sobre heightfields como kernels de arrays NumPy.
+Cada iteración opera sobre todo el grid a la vez (sin bucles por celda en Python).
+Sin dependencias de Maya.
+"""
+
+import math
+import time
+import numpy as np
+
+# Vecinos en 4 direcciones: (slice del vecino en el array con borde, slice destino, slice origen)
+_DIRECCIONES = (
+    ((slice(1, -1), slice(None, -2)), (slice(None), slice(None, -1)), (slice(None), slice(1, None))),   # oeste
+    ((slice(1, -1), slice(2, None)), (slice(None), slice(1, None)), (slice(None), slice(None, -1))),    # este
+    ((slice(None, -2), slice(1, -1)), (slice(None, -1), slice(None)), (slice(1, None), slice(None))),   # norte
+    ((slice(2, None), slice(1, -1)), (slice(1, None), slice(None)), (slice(None, -1), slice(None))),    # sur
+)
+
+
+def _diferencias(campo):
+    """Diferencia positiva del campo respecto a cada uno de sus 4 vecinos (bordes sin flujo)."""
+    ext = np.pad(campo, 1, mode="edge")
+    return [np.maximum(campo - ext[vecino], 0.0) for vecino, _, _ in _DIRECCIONES]
+
+
+def _repartir(destino, cantidad, fracciones):
+    """Suma a cada vecino la parte de `cantidad` que le corresponde según `fracciones`."""
+    for (_, dst, org), fraccion in zip(_DIRECCIONES, fracciones):
+        destino[dst] += (cantidad * fraccion)[org]
+
+
+def _fracciones(pesos):
+    total = sum(pesos)
+    seguro = np.where(total > 0.0, total, 1.0)
+    return [p / seguro for p in pesos], total
+
+
+def erosion_termica(alturas, iteraciones=50, paso=1.0, angulo_talud=35.0, factor=0.25):
+    """
+    Erosión térmica: el material se desliza hacia los vecinos cuando la pendiente
+    supera el ángulo de talud. Conserva la masa total.
+
+    Args:
+        alturas: Heightfield 2D (no se modifica).
+        iteraciones: Número de pasadas.
+        paso: Distancia entre vértices vecinos.
+        angulo_talud: Ángulo (grados) a partir del cual el material se desliza.
+        factor: Fracción del exceso que se mueve por iteración (valores altos oscilan).
+
+    Returns:
+        Nuevo heightfield erosionado.
+    """
+    h = np.array(alturas, dtype=np.float64)
+    talud = paso * math.tan(math.radians(angulo_talud))
+
+    for _ in range(iteraciones):
+        excesos = [np.maximum(d - talud, 0.0) for d in _diferencias(h)]
+        fracciones, total = _fracciones(excesos)
+        salida = factor * np.maximum.reduce(excesos) * (total > 0.0)
+
+        h -= salida
+        _repartir(h, salida, fracciones)
+
+    return h
+
+
+def erosion_hidraulica(alturas, iteraciones=50, lluvia=0.01, capacidad=4.0,
+                       disolucion=0.3, deposito=0.3, evaporacion=0.05):
+    """
+    Erosión hidráulica por grid: cae lluvia, el agua fluye cuesta abajo arrastrando
+    sedimento según su capacidad de carga y deposita el exceso al frenar.
+
+    Args:
+        alturas: Heightfield 2D (no se modifica).
+        iteraciones: Número de pasadas.
+        lluvia: Agua añadida a cada celda por iteración.
+        capacidad: Sedimento que puede cargar el agua por unidad de caudal.
+        disolucion: Fracción del déficit de carga que se erosiona por iteración.
+        deposito: Fracción del exceso de carga que se deposita por iteración.
+        evaporacion: Fracción del agua que se evapora por iteración.
+
+    Returns:
+        Nuevo heightfield erosionado.
+    """
+    h = np.array(alturas, dtype=np.float64)
+    agua = np.zeros_like(h)
+    sedimento = np.zeros_like(h)
+
+    for _ in range(iteraciones):
+        agua += lluvia
+
+        caidas = _diferencias(h + agua)
+        fracciones, total = _fracciones(caidas)
+        caudal = np.minimum(agua, np.maximum.reduce(caidas) * 0.5) * (total > 0.0)
+
+        # Erosionar o depositar según la capacidad de carga del caudal
+        deficit = capacidad * caudal - sedimento
+        erosion = np.where(deficit > 0.0, disolucion * deficit, 0.0)
+        erosion = np.minimum(erosion, np.maximum.reduce(caidas) * 0.5)
+        depositado = np.where(deficit < 0.0, -deposito * deficit, 0.0)
+        h += depositado - erosion
+        sedimento += erosion - depositado
+
+        # Transportar agua y sedimento hacia los vecinos más bajos
+        arrastre = sedimento * (caudal / np.maximum(agua, 1e-12))
+        agua -= caudal
+        sedimento -= arrastre
+        _repartir(agua, caudal, fracciones)
+        _repartir(sedimento, arrastre, fracciones)
+
+        agua *= 1.0 - evaporacion
+
+    return h + sedimento
+
+
+def aplicar_erosion(alturas, paso, iteraciones_termica=0, iteraciones_hidraulica=0):
+    """Aplica la erosión hidráulica y después la térmica (si tienen iteraciones)."""
+    if iteraciones_hidraulica:
+        alturas = erosion_hidraulica(alturas, iteraciones_hidraulica)
+    if iteraciones_termica:
+        alturas = erosion_termica(alturas, iteraciones_termica, paso=paso)
+    return alturas
+
+
+def medir_iteraciones(tamanios=(512, 1024), iteraciones=20):
+    """
+    Benchmark: iteraciones por segundo de cada kernel para grids de tamanio².
+
+    Returns:
+        Dict {(kernel, tamanio): iteraciones_por_segundo}.
+    """
+    rng = np.random.default_rng(0)
+    resultados = {}
+
+    for tamanio in tamanios:
+        alturas = rng.uniform(0.0, 30.0, size=(tamanio, tamanio))
+        for nombre, kernel in (("termica", erosion_termica), ("hidraulica", erosion_hidraulica)):
+            inicio = time.perf_counter()
+            kernel(alturas, iteraciones)
+            ips = iteraciones / (time.perf_counter() - inicio)
+            resultados[(nombre, tamanio)] = ips
+            print(f"  {nombre:<10} {tamanio}²: {ips:8.1f} it/s")
+
+    return resultados
+
+
+if __name__ == "__main__":
+    medir_iteraciones()
@@ -0,0 +1,108 @@
+"""
+Pruebas de visibilidad de cajas contra el frustum de una cámara, vectorizadas sobre
+frames y objetos. Las matrices siguen la convención de Maya (vectores fila, la fila 3
+es la traslación) y la cámara mira hacia -Z local con +Y arriba. Sin dependencias de Maya.
+"""
+
+import math
+import numpy as np
+
+
+def fov_horizontal(focal_mm, apertura_horizontal_pulgadas):
+    """Campo de visión horizontal (grados) a partir de la focal y el film aperture de Maya."""
+    return math.degrees(2.0 * math.atan(apertura_horizontal_pulgadas * 25.4 * 0.5 / focal_mm))
+
+
+def matrices_camara_seguimiento(matrices_objetivo, distancia=25.0, altura=6.0, eje_avance=0):
+    """
+    Matrices de una cámara que sigue al objetivo desde atrás y arriba, mirando en su dirección.
+
+    Args:
+        matrices_objetivo: (F, 4, 4) matrices de mundo del objeto seguido (p. ej. FLIGHT_DRIVER).
+        distancia: Distancia hacia atrás a lo largo del eje de avance.
+        altura: Elevación sobre el eje vertical del objetivo.
+        eje_avance: Eje local de avance del objetivo (0 = X, como followAxis="x").
+
+    Returns:
+        (F, 4, 4) matrices de mundo de la cámara.
+    """
+    m = np.asarray(matrices_objetivo, dtype=np.float64)
+    adelante = m[:, eje_avance, :3]
+    adelante = adelante / np.linalg.norm(adelante, axis=1, keepdims=True)
+    arriba = m[:, 1, :3] if eje_avance != 1 else m[:, 2, :3]
+
+    posicion = m[:, 3, :3] - adelante * distancia + arriba / np.linalg.norm(arriba, axis=1, keepdims=True) * altura
+
+    eje_z = -adelante
+    eje_x = np.cross(arriba, eje_z)
+    eje_x /= np.linalg.norm(eje_x, axis=1, keepdims=True)
+    eje_y = np.cross(eje_z, eje_x)
+
+    camara = np.zeros_like(m)
+    camara[:, 0, :3] = eje_x
+    camara[:, 1, :3] = eje_y
+    camara[:, 2, :3] = eje_z
+    camara[:, 3, :3] = posicion
+    camara[:, 3, 3] = 1.0
+    return camara
+
+
+def planos_frustum(matrices_camara, fov_h=54.43, aspecto=16.0 / 9.0, cerca=0.1, lejos=10000.0):
+    """
+    Planos del frustum en espacio mundo para cada frame.
+
+    Returns:
+        (F, 6, 4) planos (nx, ny, nz, d) con normales hacia dentro: un punto p está
+        dentro si n·p + d >= 0 para los 6 planos.
+    """
+    mitad_h = math.radians(fov_h) * 0.5
+    mitad_v = math.atan(math.tan(mitad_h) / aspecto)
+    ch, sh = math.cos(mitad_h), math.sin(mitad_h)
+    cv, sv = math.cos(mitad_v), math.sin(mitad_v)
+
+    locales = np.array([
+        (-ch, 0.0, -sh, 0.0),    # derecha
+        (ch, 0.0, -sh, 0.0),     # izquierda
+        (0.0, -cv, -sv, 0.0),    # arriba
+        (0.0, cv, -sv, 0.0),     # abajo
+        (0.0, 0.0, -1.0, -cerca),
+        (0.0, 0.0, 1.0, lejos),
+    ])
+
+    m = np.asarray(matrices_camara, dtype=np.float64)
+    normales = locales[None, :, :3] @ m[:, :3, :3]                       # (F, 6, 3)
+    d = locales[None, :, 3] - np.einsum("fpk,fk->fp", normales, m[:, 3, :3])
+    return np.concatenate([normales, d[..., None]], axis=-1)
+
+
+def cajas_en_frustum(planos, minimos, maximos):
+    """
+    Prueba conservadora caja-frustum (vértice positivo) para todos los frames y cajas.
+
+    Args:
+        planos: (F, 6, 4) de planos_frustum.
+        minimos, maximos: (N, 3) esquinas de las cajas en mundo.
+
+    Returns:
+        Array bool (F, N): True si la caja puede verse en ese frame.
+    """
+    normales = planos[..., :3]                                           # (F, 6, 3)
+    positivo = np.where(normales[:, :, None, :] >= 0.0, maximos[None, None], minimos[None, None])
+    distancias = np.einsum("fpk,fpnk->fpn", normales, positivo) + planos[..., 3][..., None]
+    return np.all(distancias >= 0.0, axis=1)
+
+
+def frames_visibles(planos, minimos, maximos, bloque_frames=64):
+    """
+    Número de frames en que cada caja es visible, procesando los frames por bloques
+    para acotar la memoria (F x 6 x N x 3).
+
+    Returns:
+        Array int (N,).
+    """
+    minimos = np.asarray(minimos, dtype=np.float64)
+    maximos = np.asarray(maximos, dtype=np.float64)
+    cuenta = np.zeros(len(minimos), dtype=np.int64)
+    for inicio in range(0, len(planos), bloque_frames):
+        cuenta += cajas_en_frustum(planos[inicio:inicio + bloque_frames], minimos, maximos).sum(axis=0)
+    return cuenta
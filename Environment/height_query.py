@@ -0,0 +1,128 @@
+"""
+Consultas de altura del terreno respaldadas por el heightfield.
+Permite preguntar "¿a qué altura está el suelo en (x, z)?" para miles de puntos
+por llamada sin tocar la geometría de Maya. Sin dependencias de Maya.
+"""
+
+import numpy as np
+
+# Consultas registradas por nombre de terreno (las rellena Environment.terrain)
+_consultas = {}
+
+
+def registrar_consulta(nombre, consulta):
+    """Registra la consulta de altura de un terreno para que otros módulos la usen."""
+    _consultas[nombre] = consulta
+
+
+def obtener_consulta(nombre="terreno"):
+    """Devuelve la consulta de altura registrada para el terreno (None si no hay)."""
+    return _consultas.get(nombre)
+
+
+def _catmull_rom(p0, p1, p2, p3, t):
+    return 0.5 * (
+        2.0 * p1
+        + (p2 - p0) * t
+        + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+        + (3.0 * p1 - p0 - 3.0 * p2 + p3) * t * t * t
+    )
+
+
+class ConsultaAltura:
+    """
+    Muestreo vectorizado de altura, pendiente y normal de un terreno.
+
+    Args:
+        alturas: Heightfield (filas, columnas); fila 0 = z más positiva, columna 0 = x más negativa.
+        escala: Tamaño del terreno (lado del plano).
+        origen: Posición (x, y, z) del centro del terreno en el mundo.
+    """
+
+    def __init__(self, alturas, escala, origen=(0.0, 0.0, 0.0)):
+        self.alturas = np.asarray(alturas, dtype=np.float64)
+        self.escala = float(escala)
+        self.origen = np.asarray(origen, dtype=np.float64)
+        self.subdivisiones = self.alturas.shape[1] - 1
+        self.paso = self.escala / self.subdivisiones
+
+    def _a_grid(self, x, z):
+        """Convierte coordenadas de mundo a coordenadas continuas (fila, columna)."""
+        x = np.asarray(x, dtype=np.float64) - self.origen[0]
+        z = np.asarray(z, dtype=np.float64) - self.origen[2]
+        columna = (x + self.escala / 2.0) / self.paso
+        fila = (self.escala / 2.0 - z) / self.paso
+        limite_f = self.alturas.shape[0] - 1
+        limite_c = self.alturas.shape[1] - 1
+        return np.clip(fila, 0, limite_f), np.clip(columna, 0, limite_c)
+
+    def _bilineal(self, fila, columna):
+        h = self.alturas
+        f0 = np.minimum(np.floor(fila).astype(np.intp), h.shape[0] - 2)
+        c0 = np.minimum(np.floor(columna).astype(np.intp), h.shape[1] - 2)
+        tf = fila - f0
+        tc = columna - c0
+
+        arriba = h[f0, c0] * (1.0 - tc) + h[f0, c0 + 1] * tc
+        abajo = h[f0 + 1, c0] * (1.0 - tc) + h[f0 + 1, c0 + 1] * tc
+        return arriba * (1.0 - tf) + abajo * tf
+
+    def _bicubico(self, fila, columna):
+        h = self.alturas
+        f1 = np.minimum(np.floor(fila).astype(np.intp), h.shape[0] - 2)
+        c1 = np.minimum(np.floor(columna).astype(np.intp), h.shape[1] - 2)
+        tf = fila - f1
+        tc = columna - c1
+
+        filas_interp = []
+        for df in (-1, 0, 1, 2):
+            f = np.clip(f1 + df, 0, h.shape[0] - 1)
+            p = [h[f, np.clip(c1 + dc, 0, h.shape[1] - 1)] for dc in (-1, 0, 1, 2)]
+            filas_interp.append(_catmull_rom(*p, tc))
+        return _catmull_rom(*filas_interp, tf)
+
+    def altura(self, x, z, metodo="bilineal"):
+        """
+        Altura del suelo en mundo para arrays de (x, z).
+
+        Args:
+            metodo: "bilineal" (rápido) o "bicubico" (Catmull-Rom, más suave).
+        """
+        fila, columna = self._a_grid(x, z)
+        if metodo == "bilineal":
+            h = self._bilineal(fila, columna)
+        elif metodo == "bicubico":
+            h = self._bicubico(fila, columna)
+        else:
+            raise ValueError(f"Método de muestreo desconocido: {metodo}")
+        return h + self.origen[1]
+
+    def gradiente(self, x, z, metodo="bilineal"):
+        """Derivadas (dh/dx, dh/dz) por diferencias centrales sobre el muestreo elegido."""
+        x = np.asarray(x, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+        d = self.paso * 0.5
+        dh_dx = (self.altura(x + d, z, metodo) - self.altura(x - d, z, metodo)) / (2.0 * d)
+        dh_dz = (self.altura(x, z + d, metodo) - self.altura(x, z - d, metodo)) / (2.0 * d)
+        return dh_dx, dh_dz
+
+    def pendiente(self, x, z, metodo="bilineal"):
+        """Pendiente del terreno en grados (0 = plano, 90 = vertical)."""
+        dh_dx, dh_dz = self.gradiente(x, z, metodo)
+        return np.degrees(np.arctan(np.hypot(dh_dx, dh_dz)))
+
+    def normal(self, x, z, metodo="bilineal"):
+        """Normales unitarias del terreno, array (..., 3)."""
+        dh_dx, dh_dz = self.gradiente(x, z, metodo)
+        normales = np.stack([-dh_dx, np.ones_like(dh_dx), -dh_dz], axis=-1)
+        return normales / np.linalg.norm(normales, axis=-1, keepdims=True)
+
+    def elevar_puntos(self, puntos, despeje, metodo="bilineal"):
+        """
+        Sube los puntos (N, 3) que queden a menos de `despeje` unidades sobre el suelo.
+        Devuelve un array nuevo; los puntos con altura suficiente no cambian.
+        """
+        puntos = np.array(puntos, dtype=np.float64)
+        suelo = self.altura(puntos[:, 0], puntos[:, 2], metodo)
+        puntos[:, 1] = np.maximum(puntos[:, 1], suelo + despeje)
+        return puntos
@@ -0,0 +1,156 @@
+"""
+Motor de heightfield en NumPy para el terreno montañoso.
+No depende de Maya: calcula todas las octavas del fractal para toda la malla
+en una sola pasada de arrays, de modo que se puede probar fuera de Maya.
+"""
+
+import math
+import numpy as np
+from Utils.noise import Ruido
+
+# Tipos de ruido disponibles para el terreno ("trig" = fractal clásico de senos/cosenos)
+TIPOS_RUIDO = ("trig", "fbm", "ridged", "warp")
+
+# Número de "montañas" a lo largo de `escala` en la octava base de los ruidos reales
+FRECUENCIA_BASE = 2.5
+
+
+def coordenadas_grid(subdivisiones, escala, filas=None):
+    """
+    Devuelve las coordenadas (x, z) de los vértices de un polyPlane centrado en el origen.
+
+    Args:
+        subdivisiones: Resolución del plano (sx = sy).
+        escala: Tamaño del plano (w = h).
+        filas: Rango (inicio, fin) de filas a generar (None = todas).
+
+    Returns:
+        Tupla (x, z) de arrays 2D con forma (filas, subdivisiones + 1).
+        La fila 0 corresponde a z = +escala/2, igual que el orden vtx[] de Maya.
+    """
+    paso = escala / subdivisiones
+    inicio, fin = filas if filas is not None else (0, subdivisiones + 1)
+
+    columnas = np.arange(subdivisiones + 1, dtype=np.float64)
+    indices_filas = np.arange(inicio, fin, dtype=np.float64)
+
+    # Maya guarda los puntos en float32: se redondea igual para reproducir las semillas
+    x = (-escala / 2.0 + columnas * paso).astype(np.float32).astype(np.float64)
+    z = (escala / 2.0 - indices_filas * paso).astype(np.float32).astype(np.float64)
+    return np.meshgrid(x, z)
+
+
+def altura_fractal(x, z, escala, altura_max, octavas, seed):
+    """
+    Evalúa el fractal de senos/cosenos del terreno sobre arrays de coordenadas.
+    Es la misma fórmula que aplicaba crear_terreno_montanoso vértice a vértice.
+
+    Args:
+        x, z: Arrays (cualquier forma compatible) con las coordenadas de los vértices.
+        escala: Tamaño del terreno.
+        altura_max: Altura máxima de las montañas.
+        octavas: Niveles de detalle del fractal.
+        seed: Semilla de generación.
+
+    Returns:
+        Array de alturas con la forma de broadcast de x y z.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+
+    altura = np.zeros(np.broadcast(x, z).shape)
+    amplitud = altura_max
+    frecuencia = 1.0 / escala
+
+    for octava in range(octavas):
+        offset_base = seed + octava * 1000
+        offset_multiplier_1 = math.sin(offset_base * 0.001) * 10
+        offset_multiplier_2 = math.cos(offset_base * 0.001) * 10
+
+        seed_x = x * frecuencia + octava * 100 + offset_multiplier_1
+        seed_z = z * frecuencia + octava * 100 + offset_multiplier_2
+
+        noise = (np.sin(seed_x * 2.5) * np.cos(seed_z * 3.7) +
+                 np.sin(seed_x * 1.3 + seed_z * 2.1) * 0.5 +
+                 np.cos(seed_x * 4.2 - seed_z * 1.8) * 0.25)
+
+        altura += noise * amplitud
+        amplitud *= 0.5
+        frecuencia *= 2
+
+    return altura
+
+
+def altura_ruido(x, z, escala, altura_max, octavas, seed, tipo_ruido="fbm"):
+    """
+    Evalúa el terreno con ruido simplex real (fbm, ridged o warp) sobre arrays de coordenadas.
+    A diferencia del fractal trig no se repite, así que necesita menos octavas.
+    """
+    ruido = Ruido(seed)
+    nx = np.asarray(x, dtype=np.float64) * (FRECUENCIA_BASE / escala)
+    nz = np.asarray(z, dtype=np.float64) * (FRECUENCIA_BASE / escala)
+
+    if tipo_ruido == "fbm":
+        return ruido.fbm(nx, nz, octavas) * altura_max
+    if tipo_ruido == "ridged":
+        return (ruido.ridged(nx, nz, octavas) * 2.0 - 1.0) * altura_max
+    if tipo_ruido == "warp":
+        return ruido.warp(nx, nz, octavas) * altura_max
+    raise ValueError(f"Tipo de ruido desconocido: {tipo_ruido}")
+
+
+def evaluar_alturas(x, z, escala, altura_max, octavas, seed, tipo_ruido="trig"):
+    """Evalúa las alturas con el tipo de ruido indicado (ver TIPOS_RUIDO)."""
+    if tipo_ruido == "trig":
+        return altura_fractal(x, z, escala, altura_max, octavas, seed)
+    return altura_ruido(x, z, escala, altura_max, octavas, seed, tipo_ruido)
+
+
+def generar_heightfield(subdivisiones=50, escala=150, altura_max=27, octavas=4,
+                        seed=0, filas=None, tipo_ruido="trig"):
+    """
+    Genera el heightfield completo (o una banda de filas) de un terreno.
+
+    Returns:
+        Array float64 con forma (filas, subdivisiones + 1).
+    """
+    x, z = coordenadas_grid(subdivisiones, escala, filas)
+    return evaluar_alturas(x, z, escala, altura_max, octavas, seed, tipo_ruido)
+
+
+def normales_heightfield(alturas, paso):
+    """
+    Calcula las normales por vértice a partir del gradiente del heightfield.
+
+    Args:
+        alturas: Heightfield (filas, columnas); las columnas avanzan en +x y las filas en -z.
+        paso: Distancia entre vértices vecinos.
+
+    Returns:
+        Array (filas, columnas, 3) de normales unitarias.
+    """
+    dh_dfila, dh_dcol = np.gradient(np.asarray(alturas, dtype=np.float64), paso)
+    dh_dx = dh_dcol
+    dh_dz = -dh_dfila
+
+    normales = np.stack([-dh_dx, np.ones_like(dh_dx), -dh_dz], axis=-1)
+    normales /= np.linalg.norm(normales, axis=-1, keepdims=True)
+    return normales
+
+
+def subdivisiones_para_presupuesto(presupuesto_poligonos):
+    """Subdivisiones por lado de un plano cuadrado con ~presupuesto_poligonos caras."""
+    return max(1, int(round(math.sqrt(presupuesto_poligonos))))
+
+
+def indices_desde_posiciones(x, z, subdivisiones, escala):
+    """
+    Convierte posiciones (x, z) de vértices de un polyPlane en índices (fila, columna)
+    del heightfield. Permite escribir las alturas sin depender del orden de vtx[].
+    """
+    paso = escala / subdivisiones
+    columnas = np.rint((np.asarray(x) + escala / 2.0) / paso).astype(np.intp)
+    filas = np.rint((escala / 2.0 - np.asarray(z)) / paso).astype(np.intp)
+    np.clip(columnas, 0, subdivisiones, out=columnas)
+    np.clip(filas, 0, subdivisiones, out=filas)
+    return filas, columnas
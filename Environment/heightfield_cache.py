@@ -0,0 +1,116 @@
+"""
+Caché en disco de heightfields generados.
+Cada heightfield se guarda como un .npy direccionado por contenido (hash de los
+parámetros del terreno) y se lee con memory-map. El tamaño total de la carpeta
+se limita con una política LRU basada en la fecha de último uso.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+
+# Subir este número invalida todas las entradas si cambia el algoritmo de generación
+VERSION_ALGORITMO = 1
+
+
+class CacheAlturas:
+    """
+    Caché LRU de heightfields en formato .npy.
+
+    Args:
+        carpeta: Carpeta donde se guardan los archivos.
+        limite_bytes: Tamaño máximo total de la caché (None = sin límite).
+        cuantizar: Guarda los datos en float16 (la mitad de espacio, ~3 decimales).
+    """
+
+    def __init__(self, carpeta, limite_bytes=512 * 1024 * 1024, cuantizar=False):
+        self.carpeta = carpeta
+        self.limite_bytes = limite_bytes
+        self.cuantizar = cuantizar
+        os.makedirs(self.carpeta, exist_ok=True)
+
+    @staticmethod
+    def clave(**parametros):
+        """Genera la clave (sha1) a partir de los parámetros que definen el terreno."""
+        datos = dict(parametros, version=VERSION_ALGORITMO)
+        texto = json.dumps(datos, sort_keys=True, default=str)
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+    def _ruta(self, clave):
+        sufijo = "_f16" if self.cuantizar else ""
+        return os.path.join(self.carpeta, f"{clave}{sufijo}.npy")
+
+    def obtener(self, clave):
+        """
+        Devuelve el heightfield guardado (memory-map de solo lectura) o None si no existe.
+        Un acierto actualiza la fecha de uso del archivo para la política LRU.
+        """
+        ruta = self._ruta(clave)
+        if not os.path.exists(ruta):
+            return None
+
+        try:
+            alturas = np.load(ruta, mmap_mode="r")
+        except (OSError, ValueError):
+            # Archivo corrupto o a medio escribir: se descarta
+            self._eliminar(ruta)
+            return None
+
+        os.utime(ruta, None)
+        return alturas
+
+    def guardar(self, clave, alturas):
+        """Guarda un heightfield y aplica el límite de tamaño. Devuelve la ruta escrita."""
+        ruta = self._ruta(clave)
+        datos = np.asarray(alturas, dtype=np.float16 if self.cuantizar else np.float64)
+
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as f:
+            np.save(f, datos)
+        os.replace(temporal, ruta)
+
+        self._aplicar_limite(proteger=ruta)
+        return ruta
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché."""
+        for ruta, _, _ in self._entradas():
+            self._eliminar(ruta)
+
+    def tamanio(self):
+        """Tamaño total en bytes de la caché."""
+        return sum(tam for _, tam, _ in self._entradas())
+
+    def _entradas(self):
+        entradas = []
+        with os.scandir(self.carpeta) as it:
+            for entrada in it:
+                if entrada.is_file() and entrada.name.endswith(".npy"):
+                    info = entrada.stat()
+                    entradas.append((entrada.path, info.st_size, info.st_mtime))
+        return entradas
+
+    def _aplicar_limite(self, proteger=None):
+        if self.limite_bytes is None:
+            return
+
+        entradas = sorted(self._entradas(), key=lambda e: e[2])
+        total = sum(tam for _, tam, _ in entradas)
+
+        for ruta, tam, _ in entradas:
+            if total <= self.limite_bytes:
+                break
+            if ruta == proteger:
+                continue
+            if self._eliminar(ruta):
+                total -= tam
+
+    @staticmethod
+    def _eliminar(ruta):
+        try:
+            os.remove(ruta)
+            return True
+        except OSError:
+            # En Windows un archivo con memory-map abierto no se puede borrar
+            return False
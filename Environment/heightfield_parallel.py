@@ -0,0 +1,123 @@
+"""
+Generación multiproceso de heightfields para resoluciones muy altas.
+La malla se divide en bandas de filas que se evalúan en un ProcessPoolExecutor
+y se escriben directamente en un array de memoria compartida. Cada fila se
+calcula con las mismas operaciones que en un solo proceso, así que el resultado
+es idéntico bit a bit.
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from Environment.heightfield import generar_heightfield
+
+
+def _configurar_ejecutable():
+    """
+    Dentro de Maya sys.executable apunta a maya(.exe); los procesos hijos deben
+    lanzarse con mayapy, que está en la misma carpeta.
+    """
+    ejecutable = os.path.basename(sys.executable).lower()
+    if ejecutable.startswith("maya") and not ejecutable.startswith("mayapy"):
+        extension = ".exe" if os.name == "nt" else ""
+        mayapy = os.path.join(os.path.dirname(sys.executable), "mayapy" + extension)
+        if os.path.exists(mayapy):
+            multiprocessing.set_executable(mayapy)
+
+
+def _evaluar_banda(nombre_memoria, forma, inicio, fin, parametros):
+    """Evalúa las filas [inicio, fin) y las escribe en la memoria compartida."""
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        destino = np.ndarray(forma, dtype=np.float64, buffer=memoria.buf)
+        destino[inicio:fin] = generar_heightfield(filas=(inicio, fin), **parametros)
+    finally:
+        memoria.close()
+    return fin - inicio
+
+
+def dividir_en_bandas(num_filas, num_bandas):
+    """Divide num_filas en num_bandas rangos (inicio, fin) contiguos y casi iguales."""
+    num_bandas = max(1, min(num_bandas, num_filas))
+    limites = np.linspace(0, num_filas, num_bandas + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+def generar_heightfield_paralelo(subdivisiones=50, escala=150, altura_max=27, octavas=4,
+                                 seed=0, procesos=None, bandas_por_proceso=4, tipo_ruido="trig"):
+    """
+    Genera el heightfield repartiendo bandas de filas entre varios procesos.
+
+    Args:
+        subdivisiones, escala, altura_max, octavas, seed, tipo_ruido: Igual que generar_heightfield.
+        procesos: Número de procesos (None = todos los núcleos).
+        bandas_por_proceso: Bandas por proceso para equilibrar la carga.
+
+    Returns:
+        Array float64 (subdivisiones + 1, subdivisiones + 1), idéntico al de generar_heightfield.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    parametros = dict(subdivisiones=subdivisiones, escala=escala, altura_max=altura_max,
+                      octavas=octavas, seed=seed, tipo_ruido=tipo_ruido)
+    if procesos <= 1:
+        return generar_heightfield(**parametros)
+
+    forma = (subdivisiones + 1, subdivisiones + 1)
+    bandas = dividir_en_bandas(forma[0], procesos * bandas_por_proceso)
+
+    _configurar_ejecutable()
+    memoria = shared_memory.SharedMemory(create=True, size=int(np.prod(forma)) * 8)
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            futuros = [
+                executor.submit(_evaluar_banda, memoria.name, forma, inicio, fin, parametros)
+                for inicio, fin in bandas
+            ]
+            for futuro in futuros:
+                futuro.result()
+
+        return np.ndarray(forma, dtype=np.float64, buffer=memoria.buf).copy()
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def medir_escalado(subdivisiones=3000, octavas=8, procesos=(1, 2, 4, 8), repeticiones=2):
+    """
+    Benchmark: mide el tiempo de generación con distintos números de procesos
+    y comprueba que el resultado coincide bit a bit con el del primero (AssertionError si no).
+
+    Returns:
+        Lista de tuplas (procesos, segundos, aceleración).
+    """
+    referencia = None
+    resultados = []
+    base = None
+
+    print(f"Heightfield {subdivisiones + 1}x{subdivisiones + 1}, {octavas} octavas")
+    for n in procesos:
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            alturas = generar_heightfield_paralelo(subdivisiones=subdivisiones, octavas=octavas,
+                                                   seed=1234, procesos=n)
+            mejor = min(mejor, time.perf_counter() - inicio)
+
+        if referencia is None:
+            referencia = alturas
+        base = base or mejor
+        print(f"  {n:>2} procesos: {mejor:7.3f} s  x{base / mejor:4.2f}")
+        if not np.array_equal(alturas, referencia):
+            raise AssertionError(f"El heightfield con {n} procesos no es idéntico al de {procesos[0]}.")
+        resultados.append((n, mejor, base / mejor))
+
+    return resultados
+
+
+if __name__ == "__main__":
+    medir_escalado()
@@ -0,0 +1,273 @@
+"""
+Lectura y escritura de heightmaps de 16 bits (PNG en escala de grises y RAW .r16).
+Las filas se procesan por bloques para que la memoria usada no dependa del tamaño
+del archivo. Sin dependencias de Maya ni de librerías de imagen.
+
+Las alturas se normalizan a 0-65535; el rango real (altura_min, altura_max) y la
+escala del terreno se guardan en chunks tEXt del PNG o en un .json junto al .r16.
+"""
+
+import json
+import os
+import struct
+import zlib
+import numpy as np
+
+_FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+_PREFIJO_TEXTO = "qap:"
+_BYTES_PIXEL = 2  # gris de 16 bits
+
+
+def _normalizar(alturas, altura_min, altura_max):
+    rango = altura_max - altura_min
+    if rango <= 0.0:
+        return np.zeros(alturas.shape, dtype=np.uint16)
+    valores = (np.asarray(alturas, dtype=np.float64) - altura_min) / rango * 65535.0
+    return np.rint(np.clip(valores, 0.0, 65535.0)).astype(np.uint16)
+
+
+def _desnormalizar(valores, metadatos):
+    altura_min = float(metadatos.get("altura_min", 0.0))
+    altura_max = float(metadatos.get("altura_max", 65535.0))
+    return altura_min + valores.astype(np.float64) / 65535.0 * (altura_max - altura_min)
+
+
+def _metadatos_base(alturas, metadatos):
+    datos = dict(metadatos or {})
+    datos["altura_min"] = float(np.min(alturas))
+    datos["altura_max"] = float(np.max(alturas))
+    return datos
+
+
+# --- PNG ---------------------------------------------------------------------
+
+def _chunk(f, tipo, datos):
+    f.write(struct.pack(">I", len(datos)))
+    f.write(tipo)
+    f.write(datos)
+    f.write(struct.pack(">I", zlib.crc32(tipo + datos) & 0xFFFFFFFF))
+
+
+def escribir_png16(ruta, alturas, metadatos=None, filas_por_bloque=256):
+    """
+    Guarda un heightfield como PNG de 16 bits en escala de grises.
+
+    Args:
+        ruta: Archivo .png de destino.
+        alturas: Heightfield 2D.
+        metadatos: Datos extra a guardar (p. ej. escala, seed).
+        filas_por_bloque: Filas que se comprimen a la vez.
+
+    Returns:
+        Dict de metadatos escritos (incluye altura_min y altura_max).
+    """
+    alturas = np.asarray(alturas)
+    filas, columnas = alturas.shape
+    datos = _metadatos_base(alturas, metadatos)
+
+    with open(ruta, "wb") as f:
+        f.write(_FIRMA_PNG)
+        _chunk(f, b"IHDR", struct.pack(">IIBBBBB", columnas, filas, 16, 0, 0, 0, 0))
+        for clave, valor in datos.items():
+            texto = f"{_PREFIJO_TEXTO}{clave}".encode("latin-1") + b"\x00" + str(valor).encode("latin-1")
+            _chunk(f, b"tEXt", texto)
+
+        compresor = zlib.compressobj(6)
+        for inicio in range(0, filas, filas_por_bloque):
+            bloque = _normalizar(alturas[inicio:inicio + filas_por_bloque],
+                                 datos["altura_min"], datos["altura_max"])
+            # Cada fila empieza con el byte de filtro 0 (sin filtro); píxeles big-endian
+            crudo = np.zeros((bloque.shape[0], 1 + columnas * _BYTES_PIXEL), dtype=np.uint8)
+            crudo[:, 1:] = bloque.astype(">u2").view(np.uint8).reshape(bloque.shape[0], -1)
+            comprimido = compresor.compress(crudo.tobytes())
+            if comprimido:
+                _chunk(f, b"IDAT", comprimido)
+        _chunk(f, b"IDAT", compresor.flush())
+        _chunk(f, b"IEND", b"")
+
+    return datos
+
+
+def _leer_chunks(f):
+    if f.read(8) != _FIRMA_PNG:
+        raise ValueError("El archivo no es un PNG válido.")
+    while True:
+        cabecera = f.read(8)
+        if len(cabecera) < 8:
+            return
+        longitud, tipo = struct.unpack(">I4s", cabecera)
+        datos = f.read(longitud)
+        f.read(4)  # CRC
+        yield tipo, datos
+        if tipo == b"IEND":
+            return
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _desfiltrar(tipo, fila, anterior):
+    """Deshace el filtro PNG de una fila (bytes uint8) usando la fila anterior ya reconstruida."""
+    if tipo == 0:
+        return fila
+    if tipo == 2:
+        return fila + anterior
+    if tipo == 1:
+        # Sub: suma acumulada módulo 256 en cada uno de los 2 canales de byte
+        salida = fila.reshape(-1, _BYTES_PIXEL).astype(np.uint64).cumsum(axis=0)
+        return (salida % 256).astype(np.uint8).reshape(-1)
+
+    # Average y Paeth dependen del byte reconstruido a la izquierda: se resuelven byte a byte
+    salida = fila.tolist()
+    arriba = anterior.tolist()
+    for i in range(len(salida)):
+        izquierda = salida[i - _BYTES_PIXEL] if i >= _BYTES_PIXEL else 0
+        diagonal = arriba[i - _BYTES_PIXEL] if i >= _BYTES_PIXEL else 0
+        if tipo == 3:
+            prediccion = (izquierda + arriba[i]) // 2
+        else:
+            prediccion = _paeth(izquierda, arriba[i], diagonal)
+        salida[i] = (salida[i] + prediccion) % 256
+    return np.array(salida, dtype=np.uint8)
+
+
+def leer_png16(ruta):
+    """
+    Lee un PNG de 16 bits en escala de grises (no entrelazado).
+
+    Returns:
+        Tupla (alturas, metadatos). Las alturas se devuelven en unidades reales si el
+        PNG tiene los metadatos qap:altura_min / qap:altura_max.
+    """
+    metadatos = {}
+    with open(ruta, "rb") as f:
+        chunks = _leer_chunks(f)
+        tipo, datos = next(chunks)
+        if tipo != b"IHDR":
+            raise ValueError("PNG sin cabecera IHDR.")
+        columnas, filas, profundidad, color, _, _, entrelazado = struct.unpack(">IIBBBBB", datos)
+        if profundidad != 16 or color != 0 or entrelazado:
+            raise ValueError("Solo se admiten PNG en escala de grises de 16 bits sin entrelazar.")
+
+        bytes_fila = 1 + columnas * _BYTES_PIXEL
+        valores = np.empty((filas, columnas), dtype=np.uint16)
+        anterior = np.zeros(columnas * _BYTES_PIXEL, dtype=np.uint8)
+        descompresor = zlib.decompressobj()
+        pendiente = b""
+        fila_actual = 0
+
+        for tipo, datos in chunks:
+            if tipo == b"tEXt":
+                clave, _, valor = datos.partition(b"\x00")
+                clave = clave.decode("latin-1")
+                if clave.startswith(_PREFIJO_TEXTO):
+                    metadatos[clave[len(_PREFIJO_TEXTO):]] = valor.decode("latin-1")
+            elif tipo == b"IDAT":
+                # Descomprimir por tramos acotados para no cargar la imagen entera en memoria
+                entrada = datos
+                while entrada:
+                    pendiente += descompresor.decompress(entrada, bytes_fila * 64)
+                    entrada = descompresor.unconsumed_tail
+
+                    completas = min(len(pendiente) // bytes_fila, filas - fila_actual)
+                    for k in range(completas):
+                        crudo = np.frombuffer(pendiente, dtype=np.uint8, count=bytes_fila,
+                                              offset=k * bytes_fila)
+                        anterior = _desfiltrar(crudo[0], crudo[1:].copy(), anterior)
+                        valores[fila_actual] = anterior.view(">u2")
+                        fila_actual += 1
+                    pendiente = pendiente[completas * bytes_fila:]
+
+    if fila_actual != filas:
+        raise ValueError(f"PNG incompleto: {fila_actual} de {filas} filas.")
+
+    return _desnormalizar(valores, metadatos), _convertir_metadatos(metadatos)
+
+
+def _convertir_metadatos(metadatos):
+    convertidos = {}
+    for clave, valor in metadatos.items():
+        try:
+            convertidos[clave] = float(valor)
+        except (TypeError, ValueError):
+            convertidos[clave] = valor
+    return convertidos
+
+
+# --- RAW .r16 ----------------------------------------------------------------
+
+def _ruta_json(ruta):
+    return ruta + ".json"
+
+
+def escribir_r16(ruta, alturas, metadatos=None, filas_por_bloque=256):
+    """
+    Guarda un heightfield como RAW de 16 bits little-endian (.r16) y sus metadatos
+    (incluidas filas/columnas) en ruta + ".json".
+    """
+    alturas = np.asarray(alturas)
+    datos = _metadatos_base(alturas, metadatos)
+    datos["filas"], datos["columnas"] = alturas.shape
+
+    with open(ruta, "wb") as f:
+        for inicio in range(0, alturas.shape[0], filas_por_bloque):
+            bloque = _normalizar(alturas[inicio:inicio + filas_por_bloque],
+                                 datos["altura_min"], datos["altura_max"])
+            f.write(bloque.astype("<u2").tobytes())
+
+    with open(_ruta_json(ruta), "w") as f:
+        json.dump(datos, f, indent=2)
+
+    return datos
+
+
+def leer_r16(ruta, filas_por_bloque=256):
+    """
+    Lee un .r16. Si no hay .json se asume un heightmap cuadrado con rango 0-65535.
+
+    Returns:
+        Tupla (alturas, metadatos).
+    """
+    metadatos = {}
+    if os.path.exists(_ruta_json(ruta)):
+        with open(_ruta_json(ruta), "r") as f:
+            metadatos = json.load(f)
+
+    total = os.path.getsize(ruta) // 2
+    filas = int(metadatos.get("filas", 0)) or int(round(total ** 0.5))
+    columnas = int(metadatos.get("columnas", 0)) or total // filas
+    if filas * columnas != total:
+        raise ValueError(f"Tamaño de {ruta} incompatible con {filas}x{columnas}.")
+
+    crudo = np.memmap(ruta, dtype="<u2", mode="r", shape=(filas, columnas))
+    alturas = np.empty((filas, columnas), dtype=np.float64)
+    for inicio in range(0, filas, filas_por_bloque):
+        alturas[inicio:inicio + filas_por_bloque] = _desnormalizar(
+            crudo[inicio:inicio + filas_por_bloque], metadatos
+        )
+    del crudo
+
+    return alturas, metadatos
+
+
+def escribir_heightmap(ruta, alturas, metadatos=None):
+    """Guarda el heightmap en PNG o R16 según la extensión de la ruta."""
+    if ruta.lower().endswith(".png"):
+        return escribir_png16(ruta, alturas, metadatos)
+    if ruta.lower().endswith(".r16") or ruta.lower().endswith(".raw"):
+        return escribir_r16(ruta, alturas, metadatos)
+    raise ValueError(f"Formato de heightmap no soportado: {ruta}")
+
+
+def leer_heightmap(ruta):
+    """Lee un heightmap PNG o R16 según la extensión. Devuelve (alturas, metadatos)."""
+    if ruta.lower().endswith(".png"):
+        return leer_png16(ruta)
+    if ruta.lower().endswith(".r16") or ruta.lower().endswith(".raw"):
+        return leer_r16(ruta)
+    raise ValueError(f"Formato de heightmap no soportado: {ruta}")
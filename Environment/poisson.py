@@ -0,0 +1,212 @@
+"""
+Muestreo Poisson-disk (ruido azul) con hash espacial de rejilla uniforme.
+Sirve para repartir centros de nubes y partes dentro de cada nube sin grumos ni
+solapes, con densidad variable y rechazo de posiciones (p. ej. dentro del terreno).
+El coste crece linealmente con el número de puntos. Sin dependencias de Maya.
+"""
+
+import math
+import numpy as np
+
+
+class HashEspacial:
+    """
+    Rejilla uniforme densa donde cada celda guarda el índice del punto que contiene (-1 = vacía).
+    Con celdas de lado radio_min / sqrt(dim) nunca hay dos puntos en la misma celda.
+    """
+
+    def __init__(self, minimo, maximo, tamanio_celda, capacidad=1024):
+        self.minimo = np.asarray(minimo, dtype=np.float64)
+        self.celda = float(tamanio_celda)
+        forma = np.floor((np.asarray(maximo, dtype=np.float64) - self.minimo) / self.celda).astype(int) + 1
+        self.grid = np.full(tuple(forma), -1, dtype=np.int64)
+        self._origen = self.minimo.tolist()
+        self._limite = [n - 1 for n in self.grid.shape]
+        self.puntos = np.empty((capacidad, len(self.minimo)), dtype=np.float64)
+        self.total = 0
+
+    def _celda_de(self, punto, desplazamiento=0.0):
+        # Aritmética escalar: se llama una vez por iteración y evita la sobrecarga de NumPy
+        return tuple(
+            min(max(int((c + desplazamiento - o) // self.celda), 0), n)
+            for c, o, n in zip(punto.tolist(), self._origen, self._limite)
+        )
+
+    def insertar(self, punto):
+        """Añade un punto y devuelve su índice."""
+        if self.total == len(self.puntos):
+            self.puntos = np.concatenate([self.puntos, np.empty_like(self.puntos)])
+        self.puntos[self.total] = punto
+        self.grid[self._celda_de(punto)] = self.total
+        self.total += 1
+        return self.total - 1
+
+    def en_ventana(self, centro, radio):
+        """Puntos guardados en las celdas que cubren el cubo [centro - radio, centro + radio]."""
+        inicio = self._celda_de(centro, -radio)
+        fin = self._celda_de(centro, radio)
+        ventana = self.grid[tuple(slice(a, b + 1) for a, b in zip(inicio, fin))]
+        indices = ventana[ventana >= 0]
+        return self.puntos[indices]
+
+    def todos(self):
+        return self.puntos[:self.total].copy()
+
+
+def muestreo_poisson(minimo, maximo, radio, rng=None, intentos=30, densidad=None,
+                     radio_max=None, aceptar=None):
+    """
+    Muestreo Poisson-disk de Bridson en 2D o 3D.
+
+    Args:
+        minimo, maximo: Esquinas de la caja a muestrear.
+        radio: Distancia mínima entre puntos donde la densidad es 1.
+        rng: np.random.Generator (None = nuevo sin semilla).
+        intentos: Candidatos que se prueban alrededor de cada punto activo.
+        densidad: Función vectorizada puntos (N, dim) -> densidad (N,) en (0, 1]; la distancia
+            mínima local crece como radio / densidad^(1/dim). None = uniforme.
+        radio_max: Límite de la distancia mínima local (None = 3 * radio si hay densidad).
+        aceptar: Función vectorizada puntos (N, dim) -> bool (N,) para rechazar posiciones.
+
+    Returns:
+        Array (N, dim) de puntos.
+    """
+    rng = rng or np.random.default_rng()
+    minimo = np.asarray(minimo, dtype=np.float64)
+    maximo = np.asarray(maximo, dtype=np.float64)
+    dim = len(minimo)
+    radio_max = radio_max or (3.0 * radio if densidad is not None else radio)
+    densidad_min = (radio / radio_max) ** dim
+
+    def radio_local(puntos):
+        if densidad is None:
+            return np.full(len(puntos), float(radio))
+        return radio / np.clip(densidad(puntos), densidad_min, 1.0) ** (1.0 / dim)
+
+    def validos(puntos):
+        dentro = np.all((puntos >= minimo) & (puntos <= maximo), axis=1)
+        if aceptar is not None and dentro.any():
+            dentro[dentro] = aceptar(puntos[dentro])
+        return dentro
+
+    hash_espacial = HashEspacial(minimo, maximo, radio / math.sqrt(dim))
+
+    # Punto inicial: el primero válido de una tanda uniforme
+    iniciales = rng.uniform(minimo, maximo, (intentos * 10, dim))
+    iniciales = iniciales[validos(iniciales)]
+    if not len(iniciales):
+        return np.empty((0, dim))
+    hash_espacial.insertar(iniciales[0])
+    radios = [radio_local(iniciales[:1])[0]]
+    activos = [0]
+
+    while activos:
+        j = int(rng.integers(len(activos)))
+        actual = hash_espacial.puntos[activos[j]]
+        r_actual = radios[activos[j]]
+
+        # Candidatos en el anillo [r, 2r] alrededor del punto activo
+        direcciones = rng.normal(size=(intentos, dim))
+        direcciones /= np.linalg.norm(direcciones, axis=1, keepdims=True)
+        candidatos = actual + direcciones * rng.uniform(r_actual, 2.0 * r_actual, (intentos, 1))
+
+        libres = validos(candidatos)
+        if libres.any():
+            r_candidatos = radio_local(candidatos)
+            vecinos = hash_espacial.en_ventana(actual, 2.0 * r_actual + radio_max)
+            if len(vecinos):
+                distancias = ((candidatos[:, None, :] - vecinos[None, :, :]) ** 2).sum(axis=-1)
+                libres &= np.all(distancias >= (r_candidatos ** 2)[:, None], axis=1)
+
+        if libres.any():
+            elegido = int(np.argmax(libres))
+            activos.append(hash_espacial.insertar(candidatos[elegido]))
+            radios.append(r_candidatos[elegido])
+        else:
+            activos[j] = activos[-1]
+            activos.pop()
+
+    return hash_espacial.todos()
+
+
+def _alturas_con_caida(minimos, altura_min, altura_max, caida_altura, rng, intentos=32):
+    """
+    Una altura por centro dentro de [minimos, altura_max] con densidad
+    1 - caida_altura * |y - centro de la banda| / (banda / 2), por rechazo vectorizado.
+    """
+    mitad = max(altura_max - altura_min, 1e-6) * 0.5
+    medio = altura_min + mitad
+    candidatos = rng.uniform(minimos[:, None], altura_max, (len(minimos), intentos))
+    densidad = 1.0 - caida_altura * np.abs(candidatos - medio) / mitad
+    aceptados = rng.uniform(size=candidatos.shape) < densidad
+    # Si ningún candidato se acepta se usa el primero (solo pasa con caídas extremas)
+    elegido = np.argmax(aceptados, axis=1)
+    return candidatos[np.arange(len(minimos)), elegido]
+
+
+def centros_nubes_poisson(num_nubes, radio_distribucion, altura_min, altura_max, rng=None,
+                          separacion=None, caida_radial=0.0, caida_altura=0.0,
+                          suelo=None, despeje=0.0):
+    """
+    Centros de nube con ruido azul dentro del anillo [0.3 R, R] y la banda de alturas.
+    El ruido azul se muestrea en el plano XZ (la banda suele ser más fina que la separación
+    y un muestreo 3D se quedaría sin sitio) y cada centro recibe después su altura.
+
+    Args:
+        num_nubes: Nubes deseadas (se elige un subconjunto aleatorio del muestreo).
+        radio_distribucion: Radio exterior R del campo de nubes.
+        altura_min, altura_max: Banda de alturas.
+        separacion: Distancia mínima en XZ entre centros (None = la que deja sitio a ~2x num_nubes).
+        caida_radial: 0-1, cuánto baja la densidad del centro al borde del campo.
+        caida_altura: 0-1, cuánto baja la densidad del centro a los extremos de la banda.
+        suelo: Función (x, z) -> altura del terreno; se rechazan centros por debajo de suelo + despeje.
+        despeje: Distancia mínima sobre el suelo.
+
+    Returns:
+        Array (N, 3) con N <= num_nubes.
+    """
+    rng = rng or np.random.default_rng()
+    radio_interior = radio_distribucion * 0.3
+    if separacion is None:
+        area = math.pi * (radio_distribucion ** 2 - radio_interior ** 2)
+        separacion = math.sqrt(0.65 * area / (2.0 * max(num_nubes, 1)))
+        if caida_radial > 0.0:
+            # Densidad media del anillo para que la caída no deje menos centros que nubes
+            separacion *= math.sqrt(1.0 - caida_radial * 0.7)
+
+    def densidad(puntos):
+        return 1.0 - caida_radial * np.hypot(puntos[:, 0], puntos[:, 1]) / radio_distribucion
+
+    def aceptar(puntos):
+        radial = np.hypot(puntos[:, 0], puntos[:, 1])
+        validos = (radial >= radio_interior) & (radial <= radio_distribucion)
+        if suelo is not None:
+            validos &= suelo(puntos[:, 0], puntos[:, 1]) + despeje <= altura_max
+        return validos
+
+    planos = muestreo_poisson(
+        (-radio_distribucion, -radio_distribucion),
+        (radio_distribucion, radio_distribucion),
+        separacion, rng, densidad=densidad if caida_radial > 0.0 else None, aceptar=aceptar,
+    )
+    if len(planos) > num_nubes:
+        planos = planos[rng.choice(len(planos), num_nubes, replace=False)]
+
+    minimos = np.full(len(planos), float(altura_min))
+    if suelo is not None and len(planos):
+        minimos = np.maximum(minimos, suelo(planos[:, 0], planos[:, 1]) + despeje)
+    alturas = _alturas_con_caida(minimos, altura_min, altura_max, caida_altura, rng)
+    return np.column_stack([planos[:, 0], alturas, planos[:, 1]])
+
+
+def offsets_partes_poisson(escala, densidad, rng=None):
+    """
+    Desplazamientos (N, 3) de las partes de una nube con ruido azul dentro de la caja
+    [-e, e] x [-0.3e, 0.3e] x [-0.7e, 0.7e], N <= densidad.
+    """
+    rng = rng or np.random.default_rng()
+    extension = np.array([escala, escala * 0.3, escala * 0.7])
+    puntos = muestreo_poisson(-extension, extension, escala * 0.45, rng, intentos=20)
+    if len(puntos) > densidad:
+        puntos = puntos[rng.choice(len(puntos), densidad, replace=False)]
+    return puntos
@@ -1,21 +1,145 @@
 import maya.cmds as cmds
-import math
+import maya.api.OpenMaya as om
+import numpy as np
+import os
+import random
 from Utils.seed import generate_seed
+from Utils.config import CARPETA_CACHE
+from Utils.bspline import curva_desde_maya
+from Environment.heightfield import (
+    generar_heightfield,
+    indices_desde_posiciones,
+    evaluar_alturas,
+    coordenadas_grid,
+    normales_heightfield,
+    subdivisiones_para_presupuesto,
+)
+from Environment import tiles
+from Environment.height_query import ConsultaAltura, registrar_consulta, obtener_consulta
+from Environment.heightmap_io import escribir_heightmap, leer_heightmap
+from Materials.materials import PALETAS_METALICAS, COLOR_SET_TERRENO, aplicar_material_montanas_vertices
+from Materials.terrain_shading import colores_terreno
+from Environment.erosion import aplicar_erosion
+from Environment.heightfield_cache import CacheAlturas
+from Environment.heightfield_parallel import generar_heightfield_paralelo
+
+_caches = {}
+
+
+def _obtener_cache(cuantizar=False):
+    """Devuelve (creando si hace falta) la caché de heightfields del terreno."""
+    if cuantizar not in _caches:
+        _caches[cuantizar] = CacheAlturas(os.path.join(CARPETA_CACHE, "terreno"), cuantizar=cuantizar)
+    return _caches[cuantizar]
+
+
+def _generar_alturas(subdivisiones, escala, altura_max, octavas, seed, procesos=1,
+                     tipo_ruido="trig"):
+    if procesos and procesos > 1:
+        return generar_heightfield_paralelo(subdivisiones, escala, altura_max, octavas, seed,
+                                            procesos=procesos, tipo_ruido=tipo_ruido)
+    return generar_heightfield(subdivisiones, escala, altura_max, octavas, seed,
+                               tipo_ruido=tipo_ruido)
+
+
+def obtener_alturas(subdivisiones, escala, altura_max, octavas, seed,
+                    usar_cache=True, cuantizar_cache=False, procesos=1, tipo_ruido="trig",
+                    erosion_termica=0, erosion_hidraulica=0):
+    """
+    Devuelve el heightfield del terreno, reutilizando la caché en disco si hay un acierto.
+    Con procesos > 1 la generación se reparte en bandas de filas entre varios procesos.
+    La erosión (iteraciones térmicas/hidráulicas) se aplica antes de guardar en caché.
+    """
+    def generar():
+        alturas = _generar_alturas(subdivisiones, escala, altura_max, octavas, seed, procesos,
+                                   tipo_ruido)
+        return aplicar_erosion(alturas, escala / subdivisiones, erosion_termica, erosion_hidraulica)
+
+    if not usar_cache:
+        return generar()
+
+    cache = _obtener_cache(cuantizar_cache)
+    clave = cache.clave(subdivisiones=int(subdivisiones), escala=float(escala),
+                        altura_max=float(altura_max), octavas=int(octavas), seed=int(seed),
+                        tipo_ruido=tipo_ruido, erosion_termica=int(erosion_termica),
+                        erosion_hidraulica=int(erosion_hidraulica))
+    alturas = cache.obtener(clave)
+    if alturas is not None:
+        print(f"[i] Heightfield recuperado de caché ({clave[:10]})")
+        return alturas
+
+    alturas = generar()
+    cache.guardar(clave, alturas)
+    return alturas
+
+
+def _fn_mesh(objeto):
+    """Devuelve un MFnMesh para el shape del objeto indicado."""
+    sel = om.MSelectionList()
+    sel.add(objeto)
+    dag = sel.getDagPath(0)
+    dag.extendToShape()
+    return om.MFnMesh(dag)
+
+
+def _escribir_alturas(plano, alturas, subdivisiones, escala, normales=None):
+    """
+    Escribe un heightfield sobre los vértices del plano con una sola llamada a setPoints.
+    El índice de cada vértice se resuelve a partir de su posición (x, z).
+    Si se pasan normales (filas, columnas, 3) también se escriben de una sola vez.
+    """
+    fn_mesh = _fn_mesh(plano)
+    puntos = np.array(fn_mesh.getPoints(om.MSpace.kObject))
+
+    filas, columnas = indices_desde_posiciones(puntos[:, 0], puntos[:, 2], subdivisiones, escala)
+    puntos[:, 1] += alturas[filas, columnas]
+
+    fn_mesh.setPoints(om.MPointArray(puntos.tolist()), om.MSpace.kObject)
+
+    if normales is not None:
+        vectores = om.MVectorArray(normales[filas, columnas].tolist())
+        fn_mesh.setVertexNormals(vectores, om.MIntArray(range(len(puntos))), om.MSpace.kObject)
+
+    fn_mesh.updateSurface()
+
 
 def crear_terreno_montanoso(nombre="terreno", subdivisiones=50, escala=150, 
                             altura_max=27, octavas=4, seed=None,
-                            pos_x=0, pos_y=-35, pos_z=0):
+                            pos_x=0, pos_y=-35, pos_z=0,
+                            usar_cache=True, cuantizar_cache=False, procesos=1, tipo_ruido="trig",
+                            presupuesto_poligonos=None, devolver_consulta=False,
+                            erosion_termica=0, erosion_hidraulica=0,
+                            colores_vertices=False, paleta=None, suavizado_clasico=False):
     """
     Crea un terreno fractal tipo montañoso, eliminando cualquier terreno previo con el mismo nombre.
     
     Args:
         nombre: Nombre del objeto.
-        subdivisiones: Resolución del plano (más = más detalle).
+        subdivisiones: Resolución base del plano (más = más detalle). La malla final
+            tiene el doble por lado, con el ruido evaluado directamente en esa rejilla fina:
+            el número de vértices es el del antiguo polySmooth(divisions=1), pero los picos y
+            valles no son los mismos que en escenas anteriores con la misma semilla
+            (ver suavizado_clasico).
         escala: Tamaño del terreno.
         altura_max: Altura máxima de las montañas.
         octavas: Niveles de detalle del fractal (más = más detallado).
         seed: Semilla para generación procedural (None = aleatoria).
         pos_x, pos_y, pos_z: Posición del terreno en el espacio 3D.
+        usar_cache: Reutiliza el heightfield guardado en disco si los parámetros coinciden.
+        cuantizar_cache: Guarda/lee la caché en float16 (menos espacio, menos precisión).
+        procesos: Procesos para generar el heightfield (útil con miles de subdivisiones).
+        tipo_ruido: "trig" (fractal clásico), "fbm", "ridged" o "warp" (ruido simplex real).
+        presupuesto_poligonos: Número de caras deseado; si se indica, manda sobre subdivisiones.
+        devolver_consulta: Devuelve (plano, ConsultaAltura) en lugar de solo el plano.
+            La consulta se registra siempre y se obtiene con obtener_consulta(nombre).
+        erosion_termica: Iteraciones de erosión térmica (0 = desactivada).
+        erosion_hidraulica: Iteraciones de erosión hidráulica (0 = desactivada).
+        colores_vertices: Escribe el color por vértice y aplica el material mínimo
+            (preview rápido en lugar del material con aiNoise).
+        paleta: Paleta para colores_vertices (índice de PALETAS_METALICAS, colores o None = aleatoria).
+        suavizado_clasico: Reproduce exactamente el terreno antiguo: alturas en la rejilla de
+            `subdivisiones` y polySmooth(divisions=1). Más lento; la consulta de altura usa
+            la rejilla base, así que es aproximada entre vértices.
     """
     # ✅ Eliminar terreno existente si ya hay uno con ese nombre
     if cmds.objExists(nombre):
@@ -28,50 +152,239 @@ def crear_terreno_montanoso(nombre="terreno", subdivisiones=50, escala=150,
     
     print(f"Generando terreno con semilla: {seed}")
     
+    # Resolución final: se genera directamente suave, sin polySmooth (salvo en el modo clásico,
+    # donde polySmooth duplica después la resolución base)
+    if presupuesto_poligonos:
+        resolucion = subdivisiones_para_presupuesto(presupuesto_poligonos)
+        if suavizado_clasico:
+            resolucion = max(1, resolucion // 2)
+    else:
+        resolucion = subdivisiones if suavizado_clasico else subdivisiones * 2
+    
     # Crear plano base
     plano = cmds.polyPlane(name=nombre, w=escala, h=escala, 
-                           sx=subdivisiones, sy=subdivisiones)[0]
+                           sx=resolucion, sy=resolucion, ch=False)[0]
     
-    # Obtener vértices
-    num_vertices = cmds.polyEvaluate(plano, v=True)
-    
-    # Aplicar desplazamiento fractal a cada vértice
-    for i in range(num_vertices):
-        pos = cmds.pointPosition(f"{plano}.vtx[{i}]")
-        x, y, z = pos
-        altura = 0
-        amplitud = altura_max
-        frecuencia = 1.0 / escala
-        
-        for octava in range(octavas):
-            offset_base = seed + octava * 1000
-            offset_multiplier_1 = math.sin(offset_base * 0.001) * 10
-            offset_multiplier_2 = math.cos(offset_base * 0.001) * 10
-            
-            seed_x = x * frecuencia + octava * 100 + offset_multiplier_1
-            seed_z = z * frecuencia + octava * 100 + offset_multiplier_2
-            
-            noise = (math.sin(seed_x * 2.5) * math.cos(seed_z * 3.7) + 
-                     math.sin(seed_x * 1.3 + seed_z * 2.1) * 0.5 +
-                     math.cos(seed_x * 4.2 - seed_z * 1.8) * 0.25)
-            
-            altura += noise * amplitud
-            amplitud *= 0.5
-            frecuencia *= 2
-        
-        cmds.move(0, altura, 0, f"{plano}.vtx[{i}]", relative=True)
-    
-    # Suavizar el terreno
-    cmds.polySmooth(plano, divisions=1)
+    # Calcular alturas y normales analíticas en NumPy y escribirlas de una sola vez
+    alturas = obtener_alturas(resolucion, escala, altura_max, octavas, seed,
+                              usar_cache=usar_cache, cuantizar_cache=cuantizar_cache,
+                              procesos=procesos, tipo_ruido=tipo_ruido,
+                              erosion_termica=erosion_termica,
+                              erosion_hidraulica=erosion_hidraulica)
+    # En el modo clásico las normales las calcula polySmooth, como antes
+    normales = None if suavizado_clasico else normales_heightfield(alturas, escala / resolucion)
+    _escribir_alturas(plano, alturas, resolucion, escala, normales)
+    if suavizado_clasico:
+        cmds.polySmooth(plano, divisions=1, ch=False)
     
     # Mover el terreno a su posición final
     cmds.move(pos_x, pos_y, pos_z, plano, absolute=True)
     
+    # Consulta de altura respaldada por el heightfield (sin consultar la malla)
+    consulta = ConsultaAltura(alturas, escala, (pos_x, pos_y, pos_z))
+    registrar_consulta(nombre, consulta)
+    
+    if colores_vertices:
+        colorear_terreno_por_vertices(nombre, paleta)
+    
     print(f"Terreno '{nombre}' creado en posición ({pos_x}, {pos_y}, {pos_z})")
     print(f"Semilla usada: {seed}")
     
+    if devolver_consulta:
+        return plano, consulta
+    return plano
+
+
+def colorear_terreno_por_vertices(nombre="terreno", paleta=None, aplicar_material=True,
+                                  peso_pendiente=0.6, peso_curvatura=0.5):
+    """
+    Escribe en el terreno un color set calculado en NumPy a partir de altura, pendiente
+    y curvatura del heightfield, y le aplica el material mínimo que lo lee.
+
+    Args:
+        nombre: Terreno con heightfield registrado (crear_terreno_montanoso o desde heightmap).
+        paleta: Índice de PALETAS_METALICAS, lista de 3 colores o None (aleatoria).
+        aplicar_material: Asigna M_Montanas_Vertices al terreno.
+        peso_pendiente, peso_curvatura: Intensidad de cada efecto (0-1).
+    """
+    consulta = obtener_consulta(nombre)
+    if consulta is None or not cmds.objExists(nombre):
+        cmds.warning(f"El terreno '{nombre}' no tiene heightfield registrado; genera el terreno primero.")
+        return None
+
+    if paleta is None:
+        paleta = random.choice(PALETAS_METALICAS)
+    elif isinstance(paleta, int):
+        paleta = PALETAS_METALICAS[paleta % len(PALETAS_METALICAS)]
+
+    normales = normales_heightfield(consulta.alturas, consulta.paso)
+    colores = colores_terreno(consulta.alturas, consulta.paso, paleta, normales,
+                              peso_pendiente=peso_pendiente, peso_curvatura=peso_curvatura)
+
+    fn_mesh = _fn_mesh(nombre)
+    puntos = np.array(fn_mesh.getPoints(om.MSpace.kObject))
+    filas, columnas = indices_desde_posiciones(puntos[:, 0], puntos[:, 2],
+                                               consulta.subdivisiones, consulta.escala)
+
+    if COLOR_SET_TERRENO not in fn_mesh.getColorSetNames():
+        fn_mesh.createColorSet(COLOR_SET_TERRENO, False)
+    fn_mesh.setCurrentColorSetName(COLOR_SET_TERRENO)
+
+    rgba = np.ones((len(puntos), 4))
+    rgba[:, :3] = colores[filas, columnas]
+    fn_mesh.setVertexColors(om.MColorArray([om.MColor(c) for c in rgba.tolist()]),
+                            om.MIntArray(range(len(puntos))))
+
+    cmds.setAttr(fn_mesh.fullPathName() + ".displayColors", 1)
+    if aplicar_material:
+        aplicar_material_montanas_vertices(nombre)
+
+    print(f"[✓] Colores por vértice escritos en '{nombre}' ({len(puntos)} vértices)")
+    return colores
+
+
+def exportar_heightmap(ruta, nombre="terreno"):
+    """
+    Exporta el heightfield del terreno a un PNG de 16 bits o a un RAW .r16 (según la extensión).
+    La escala del terreno y el rango de alturas se guardan junto a la imagen.
+
+    Args:
+        ruta: Archivo de destino (.png, .r16 o .raw).
+        nombre: Terreno creado con crear_terreno_montanoso o crear_terreno_desde_heightmap.
+
+    Returns:
+        Ruta escrita, o None si el terreno no tiene heightfield registrado.
+    """
+    consulta = obtener_consulta(nombre)
+    if consulta is None:
+        cmds.warning(f"El terreno '{nombre}' no tiene heightfield registrado; genera el terreno primero.")
+        return None
+
+    escribir_heightmap(ruta, consulta.alturas, {"escala": consulta.escala})
+    print(f"Heightmap de '{nombre}' exportado a {ruta}")
+    return ruta
+
+
+def crear_terreno_desde_heightmap(ruta, nombre="terreno", escala=None,
+                                  pos_x=0, pos_y=-35, pos_z=0, devolver_consulta=False):
+    """
+    Crea un terreno a partir de un heightmap de 16 bits sin volver a generar el ruido.
+
+    Args:
+        ruta: Heightmap .png, .r16 o .raw (cuadrado).
+        nombre: Nombre del objeto (se elimina el previo si existe).
+        escala: Tamaño del terreno (None = la guardada en el heightmap, o 150).
+        pos_x, pos_y, pos_z: Posición del terreno en el espacio 3D.
+        devolver_consulta: Devuelve (plano, ConsultaAltura) en lugar de solo el plano.
+    """
+    alturas, metadatos = leer_heightmap(ruta)
+    if alturas.shape[0] != alturas.shape[1]:
+        raise ValueError(f"El heightmap debe ser cuadrado, tiene {alturas.shape[0]}x{alturas.shape[1]}.")
+
+    if cmds.objExists(nombre):
+        print(f"Eliminando terreno previo: {nombre}")
+        cmds.delete(nombre)
+
+    escala = float(escala or metadatos.get("escala", 150))
+    resolucion = alturas.shape[0] - 1
+
+    plano = cmds.polyPlane(name=nombre, w=escala, h=escala,
+                           sx=resolucion, sy=resolucion, ch=False)[0]
+    normales = normales_heightfield(alturas, escala / resolucion)
+    _escribir_alturas(plano, alturas, resolucion, escala, normales)
+    cmds.move(pos_x, pos_y, pos_z, plano, absolute=True)
+
+    consulta = ConsultaAltura(alturas, escala, (pos_x, pos_y, pos_z))
+    registrar_consulta(nombre, consulta)
+
+    print(f"Terreno '{nombre}' cargado desde {ruta} ({resolucion}x{resolucion})")
+
+    if devolver_consulta:
+        return plano, consulta
     return plano
 
 
+def _muestrear_curva(curva, muestras=200):
+    """Devuelve un array (muestras, 3) de puntos en espacio mundo a igual distancia a lo largo de la curva."""
+    return curva_desde_maya(curva).muestrear(muestras)
+
+
+def crear_terreno_por_tiles(nombre="terreno", extension=600, tamanio_chunk=75,
+                            subdiv_max=64, subdiv_min=4, radio_detalle=1.0,
+                            presupuesto_poligonos=60000, curva="curva_vuelo_actual",
+                            escala=150, altura_max=27, octavas=4, seed=None,
+                            pos_x=0, pos_y=-35, pos_z=0, tipo_ruido="trig"):
+    """
+    Crea un terreno dividido en chunks cuya resolución depende de la distancia a la curva de vuelo.
+    Los bordes entre chunks de distinta resolución se cosen para que no haya grietas.
+    
+    Args:
+        nombre: Nombre del grupo que contiene los chunks.
+        extension: Tamaño total del área cubierta (puede ser muchas veces `escala`).
+        tamanio_chunk: Lado de cada chunk.
+        subdiv_max: Subdivisión de los chunks junto a la curva (potencia de dos).
+        subdiv_min: Subdivisión mínima de los chunks lejanos.
+        radio_detalle: Anillos de distancia (en chunks) por cada nivel de detalle.
+        presupuesto_poligonos: Máximo de caras en total (None = sin límite).
+        curva: Curva de vuelo de referencia (si no existe se usa el centro del terreno).
+        escala: Tamaño de referencia de las montañas (frecuencia base del fractal).
+        altura_max, octavas, seed, tipo_ruido: Igual que en crear_terreno_montanoso.
+        pos_x, pos_y, pos_z: Posición del terreno en el espacio 3D.
+    """
+    if cmds.objExists(nombre):
+        print(f"Eliminando terreno previo: {nombre}")
+        cmds.delete(nombre)
+
+    if seed is None:
+        seed = generate_seed()
+
+    print(f"Generando terreno por tiles con semilla: {seed}")
+
+    centros, n = tiles.centros_chunks(extension, tamanio_chunk)
+
+    # Distancia de cada chunk a la curva en el espacio local del terreno
+    if curva and cmds.objExists(curva):
+        puntos_curva = _muestrear_curva(curva)[:, [0, 2]] - np.array([pos_x, pos_z])
+    else:
+        cmds.warning(f"No se encontró la curva '{curva}', se usa el centro del terreno.")
+        puntos_curva = np.zeros((1, 2))
+
+    distancias = tiles.distancia_a_polilinea(centros, puntos_curva)
+    subdivisiones = tiles.subdivisiones_por_distancia(
+        distancias, tamanio_chunk, subdiv_max, subdiv_min, radio_detalle
+    )
+    subdivisiones = tiles.ajustar_a_presupuesto(subdivisiones, presupuesto_poligonos, subdiv_min)
+    vecinos = tiles.vecinos_de(subdivisiones, n)
+
+    grupo = cmds.group(empty=True, name=nombre)
+
+    for i, ((cx, cz), subdiv) in enumerate(zip(centros, subdivisiones)):
+        subdiv = int(subdiv)
+        paso = tamanio_chunk / subdiv
+
+        # Se evalúa con un anillo extra de vértices para que las normales sean continuas entre chunks
+        x, z = coordenadas_grid(subdiv + 2, tamanio_chunk + 2 * paso)
+        alturas_ext = evaluar_alturas(x + cx, z + cz, escala, altura_max, octavas, seed, tipo_ruido)
+        alturas = alturas_ext[1:-1, 1:-1]
+        # Se cose sobre la vista del interior y las normales se calculan después, para que
+        # las de los bordes cosidos correspondan a la geometría final
+        tiles.coser_bordes(alturas, vecinos[i])
+        normales = normales_heightfield(alturas_ext, paso)[1:-1, 1:-1]
+
+        chunk = cmds.polyPlane(name=f"{nombre}_chunk_{i + 1:03d}", w=tamanio_chunk, h=tamanio_chunk,
+                               sx=subdiv, sy=subdiv, ch=False)[0]
+        _escribir_alturas(chunk, alturas, subdiv, tamanio_chunk, normales)
+        cmds.move(cx, 0, cz, chunk, absolute=True)
+        cmds.parent(chunk, grupo)
+
+    cmds.move(pos_x, pos_y, pos_z, grupo, absolute=True)
+
+    total_caras = int((subdivisiones ** 2).sum())
+    print(f"Terreno '{nombre}' creado con {n * n} chunks y {total_caras} caras")
+    print(f"Semilla usada: {seed}")
+
+    return grupo
+
+
 if __name__ == "__main__":
     crear_terreno_montanoso()
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Cálculos del modo de terreno por tiles (chunks) con LOD según la distancia
+a la curva de vuelo. Sin dependencias de Maya.
+"""
+
+import numpy as np
+
+
+def centros_chunks(extension, tamanio_chunk):
+    """
+    Devuelve los centros (x, z) de una cuadrícula de chunks que cubre el área.
+
+    Returns:
+        Tupla (centros, n) con centros de forma (n * n, 2) ordenados fila a fila
+        (fila 0 = z más positiva, igual que el heightfield) y n chunks por lado.
+    """
+    n = max(1, int(round(extension / tamanio_chunk)))
+    inicio = -n * tamanio_chunk / 2.0 + tamanio_chunk / 2.0
+    ejes = inicio + np.arange(n) * tamanio_chunk
+    xx, zz = np.meshgrid(ejes, ejes[::-1])
+    return np.column_stack([xx.ravel(), zz.ravel()]), n
+
+
+def distancia_a_polilinea(puntos, polilinea):
+    """
+    Distancia mínima de cada punto (M, 2) a una polilínea (K, 2) en el plano XZ.
+    Vectorizado sobre todos los pares punto-segmento.
+    """
+    puntos = np.asarray(puntos, dtype=np.float64)
+    polilinea = np.asarray(polilinea, dtype=np.float64)
+    if len(polilinea) == 1:
+        return np.linalg.norm(puntos - polilinea[0], axis=1)
+
+    a = polilinea[:-1][None, :, :]
+    ab = (polilinea[1:] - polilinea[:-1])[None, :, :]
+    ap = puntos[:, None, :] - a
+
+    largo2 = np.maximum((ab * ab).sum(axis=2), 1e-12)
+    t = np.clip((ap * ab).sum(axis=2) / largo2, 0.0, 1.0)
+    cercano = a + t[..., None] * ab
+    return np.linalg.norm(puntos[:, None, :] - cercano, axis=2).min(axis=1)
+
+
+def subdivisiones_por_distancia(distancias, tamanio_chunk, subdiv_max=64, subdiv_min=4,
+                                 radio_detalle=1.0):
+    """
+    Asigna a cada chunk una subdivisión potencia de dos: subdiv_max cerca de la
+    curva, dividiendo por dos en cada anillo de radio_detalle * tamanio_chunk.
+    Usar potencias de dos garantiza que los vértices gruesos sean un subconjunto
+    de los finos, lo que permite coser los bordes sin grietas.
+    """
+    subdiv_max = 1 << int(round(np.log2(max(subdiv_max, 1))))
+    nivel_max = int(np.log2(max(subdiv_max // max(subdiv_min, 1), 1)))
+    niveles = np.floor(np.asarray(distancias) / (tamanio_chunk * radio_detalle)).astype(int)
+    niveles = np.clip(niveles, 0, nivel_max)
+    return subdiv_max >> niveles
+
+
+def ajustar_a_presupuesto(subdivisiones, presupuesto, subdiv_min=4):
+    """
+    Reduce el detalle de los chunks más finos hasta que el total de caras
+    quepa en el presupuesto de polígonos.
+    """
+    subdivisiones = np.array(subdivisiones, dtype=int)
+    if presupuesto is None:
+        return subdivisiones
+
+    while (subdivisiones ** 2).sum() > presupuesto:
+        mayor = subdivisiones.max()
+        if mayor <= subdiv_min:
+            break
+        subdivisiones[subdivisiones == mayor] //= 2
+    return subdivisiones
+
+
+def coser_bordes(alturas, subdiv_vecinos):
+    """
+    Ajusta los bordes de un chunk para que coincidan con vecinos de menor resolución.
+    Los vértices que el vecino no tiene se interpolan linealmente entre los que sí
+    comparte, de forma que no aparecen grietas entre tiles.
+
+    Args:
+        alturas: Heightfield del chunk (n + 1, n + 1); se modifica in situ.
+        subdiv_vecinos: Dict {"norte", "sur", "oeste", "este"} -> subdivisión del vecino
+            (None si no hay vecino). Norte = fila 0, oeste = columna 0.
+    """
+    n = alturas.shape[0] - 1
+    bordes = {
+        "norte": (0, slice(None)),
+        "sur": (n, slice(None)),
+        "oeste": (slice(None), 0),
+        "este": (slice(None), n),
+    }
+
+    indices = np.arange(n + 1)
+    for lado, subdiv_vecino in subdiv_vecinos.items():
+        if subdiv_vecino is None or subdiv_vecino >= n:
+            continue
+        paso = n // subdiv_vecino
+        borde = alturas[bordes[lado]]
+        compartidos = indices[::paso]
+        alturas[bordes[lado]] = np.interp(indices, compartidos, borde[compartidos])
+
+    return alturas
+
+
+def vecinos_de(subdivisiones, n):
+    """
+    Devuelve para cada chunk (orden fila a fila) el dict de subdivisiones de sus vecinos,
+    listo para coser_bordes.
+    """
+    malla = np.asarray(subdivisiones).reshape(n, n)
+    vecinos = []
+    for fila in range(n):
+        for col in range(n):
+            vecinos.append({
+                "norte": malla[fila - 1, col] if fila > 0 else None,
+                "sur": malla[fila + 1, col] if fila < n - 1 else None,
+                "oeste": malla[fila, col - 1] if col > 0 else None,
+                "este": malla[fila, col + 1] if col < n - 1 else None,
+            })
+    return vecinos
@@ -0,0 +1,190 @@
+import maya.cmds as cmds
+import numpy as np
+import json
+import os
+import time
+from Utils.config import CARPETA_CACHE
+from Environment.frustum import (
+    fov_horizontal,
+    matrices_camara_seguimiento,
+    planos_frustum,
+    frames_visibles,
+)
+
+ACCIONES_CULLING = ("ocultar", "eliminar", "lod")
+
+
+def _rango_vuelo(objetivo):
+    """Rango de frames de la animación de vuelo (keys del motionPath o rango de reproducción)."""
+    motion_paths = cmds.listConnections(objetivo, type="motionPath") or []
+    for motion_path in motion_paths:
+        curvas = cmds.listConnections(motion_path + ".uValue", type="animCurveTU") or []
+        if curvas:
+            tiempos = cmds.keyframe(curvas[0], q=True, timeChange=True) or []
+            if tiempos:
+                return min(tiempos), max(tiempos)
+    return (cmds.playbackOptions(q=True, minTime=True), cmds.playbackOptions(q=True, maxTime=True))
+
+
+def _matrices_en_frames(nodo, frames):
+    """Matrices de mundo (F, 4, 4) del nodo evaluadas en cada frame."""
+    return np.array([
+        cmds.getAttr(nodo + ".worldMatrix[0]", time=frame) for frame in frames
+    ], dtype=np.float64).reshape(-1, 4, 4)
+
+
+def _objetos_entorno(grupos):
+    """
+    Objetos a analizar: los hijos directos de cada grupo (nubes, chunks de terreno) o el
+    propio objeto si es una malla (terreno de una pieza). Se omiten prototipos e instancers.
+    """
+    objetos = []
+    for grupo in grupos:
+        if not cmds.objExists(grupo):
+            continue
+        if cmds.listRelatives(grupo, shapes=True, type="mesh"):
+            objetos.append(grupo)
+            continue
+        for hijo in cmds.listRelatives(grupo, children=True, type="transform", fullPath=True) or []:
+            if hijo.endswith("nube_prototipos") or cmds.listRelatives(hijo, shapes=True, type="particle"):
+                continue
+            objetos.append(hijo)
+    return objetos
+
+
+def _mallas_de(objeto):
+    return cmds.listRelatives(objeto, allDescendents=True, type="mesh", fullPath=True) or []
+
+
+def _caras_de(objeto):
+    return sum(cmds.polyEvaluate(malla, face=True) for malla in _mallas_de(objeto))
+
+
+def _bajar_lod(objeto, porcentaje=75):
+    """
+    Muestra el objeto como caja en el viewport y reduce sus mallas no instanciadas
+    (las compartidas por varias instancias se dejan intactas).
+    """
+    cmds.setAttr(objeto + ".overrideEnabled", 1)
+    cmds.setAttr(objeto + ".overrideLevelOfDetail", 1)
+    for malla in _mallas_de(objeto):
+        if len(cmds.listRelatives(malla, allParents=True) or []) > 1:
+            continue
+        try:
+            cmds.polyReduce(malla, percentage=porcentaje, ch=False)
+        except Exception as e:
+            cmds.warning(f"No se pudo reducir {malla}: {e}")
+
+
+def culling_por_vuelo(objetivo="FLIGHT_DRIVER", camara=None, grupos=("campo_nubes", "terreno"),
+                      accion="ocultar", paso_frames=2, distancia=25.0, altura=6.0,
+                      fov_h=None, cerca=0.1, lejos=2000.0, margen=0.0, ruta_reporte=None):
+    """
+    Pre-pasada de visibilidad: recorre la animación de vuelo, prueba las cajas de los objetos
+    del entorno contra el frustum de la cámara en todos los frames a la vez y oculta, elimina
+    o simplifica lo que nunca se ve. Escribe un reporte JSON con el ahorro.
+
+    Args:
+        objetivo: Nodo animado que sigue la cámara (el driver de crear_controlador_vuelo).
+        camara: Cámara existente a usar; None = cámara virtual de seguimiento detrás del objetivo.
+        grupos: Grupos/objetos del entorno a analizar.
+        accion: "ocultar", "eliminar" o "lod".
+        paso_frames: Cada cuántos frames se muestrea la animación.
+        distancia, altura: Colocación de la cámara virtual de seguimiento.
+        fov_h: Campo de visión horizontal en grados (None = el de la cámara o 54.43).
+        cerca, lejos: Planos de recorte de la cámara.
+        margen: Unidades extra alrededor de cada caja (colchón entre muestras).
+        ruta_reporte: JSON de salida (None = carpeta de caché).
+
+    Returns:
+        Dict con el reporte.
+    """
+    if accion not in ACCIONES_CULLING:
+        raise ValueError(f"Acción desconocida: {accion}. Opciones: {ACCIONES_CULLING}")
+    if not cmds.objExists(objetivo):
+        cmds.warning(f"No existe '{objetivo}'. Crea primero el controlador de vuelo.")
+        return None
+
+    inicio_tiempo = time.perf_counter()
+    inicio, fin = _rango_vuelo(objetivo)
+    frames = np.arange(inicio, fin + 1e-6, paso_frames)
+
+    # Cámara: la indicada o una de seguimiento construida sobre el objetivo
+    if camara and cmds.objExists(camara):
+        matrices = _matrices_en_frames(camara, frames)
+        shape = (cmds.listRelatives(camara, shapes=True, type="camera") or [camara])[0]
+        if fov_h is None:
+            fov_h = fov_horizontal(cmds.getAttr(shape + ".focalLength"),
+                                   cmds.getAttr(shape + ".horizontalFilmAperture"))
+    else:
+        matrices = matrices_camara_seguimiento(_matrices_en_frames(objetivo, frames), distancia, altura)
+    fov_h = fov_h or 54.43
+
+    aspecto = cmds.getAttr("defaultResolution.width") / float(cmds.getAttr("defaultResolution.height"))
+    planos = planos_frustum(matrices, fov_h, aspecto, cerca, lejos)
+
+    objetos = _objetos_entorno(grupos)
+    if not objetos:
+        cmds.warning(f"No se encontraron objetos del entorno en {grupos}.")
+        return None
+
+    cajas = np.array([cmds.exactWorldBoundingBox(obj) for obj in objetos], dtype=np.float64)
+    visibles = frames_visibles(planos, cajas[:, :3] - margen, cajas[:, 3:] + margen)
+
+    caras = [_caras_de(obj) for obj in objetos]
+    nunca = [i for i, cuenta in enumerate(visibles) if cuenta == 0]
+    caras_afectadas = sum(caras[i] for i in nunca)
+    nombres = [objetos[i].split("|")[-1] for i in nunca]
+
+    for i in nunca:
+        if accion == "ocultar":
+            cmds.setAttr(objetos[i] + ".visibility", 0)
+        elif accion == "lod":
+            _bajar_lod(objetos[i])
+    if accion == "eliminar" and nunca:
+        cmds.delete([objetos[i] for i in nunca])
+
+    total_caras = sum(caras)
+    reporte = {
+        "objetivo": objetivo,
+        "camara": camara or "seguimiento",
+        "frames": [float(inicio), float(fin)],
+        "frames_muestreados": int(len(frames)),
+        "accion": accion,
+        "objetos_analizados": len(objetos),
+        "objetos_nunca_visibles": len(nunca),
+        "caras_totales": int(total_caras),
+        "caras_afectadas": int(caras_afectadas),
+        "porcentaje_caras": round(100.0 * caras_afectadas / total_caras, 2) if total_caras else 0.0,
+        "segundos": round(time.perf_counter() - inicio_tiempo, 3),
+        "objetos": nombres,
+    }
+
+    ruta_reporte = ruta_reporte or os.path.join(CARPETA_CACHE, "reporte_visibilidad.json")
+    os.makedirs(os.path.dirname(ruta_reporte), exist_ok=True)
+    with open(ruta_reporte, "w") as f:
+        json.dump(reporte, f, indent=2)
+
+    print(f"[✓] Culling '{accion}': {len(nunca)}/{len(objetos)} objetos nunca visibles, "
+          f"{caras_afectadas}/{total_caras} caras ({reporte['porcentaje_caras']}%) "
+          f"en {len(frames)} frames. Reporte: {ruta_reporte}")
+    return reporte
+
+
+def restaurar_visibilidad(reporte_o_ruta=None, grupos=("campo_nubes", "terreno")):
+    """
+    Vuelve a mostrar lo que ocultó culling_por_vuelo (a partir del reporte, su ruta o,
+    si no se indica, todo lo que haya en los grupos).
+    """
+    if reporte_o_ruta is None:
+        objetos = _objetos_entorno(grupos)
+    else:
+        reporte = reporte_o_ruta
+        if isinstance(reporte_o_ruta, str):
+            with open(reporte_o_ruta, "r") as f:
+                reporte = json.load(f)
+        objetos = [obj for obj in reporte["objetos"] if cmds.objExists(obj)]
+
+    for obj in objetos:
+        cmds.setAttr(obj + ".visibility", 1)
+    print(f"[✓] Visibilidad restaurada en {len(objetos)} objetos")
@@ -1,6 +1,27 @@
 import maya.cmds as cmds
 import random
 
+# Paletas de colores metálicos predefinidas (oscuro, medio, claro)
+PALETAS_METALICAS = [
+    # Cobre/Bronce
+    [(0.15, 0.12, 0.08), (0.4, 0.3, 0.2), (0.6, 0.5, 0.35)],
+    # Hierro/Acero
+    [(0.15, 0.15, 0.18), (0.35, 0.35, 0.40), (0.55, 0.55, 0.60)],
+    # Oro Viejo
+    [(0.25, 0.20, 0.08), (0.50, 0.42, 0.18), (0.70, 0.60, 0.30)],
+    # Plata Oscura
+    [(0.20, 0.22, 0.25), (0.45, 0.48, 0.52), (0.65, 0.68, 0.72)],
+    # Bronce Verde (oxidado)
+    [(0.12, 0.18, 0.15), (0.25, 0.40, 0.32), (0.40, 0.55, 0.45)],
+    # Titanio
+    [(0.18, 0.18, 0.20), (0.38, 0.38, 0.42), (0.58, 0.58, 0.65)],
+    # Cobre Rojizo
+    [(0.20, 0.10, 0.08), (0.45, 0.22, 0.15), (0.65, 0.35, 0.25)],
+]
+
+# Color set que escribe el terreno con sombreado por vértice
+COLOR_SET_TERRENO = "colorTerreno"
+
 def aplicar_material_oro(objeto, nombre_material="M_Gold"):
     """
     Crea un material tipo 'gold' (AI Standard Surface) y lo aplica
@@ -154,6 +175,48 @@ def aplicar_material_montanas(objeto, nombre_material="M_Montanas_Metalico"):
     print(f"[✓] Material metálico de montañas aplicado a '{objeto}'.")
 
 
+def aplicar_material_montanas_vertices(objeto, nombre_material="M_Montanas_Vertices"):
+    """
+    Material metálico mínimo para montañas con color por vértice: el baseColor se lee
+    del color set del terreno (aiUserDataColor), sin ramp, ruidos, AO ni displacement.
+    """
+    if not cmds.objExists(objeto):
+        cmds.warning(f"El objeto '{objeto}' no existe.")
+        return
+
+    if not cmds.objExists(nombre_material):
+        shader = cmds.shadingNode("aiStandardSurface", asShader=True, name=nombre_material)
+        sg = cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=nombre_material + "SG")
+        cmds.connectAttr(shader + ".outColor", sg + ".surfaceShader", force=True)
+
+        cmds.setAttr(shader + ".metalness", 0.9)
+        cmds.setAttr(shader + ".specular", 1.0)
+        cmds.setAttr(shader + ".specularRoughness", 0.35)
+        cmds.setAttr(shader + ".specularIOR", 1.5)
+
+        # Color por vértice: Arnold lee el color set exportado como user data
+        datos = cmds.shadingNode("aiUserDataColor", asUtility=True, name=nombre_material + "_colorSet")
+        cmds.setAttr(datos + ".attribute", COLOR_SET_TERRENO, type="string")
+        cmds.connectAttr(datos + ".outColor", shader + ".baseColor")
+
+    sg = nombre_material + "SG"
+    meshes = cmds.listRelatives(objeto, allDescendents=True, type="mesh", fullPath=True) or []
+    if not meshes:
+        meshes = cmds.listRelatives(objeto, shapes=True, type="mesh", fullPath=True) or []
+
+    if not meshes:
+        cmds.warning(f"No se encontraron mallas dentro de '{objeto}'.")
+        return
+
+    for mesh in meshes:
+        cmds.sets(mesh, e=True, forceElement=sg)
+        # Arnold solo exporta los color sets si se le indica
+        if cmds.attributeQuery("aiExportColors", node=mesh, exists=True):
+            cmds.setAttr(mesh + ".aiExportColors", 1)
+
+    print(f"[✓] Material de montañas con color por vértice aplicado a '{objeto}'.")
+
+
 def cambiar_color_montanas_aleatorio(nombre_material="M_Montanas_Metalico"):
     """
     Cambia el color del material de las montañas de forma aleatoria entre paletas metálicas.
@@ -162,26 +225,8 @@ def cambiar_color_montanas_aleatorio(nombre_material="M_Montanas_Metalico"):
         cmds.warning(f"El material '{nombre_material}' no existe. Crea el material primero.")
         return
     
-    # Paletas de colores metálicos predefinidas
-    paletas = [
-        # Cobre/Bronce
-        [(0.15, 0.12, 0.08), (0.4, 0.3, 0.2), (0.6, 0.5, 0.35)],
-        # Hierro/Acero
-        [(0.15, 0.15, 0.18), (0.35, 0.35, 0.40), (0.55, 0.55, 0.60)],
-        # Oro Viejo
-        [(0.25, 0.20, 0.08), (0.50, 0.42, 0.18), (0.70, 0.60, 0.30)],
-        # Plata Oscura
-        [(0.20, 0.22, 0.25), (0.45, 0.48, 0.52), (0.65, 0.68, 0.72)],
-        # Bronce Verde (oxidado)
-        [(0.12, 0.18, 0.15), (0.25, 0.40, 0.32), (0.40, 0.55, 0.45)],
-        # Titanio
-        [(0.18, 0.18, 0.20), (0.38, 0.38, 0.42), (0.58, 0.58, 0.65)],
-        # Cobre Rojizo
-        [(0.20, 0.10, 0.08), (0.45, 0.22, 0.15), (0.65, 0.35, 0.25)],
-    ]
-    
     # Seleccionar paleta aleatoria
-    paleta = random.choice(paletas)
+    paleta = random.choice(PALETAS_METALICAS)
     
     ramp_name = nombre_material + "_ramp"
     if cmds.objExists(ramp_name):
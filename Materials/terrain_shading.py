@@ -0,0 +1,72 @@
+"""
+Colores por vértice del terreno calculados en NumPy a partir de altura, pendiente y curvatura.
+Sustituye al stack de ramp + aiNoise + AO del material de montañas cuando se quiere un
+render de previsualización rápido: el color ya está en la malla y el shader solo lo lee.
+Sin dependencias de Maya.
+"""
+
+import numpy as np
+
+
+def _interpolar_paleta(t, paleta):
+    """Interpola los 3 colores de una paleta (oscuro, medio, claro) en t ∈ [0, 1]."""
+    colores = np.asarray(paleta, dtype=np.float64)
+    posiciones = np.linspace(0.0, 1.0, len(colores))
+    return np.stack([np.interp(t, posiciones, colores[:, canal]) for canal in range(3)], axis=-1)
+
+
+def curvatura_heightfield(alturas, paso):
+    """
+    Laplaciano del heightfield (bordes replicados).
+    Positivo en valles y hondonadas, negativo en crestas y picos.
+    """
+    ext = np.pad(np.asarray(alturas, dtype=np.float64), 1, mode="edge")
+    centro = ext[1:-1, 1:-1]
+    return (ext[:-2, 1:-1] + ext[2:, 1:-1] + ext[1:-1, :-2] + ext[1:-1, 2:] - 4.0 * centro) / (paso * paso)
+
+
+def colores_terreno(alturas, paso, paleta, normales=None, rango=None,
+                    peso_pendiente=0.6, peso_curvatura=0.5):
+    """
+    Calcula el color RGB de cada vértice del heightfield.
+
+    - La altura normalizada recorre la paleta de oscuro (valles) a claro (cumbres).
+    - Las laderas empinadas se oscurecen hacia el color oscuro de la paleta.
+    - Las hondonadas se oscurecen (oclusión barata) y las crestas se aclaran (desgaste).
+
+    Args:
+        alturas: Heightfield 2D.
+        paso: Distancia entre vértices vecinos.
+        paleta: Tres colores RGB (oscuro, medio, claro), como en PALETAS_METALICAS.
+        normales: Normales (filas, columnas, 3) ya calculadas (None = se calculan).
+        rango: (altura_min, altura_max) para normalizar (None = el del propio heightfield).
+        peso_pendiente: Intensidad del oscurecido por pendiente (0-1).
+        peso_curvatura: Intensidad del efecto de curvatura (0-1).
+
+    Returns:
+        Array float64 (filas, columnas, 3) con valores en [0, 1].
+    """
+    alturas = np.asarray(alturas, dtype=np.float64)
+    altura_min, altura_max = rango if rango is not None else (alturas.min(), alturas.max())
+    t = np.clip((alturas - altura_min) / max(altura_max - altura_min, 1e-9), 0.0, 1.0)
+    color = _interpolar_paleta(t, paleta)
+
+    # Pendiente: 0 en plano, 1 en vertical (a partir de la componente Y de la normal)
+    if normales is None:
+        dz, dx = np.gradient(alturas, paso)
+        inclinacion = np.hypot(dx, dz)
+        pendiente = 1.0 - 1.0 / np.sqrt(1.0 + inclinacion * inclinacion)
+    else:
+        pendiente = 1.0 - np.abs(normales[..., 1])
+    oscuro = np.asarray(paleta[0], dtype=np.float64)
+    mezcla = (peso_pendiente * np.clip(pendiente * 2.0, 0.0, 1.0))[..., None]
+    color = color * (1.0 - mezcla) + oscuro * mezcla
+
+    # Curvatura normalizada por su dispersión para que no dependa de la escala del terreno
+    curvatura = curvatura_heightfield(alturas, paso)
+    dispersion = np.std(curvatura)
+    if dispersion > 0.0:
+        curvatura = np.tanh(curvatura / (2.0 * dispersion))
+        color *= (1.0 - peso_curvatura * 0.5 * curvatura)[..., None]
+
+    return np.clip(color, 0.0, 1.0)
@@ -1,4 +1,6 @@
 import maya.cmds as cmds
+from Utils.bbox_cache import obtener_cache_cajas
+from Utils.scene_index import obtener_indice
 
 def crear_control_avion():
     partes_avion = [
@@ -9,7 +11,8 @@ def crear_control_avion():
         "ORNAMENTACION_GENERADO"
     ]
 
-    partes_existentes = [p for p in partes_avion if cmds.objExists(p)]
+    indice = obtener_indice()
+    partes_existentes = indice.buscar_todos("parte") or [p for p in partes_avion if cmds.objExists(p)]
     if not partes_existentes:
         cmds.warning("No se encontró ninguna parte del avión en la escena.")
         return
@@ -21,16 +24,9 @@ def crear_control_avion():
     )[0]
 
     grupo = cmds.group(control, name="ROOT_CTRL_Avion")
+    indice.registrar(control, "control_avion")
 
-    centros = []
-    for parte in partes_existentes:
-        bbox = cmds.exactWorldBoundingBox(parte)
-        centro = [
-            (bbox[0] + bbox[3]) / 2.0,
-            (bbox[1] + bbox[4]) / 2.0,
-            (bbox[2] + bbox[5]) / 2.0
-        ]
-        centros.append(centro)
+    centros = [obtener_cache_cajas().centro(parte) for parte in partes_existentes]
 
     centro_avion = [
         sum(c[0] for c in centros) / len(centros),
@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 from Utils.config import CONFIG
+from Utils.bbox_cache import obtener_cache_cajas
+from Utils.scene_index import obtener_indice
 
 def crear_core_joints():
     """
@@ -12,26 +14,22 @@ def crear_core_joints():
                   ("FUSELAJE", "core_plane_joint_002"),
                   ("COLA", "core_plane_joint_003")]
 
-    def centro_bbox(obj):
-        bbox = cmds.exactWorldBoundingBox(obj)
-        return [(bbox[0] + bbox[3]) / 2.0,
-                (bbox[1] + bbox[4]) / 2.0,
-                (bbox[2] + bbox[5]) / 2.0]
-
+    indice = obtener_indice()
     padre_anterior = None
-    for parte, nombre_joint in orden_core:
-        nombre_obj = f"{parte}_GENERADO"
+    for orden, (parte, nombre_joint) in enumerate(orden_core, 1):
+        nombre_obj = indice.primero("parte", parte) or f"{parte}_GENERADO"
         if not cmds.objExists(nombre_obj):
             print(f"[!] No se encontró la parte: {nombre_obj} → se omite {nombre_joint}")
             continue
 
-        centro = centro_bbox(nombre_obj)
+        centro = obtener_cache_cajas().centro(nombre_obj)
         cmds.select(clear=True)
 
         if cmds.objExists(nombre_joint):
             cmds.delete(nombre_joint)
 
         joint = cmds.joint(name=nombre_joint, position=centro, absolute=True)
+        indice.registrar(joint, "joint_core", parte=parte, orden=orden)
         joints_creados[parte] = joint
         print(f"[✓] {parte}: {joint} creado en {centro}")
 
@@ -1,3 +1,4 @@
+import time
 import maya.cmds as cmds
 from SplineRig import (
     locators2curve,
@@ -8,13 +9,24 @@ from SplineRig import (
     parent_const,
     all_tools,
 )
+from SplineRig.batch_spine import build_spine_batched, SPINE_MODES
+from Utils.scene_index import obtener_indice
 
 
 def get_joint_chain_by_suffix(suffix="core"):
     """
     Devuelve una cadena de joints que terminan con el sufijo indicado (por defecto 'core'),
-    ordenados jerárquicamente de padre a hijo.
+    ordenados jerárquicamente de padre a hijo. Usa los joints core registrados en el
+    índice de escena (ya ordenados) y solo escanea la escena si no hay ninguno.
     """
+    registrados = [
+        j for j in obtener_indice().buscar_todos("joint_core")
+        if j.split("|")[-1].lower().startswith(suffix.lower())
+    ]
+    if registrados:
+        print(f"[✓] Cadena detectada desde el índice: {registrados}")
+        return registrados
+
     joints = cmds.ls(type="joint") or []
     core_joints = [j for j in joints if j.lower().startswith(suffix.lower())]
 
@@ -45,19 +57,36 @@ def get_joint_chain_by_suffix(suffix="core"):
     return chain
 
 
-def build_spine_from_core_joints():
-    """Crea el rig de columna automáticamente usando los joints con sufijo 'core'."""
+def build_spine_from_core_joints(batched=True, mode="constraints"):
+    """
+    Crea el rig de columna automáticamente usando los joints con sufijo 'core'.
+    Con batched=True todo el rig (curva incluida) se construye en un único lote con un solo
+    paso de undo; con False se ejecutan los pasos de SplineRig uno a uno.
+    mode="matrix" construye la variante sin constraints (solo con batched=True).
+    """
     chain = get_joint_chain_by_suffix("core")
     if not chain:
         return
 
     num_joints = len(chain)
-    base_name = chain[0].split("_")[0]  # inferencia del prefijo (ej: 'plane')
+    base_name = chain[0].split("|")[-1].split("_")[0]  # inferencia del prefijo (ej: 'plane')
     curve_name = f"{base_name}_curve"
 
     # Obtener posiciones
     positions = [cmds.xform(j, q=True, ws=True, t=True) for j in chain]
 
+    if batched:
+        cmds.undoInfo(openChunk=True, chunkName="build_spine_from_core_joints")
+        try:
+            if cmds.objExists(curve_name):
+                cmds.delete(curve_name)
+            cmds.curve(name=curve_name, degree=1, ep=positions)
+            build_spine_batched(curve_name, chain, mode=mode)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        print(f"✅ Rig de columna generado automáticamente con {num_joints} joints 'core'.")
+        return
+
     # Crear curva
     if cmds.objExists(curve_name):
         cmds.delete(curve_name)
@@ -73,6 +102,67 @@ def build_spine_from_core_joints():
 
     print(f"✅ Rig de columna generado automáticamente con {num_joints} joints 'core'.")
 
+def compare_spine_modes(frames=240, amplitude=3.0):
+    """
+    Compara la velocidad de reproducción de los modos de spine rig: construye cada modo,
+    anima el locator central, evalúa la cadena de joints frame a frame y deshace la
+    construcción. Devuelve {modo: fps}.
+    """
+    chain = get_joint_chain_by_suffix("core")
+    if not chain:
+        return {}
+
+    results = {}
+    for mode in SPINE_MODES:
+        cmds.undoInfo(openChunk=True, chunkName=f"compare_spine_{mode}")
+        try:
+            build_spine_from_core_joints(batched=True, mode=mode)
+            driver = f"spineLoc_ctrl_{len(chain) // 2 + 1:03d}"
+            base_y = cmds.getAttr(f"{driver}.translateY")
+            for frame, offset in ((1, 0.0), (frames // 2, amplitude), (frames, 0.0)):
+                cmds.setKeyframe(driver, attribute="translateY", time=frame, value=base_y + offset)
+
+            start = time.perf_counter()
+            for frame in range(1, frames + 1):
+                cmds.currentTime(frame, update=False)
+                for joint in chain:
+                    cmds.getAttr(f"{joint}.worldMatrix[0]")
+            results[mode] = round(frames / (time.perf_counter() - start), 1)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        cmds.undo()
+
+    cmds.currentTime(1)
+    print(f"📊 Reproducción del spine rig (evaluación DG, {frames} frames, {len(chain)} joints):")
+    for mode, fps in results.items():
+        print(f"   {mode:<12} {fps:>8.1f} fps")
+    return results
+
+
+def time_spine_build(num_joints=100, spacing=1.0):
+    """
+    Mide la construcción por lotes de una cadena de prueba de num_joints joints en cada
+    modo (el segundo reemplaza al primero) y deshace todo al terminar. Devuelve {modo: ms}.
+    """
+    results = {}
+    cmds.undoInfo(openChunk=True, chunkName="time_spine_build")
+    try:
+        points = [(0.0, 0.0, i * spacing) for i in range(num_joints)]
+        cmds.select(clear=True)
+        chain = [cmds.joint(name=f"qapBench_{i + 1:03d}_jnt", position=p) for i, p in enumerate(points)]
+        curve = cmds.curve(name="qapBench_curve", degree=1, ep=points)
+        for mode in SPINE_MODES:
+            result = build_spine_batched(curve, chain, loc_base="qapBenchLoc", target_base="qapBenchTarget", mode=mode)
+            results[mode] = round(result["counts"]["seconds"] * 1000.0, 1)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    cmds.undo()
+
+    print(f"⏱️ Construcción del spine rig por lotes ({num_joints} joints):")
+    for mode, ms in results.items():
+        print(f"   {mode:<12} {ms:>8.1f} ms")
+    return results
+
 
 if __name__ == "__main__":
     build_spine_from_core_joints()
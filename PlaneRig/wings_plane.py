@@ -1,5 +1,7 @@
 import maya.cmds as cmds
 from Utils.config import CONFIG
+from Utils.bbox_cache import obtener_cache_cajas
+from Utils.scene_index import obtener_indice
 
 def crear_wing_joints():
     """
@@ -17,11 +19,18 @@ def crear_wing_joints():
 
     print(f"[i] Buscando locators definidos en config: {locator_patterns}")
 
-    # Buscar todos los locators que coincidan con los patrones
-    todos_candidatos = []
-    for pat in locator_patterns:
-        matches = cmds.ls(f"*{pat}", type="transform") or []
-        todos_candidatos.extend(matches)
+    # Buscar los locators que coincidan con los patrones: primero entre los registrados
+    # al generar las alas y, si no hay ninguno (escena antigua), escaneando la escena
+    indice = obtener_indice()
+    registrados = indice.buscar("locator", parte="ALAS")
+    todos_candidatos = [
+        loc for loc in registrados
+        if any(loc.split("|")[-1].endswith(pat) for pat in locator_patterns)
+    ]
+    if not todos_candidatos:
+        for pat in locator_patterns:
+            matches = cmds.ls(f"*{pat}", type="transform") or []
+            todos_candidatos.extend(matches)
 
     if not todos_candidatos:
         print(f"[!] No se encontró ningún locator que coincida con {locator_patterns}")
@@ -47,18 +56,18 @@ def crear_wing_joints():
         loc = list(pos_x.keys())[0]
         x = pos_x[loc]
         fus_x = 0.0
-        if cmds.objExists("FUSELAJE_GENERADO"):
+        fuselaje = indice.primero("parte", "FUSELAJE") or "FUSELAJE_GENERADO"
+        if cmds.objExists(fuselaje):
             try:
-                bbox = cmds.exactWorldBoundingBox("FUSELAJE_GENERADO")
-                fus_x = (bbox[0] + bbox[3]) / 2.0
+                fus_x = obtener_cache_cajas().centro(fuselaje)[0]
             except Exception:
                 pass
         lado = "L" if x < fus_x else "R"
         mapping = {lado: loc}
         print(f"[i] Un solo locator detectado ('{loc}'). Asignado a lado '{lado}' (x={x:.3f}, fuselaje_x={fus_x:.3f})")
 
-    # Crear joints según mapping
-    for lado, loc_name in mapping.items():
+    # Crear joints según mapping (orden = posición del joint en la cadena de alas, L antes que R)
+    for orden, (lado, loc_name) in enumerate(sorted(mapping.items()), 1):
         try:
             pos = cmds.xform(loc_name, q=True, t=True, ws=True)
         except Exception as e:
@@ -71,9 +80,11 @@ def crear_wing_joints():
 
         cmds.select(clear=True)
         joint = cmds.joint(name=nombre_joint, position=pos, absolute=True)
-        if cmds.objExists("core_plane_joint_002"):
+        indice.registrar(joint, "joint_ala", parte="ALAS", lado=lado, orden=orden)
+        joint_fuselaje = indice.primero("joint_core", "FUSELAJE") or "core_plane_joint_002"
+        if cmds.objExists(joint_fuselaje):
             try:
-                cmds.parent(joint, "core_plane_joint_002")
+                cmds.parent(joint, joint_fuselaje)
             except Exception as e:
                 print(f"[!] No se pudo parentar {joint} al fuselaje: {e}")
 
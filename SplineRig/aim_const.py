@@ -1,15 +1,12 @@
 import maya.cmds as cmds
+from Utils.scene_index import obtener_indice
 
 
 def create_spine_target_aims(base_name="spineTarget_ctrl", num_targets=None):
-    targets = cmds.ls(f"{base_name}_*", type="transform")
-    num_targets = num_targets or len(targets)
+    targets = obtener_indice().buscar_o_escanear("spine_target", f"{base_name}_*", parte=base_name)
+    targets = targets[:num_targets or len(targets)]
 
-    for i in range(1, num_targets):
-        target = f"{base_name}_{i:03d}"
-        source = f"{base_name}_{i + 1:03d}"
-        if not cmds.objExists(source) or not cmds.objExists(target):
-            continue
+    for target, source in zip(targets, targets[1:]):
         cmds.aimConstraint(
             target,
             source,
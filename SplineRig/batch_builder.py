@@ -0,0 +1,142 @@
+import os
+import re
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+PLUGIN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "batch_rig_cmd.py")
+COMMAND_NAME = "qapBatchRig"
+
+_pending = None
+
+
+def take_pending():
+    """Entrega (y olvida) el modificador preparado para el comando qapBatchRig."""
+    global _pending
+    modifier, _pending = _pending, None
+    return modifier
+
+
+def _resolve_node(name):
+    sel = om.MSelectionList()
+    sel.add(name)
+    return sel.getDependNode(0)
+
+
+class BatchRigBuilder:
+    """
+    Acumula creaciones de nodos, renombrados, valores y conexiones en un único
+    MDagModifier y los aplica de una vez con el comando qapBatchRig: un solo commit y un
+    solo paso de undo, sin consultas por nombre ni prints por elemento.
+    Los nodos creados se referencian por su nombre final aunque aún no existan.
+    """
+
+    def __init__(self):
+        self._modifier = om.MDagModifier()
+        self._nodes = {}  # nombre -> MObject (creados en este lote)
+        self.counts = {"nodes": 0, "connections": 0, "values": 0, "commands": 0}
+
+    def _node(self, name):
+        return self._nodes[name] if name in self._nodes else _resolve_node(name)
+
+    def _plug(self, path):
+        """'nodo.attr[2].hijo' -> MPlug (también para nodos creados en este lote); un MPlug se devuelve tal cual."""
+        if isinstance(path, om.MPlug):
+            return path
+        node_name, _, attr_path = path.partition(".")
+        fn = om.MFnDependencyNode(self._node(node_name))
+        plug = None
+        for segment in attr_path.split("."):
+            match = re.match(r"(\w+)(?:\[(\d+)\])?$", segment)
+            attr, index = match.group(1), match.group(2)
+            plug = fn.findPlug(attr, False) if plug is None else plug.child(fn.attribute(attr))
+            if index is not None:
+                plug = plug.elementByLogicalIndex(int(index))
+        return plug
+
+    # --- Nodos ---
+
+    def create_dag(self, node_type, name, parent=None):
+        parent_obj = self._node(parent) if parent else om.MObject.kNullObj
+        obj = self._modifier.createNode(node_type, parent_obj)
+        self._modifier.renameNode(obj, name)
+        self._nodes[name] = obj
+        self.counts["nodes"] += 1
+        return name
+
+    def create_dg(self, node_type, name):
+        obj = om.MDGModifier.createNode(self._modifier, node_type)
+        self._modifier.renameNode(obj, name)
+        self._nodes[name] = obj
+        self.counts["nodes"] += 1
+        return name
+
+    def create_locator(self, name, parent=None):
+        """Transform + shape locator (equivalente a spaceLocator)."""
+        self.create_dag("transform", name, parent)
+        self.create_dag("locator", f"{name}Shape", name)
+        return name
+
+    def delete(self, name):
+        self._modifier.deleteNode(_resolve_node(name))
+
+    def uuid(self, name):
+        """UUID de un nodo creado en este lote (válido tras execute)."""
+        return om.MFnDependencyNode(self._nodes[name]).uuid().asString()
+
+    def add_attribute(self, name, attr, value):
+        """Atributo dinámico string (value str) o long (value int) con su valor, en un nodo de este lote."""
+        obj = self._nodes[name]
+        if isinstance(value, str):
+            attr_obj = om.MFnTypedAttribute().create(attr, attr, om.MFnData.kString)
+        else:
+            attr_obj = om.MFnNumericAttribute().create(attr, attr, om.MFnNumericData.kLong, 0)
+        self._modifier.addAttribute(obj, attr_obj)
+        plug = om.MPlug(obj, attr_obj)
+        if isinstance(value, str):
+            self._modifier.newPlugValueString(plug, value)
+        else:
+            self._modifier.newPlugValueInt(plug, int(value))
+        self.counts["values"] += 1
+
+    # --- Valores y conexiones ---
+
+    def set_value(self, path, value):
+        """Double, int o bool; una tupla/lista se reparte entre los hijos del compuesto."""
+        plug = self._plug(path)
+        if isinstance(value, (tuple, list)):
+            for i, v in enumerate(value):
+                self._modifier.newPlugValueDouble(plug.child(i), float(v))
+        elif isinstance(value, bool):
+            self._modifier.newPlugValueBool(plug, value)
+        elif isinstance(value, int):
+            self._modifier.newPlugValueInt(plug, value)
+        else:
+            self._modifier.newPlugValueDouble(plug, float(value))
+        self.counts["values"] += 1
+
+    def set_matrix(self, path, matrix):
+        self._modifier.newPlugValue(self._plug(path), om.MFnMatrixData().create(om.MMatrix(matrix)))
+        self.counts["values"] += 1
+
+    def connect(self, source, destination):
+        self._modifier.connect(self._plug(source), self._plug(destination))
+        self.counts["connections"] += 1
+
+    def disconnect(self, source, destination):
+        self._modifier.disconnect(self._plug(source), self._plug(destination))
+
+    def command(self, mel):
+        """Comando MEL que se ejecuta (y se deshace) en orden dentro del mismo lote."""
+        self._modifier.commandToExecute(mel)
+        self.counts["commands"] += 1
+
+    # --- Ejecución ---
+
+    def execute(self):
+        """Aplica todo el lote como un solo comando deshacible."""
+        global _pending
+        if not cmds.pluginInfo(PLUGIN_FILE, q=True, loaded=True):
+            cmds.loadPlugin(PLUGIN_FILE, quiet=True)
+        _pending = self._modifier
+        getattr(cmds, COMMAND_NAME)()
+        return dict(self.counts)
@@ -0,0 +1,44 @@
+"""
+Plugin con el comando qapBatchRig: aplica el MDagModifier preparado por
+SplineRig.batch_builder.BatchRigBuilder y lo registra como un único paso de undo.
+Se carga automáticamente desde BatchRigBuilder.execute().
+"""
+
+import maya.api.OpenMaya as om
+from SplineRig import batch_builder
+
+
+def maya_useNewAPI():
+    pass
+
+
+class BatchRigCommand(om.MPxCommand):
+
+    def __init__(self):
+        super().__init__()
+        self._modifier = None
+
+    def doIt(self, args):
+        self._modifier = batch_builder.take_pending()
+        if self._modifier is None:
+            raise RuntimeError("No hay ningún lote de rig pendiente.")
+        self._modifier.doIt()
+
+    def redoIt(self):
+        self._modifier.doIt()
+
+    def undoIt(self):
+        self._modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin, "QAncientPlane", "1.0").registerCommand(
+        batch_builder.COMMAND_NAME, BatchRigCommand
+    )
+
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand(batch_builder.COMMAND_NAME)
@@ -0,0 +1,250 @@
+import time
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+from SplineRig.batch_builder import BatchRigBuilder
+from Utils.bspline import curva_desde_maya
+from Utils.scene_index import obtener_indice, valores_atributos
+
+SPINE_MODES = ("constraints", "matrix")
+_IDENTITY = [1.0 if i % 5 == 0 else 0.0 for i in range(16)]
+_WORLD_UP = om.MVector(0.0, 1.0, 0.0)
+
+
+def _curve_dag(curve_name):
+    sel = om.MSelectionList()
+    sel.add(curve_name)
+    dag = sel.getDagPath(0)
+    transform = om.MDagPath(dag)
+    dag.extendToShape()
+    return transform, dag
+
+
+def _joint_info(joints):
+    """
+    Resuelve los joints con una sola MSelectionList: por joint devuelve su matriz de mundo,
+    la ruta del padre (o None), los parentConstraint hijos y el plug que conduce su
+    offsetParentMatrix (o None).
+    """
+    sel = om.MSelectionList()
+    for joint in joints:
+        sel.add(joint)
+
+    info = []
+    for i in range(sel.length()):
+        dag = sel.getDagPath(i)
+        parent = om.MDagPath(dag)
+        parent.pop()
+        constraints = [
+            om.MFnDagNode(dag.child(c)).fullPathName()
+            for c in range(dag.childCount())
+            if dag.child(c).apiType() == om.MFn.kParentConstraint
+        ]
+        source = om.MFnDependencyNode(dag.node()).findPlug("offsetParentMatrix", False).source()
+        info.append({
+            "world": dag.inclusiveMatrix(),
+            "parent": parent.fullPathName() if parent.length() else None,
+            "constraints": constraints,
+            "source": None if source.isNull else source,
+        })
+    return info
+
+
+def _release_joints(builder, joints, info):
+    """
+    Suelta (dentro del lote) los joints de un rig matricial anterior: desconecta su
+    offsetParentMatrix y devuelve la pose actual a translate/rotate para que cualquier
+    modo parta de ella.
+    """
+    for joint, data in zip(joints, info):
+        if data["source"] is None:
+            continue
+        builder.disconnect(data["source"], f"{joint}.offsetParentMatrix")
+        builder.set_matrix(f"{joint}.offsetParentMatrix", _IDENTITY)
+        world = " ".join(str(v) for v in data["world"])
+        builder.command(f"xform -worldSpace -matrix {world} {joint};")
+
+
+def _aim_world_matrices(points):
+    """
+    Matrices de mundo de los targets del modo matricial, iguales a las que producen sus
+    aimMatrix: eje Y hacia el target anterior y Z alineado con el arriba del mundo.
+    El primer target solo tiene traslación.
+    """
+    matrices = []
+    for i, point in enumerate(points):
+        position = om.MVector(*point)
+        if i == 0:
+            x_axis, y_axis, z_axis = om.MVector.kXaxisVector, om.MVector.kYaxisVector, om.MVector.kZaxisVector
+        else:
+            y_axis = (om.MVector(*points[i - 1]) - position).normalize()
+            z_axis = _WORLD_UP - y_axis * (_WORLD_UP * y_axis)
+            if z_axis.length() < 1e-6:
+                z_axis = om.MVector.kZaxisVector - y_axis * y_axis.z
+            z_axis.normalize()
+            x_axis = y_axis ^ z_axis
+        matrices.append(om.MMatrix([
+            x_axis.x, x_axis.y, x_axis.z, 0.0,
+            y_axis.x, y_axis.y, y_axis.z, 0.0,
+            z_axis.x, z_axis.y, z_axis.z, 0.0,
+            position.x, position.y, position.z, 1.0,
+        ]))
+    return matrices
+
+
+def build_spine_batched(
+    curve_name,
+    joints,
+    loc_base="spineLoc_ctrl",
+    target_base="spineTarget_ctrl",
+    radius=2.0,
+    mode="constraints",
+):
+    """
+    Construye el spine rig completo (pasos 2 a 7 de SplineRig) en un único lote:
+    locators sobre los CVs, controles circulares, targets con pointOnCurveInfo que
+    apuntan al anterior y joints que siguen a sus targets.
+    Todo (también soltar los joints de un rig anterior y marcar los nodos para el índice
+    de escena) se aplica con un solo commit y se deshace con un solo undo.
+    Los nodos con el mismo nombre de una construcción anterior se reemplazan.
+
+    Modos:
+        "constraints": decomposeMatrix por CV, aimConstraint y parentConstraint (como los
+            pasos de SplineRig).
+        "matrix": sin constraints; los locators conducen los CVs directamente, cada target
+            se orienta con composeMatrix + aimMatrix y cada joint recibe
+            offset * target.worldMatrix * padre.worldInverseMatrix en su offsetParentMatrix.
+    """
+    if mode not in SPINE_MODES:
+        raise ValueError(f"Modo desconocido: {mode}. Opciones: {SPINE_MODES}")
+    if not cmds.objExists(curve_name):
+        cmds.warning(f"⚠️ La curva {curve_name} no existe.")
+        return {}
+
+    start = time.perf_counter()
+    matrix = mode == "matrix"
+
+    transform_dag, shape_dag = _curve_dag(curve_name)
+    curve_transform = transform_dag.fullPathName()
+    curve_shape = shape_dag.fullPathName()
+    fn_curve = om.MFnNurbsCurve(shape_dag)
+
+    cvs = fn_curve.cvPositions(om.MSpace.kWorld)
+    num = min(len(joints), len(cvs))
+    joints = joints[:num]
+    to_local = transform_dag.inclusiveMatrixInverse()
+    curve = curva_desde_maya(curve_name)
+    params = curve.parametros_uniformes(num)
+    info = _joint_info(joints)
+
+    # Nombres de una construcción anterior (ambos modos), resueltos con un solo cmds.ls
+    loc_names = [f"{loc_base}_{i + 1:03d}" for i in range(num)]
+    target_names = [f"{target_base}_{i + 1:03d}" for i in range(num)]
+    joint_names = [joint.split("|")[-1] for joint in joints]
+    candidates = loc_names + target_names
+    candidates += [f"{loc}_{suffix}" for loc in loc_names for suffix in ("decompMatrix", "makeNurbCircle")]
+    candidates += [f"{target}_{suffix}" for target in target_names for suffix in ("POC", "composeMatrix", "aimMatrix")]
+    candidates += [f"{joint}_offsetMultMatrix" for joint in joint_names]
+    existing = set(cmds.ls(candidates) or [])
+
+    builder = BatchRigBuilder()
+
+    _release_joints(builder, joints, info)
+    # Se reemplazan los nodos de una construcción anterior de cualquiera de los dos modos:
+    # cambiar de modo no deja ayudantes del otro conectados a la curva o a los joints
+    for name in candidates:
+        if name in existing:
+            builder.delete(name)
+    for data in info:
+        for constraint in data["constraints"]:
+            builder.delete(constraint)
+
+    locators, targets, positions = [], [], []
+    for i in range(num):
+        # Paso 2-3: locator sobre el CV que lo conduce
+        loc = builder.create_locator(loc_names[i], parent=curve_transform)
+        local = om.MPoint(cvs[i]) * to_local
+        builder.set_value(f"{loc}.translate", (local.x, local.y, local.z))
+        if matrix:
+            # El locator es hijo de la curva: su translate ya está en espacio objeto
+            builder.connect(f"{loc}.translate", f"{curve_shape}.controlPoints[{i}]")
+        else:
+            decomp = builder.create_dg("decomposeMatrix", f"{loc}_decompMatrix")
+            builder.connect(f"{loc}.worldMatrix[0]", f"{decomp}.inputMatrix")
+            builder.connect(f"{decomp}.outputTranslate", f"{curve_shape}.controlPoints[{i}]")
+
+        # Paso 4: control circular como shape del locator
+        circle = builder.create_dg("makeNurbCircle", f"{loc}_makeNurbCircle")
+        builder.set_value(f"{circle}.normal", (0.0, 1.0, 0.0))
+        builder.set_value(f"{circle}.radius", radius)
+        circle_shape = builder.create_dag("nurbsCurve", f"{loc}_circleShape", loc)
+        builder.connect(f"{circle}.outputCurve", f"{circle_shape}.create")
+        for attr, value in valores_atributos("spine_control", parte=loc_base, orden=i + 1).items():
+            builder.add_attribute(loc, attr, value)
+        locators.append(loc)
+
+        # Paso 5: target sobre la curva
+        target = builder.create_locator(target_names[i])
+        poc = builder.create_dg("pointOnCurveInfo", f"{target}_POC")
+        builder.connect(f"{curve_shape}.worldSpace[0]", f"{poc}.inputCurve")
+        builder.set_value(f"{poc}.turnOnPercentage", False)
+        builder.set_value(f"{poc}.parameter", float(params[i]))
+        if matrix:
+            position = builder.create_dg("composeMatrix", f"{target}_composeMatrix")
+            builder.connect(f"{poc}.position", f"{position}.inputTranslate")
+            positions.append(position)
+        else:
+            builder.connect(f"{poc}.position", f"{target}.translate")
+        for attr, value in valores_atributos("spine_target", parte=target_base, orden=i + 1).items():
+            builder.add_attribute(target, attr, value)
+        targets.append(target)
+
+    # Paso 6: cada target apunta al anterior (eje Y), con Z hacia el arriba de la escena
+    for i in range(num):
+        if not matrix:
+            if i:
+                builder.command(
+                    f'aimConstraint -maintainOffset 0 -aimVector 0 1 0 -upVector 0 0 1 '
+                    f'-worldUpType "scene" {targets[i - 1]} {targets[i]};'
+                )
+            continue
+        if i == 0:
+            builder.connect(f"{positions[0]}.outputMatrix", f"{targets[0]}.offsetParentMatrix")
+            continue
+        aim = builder.create_dg("aimMatrix", f"{targets[i]}_aimMatrix")
+        builder.connect(f"{positions[i]}.outputMatrix", f"{aim}.inputMatrix")
+        builder.connect(f"{positions[i - 1]}.outputMatrix", f"{aim}.primaryTargetMatrix")
+        builder.set_value(f"{aim}.primaryInputAxis", (0.0, 1.0, 0.0))
+        builder.set_value(f"{aim}.secondaryInputAxis", (0.0, 0.0, 1.0))
+        builder.set_value(f"{aim}.secondaryTargetVector", (0.0, 1.0, 0.0))
+        builder.set_value(f"{aim}.secondaryMode", 2)  # align con el vector de mundo
+        builder.connect(f"{aim}.outputMatrix", f"{targets[i]}.offsetParentMatrix")
+
+    # Paso 7: joints siguen a sus targets
+    if matrix:
+        # maintainOffset del modo matricial: pose de reposo del joint relativa a su target,
+        # calculada antes del lote con las mismas posiciones y orientaciones que dará el rig
+        target_worlds = _aim_world_matrices(curve.posiciones(params).tolist())
+    for i, (target, joint) in enumerate(zip(targets, joints)):
+        if not matrix:
+            builder.command(f"parentConstraint -maintainOffset {target} {joint};")
+            continue
+        mult = builder.create_dg("multMatrix", f"{joint_names[i]}_offsetMultMatrix")
+        builder.set_matrix(f"{mult}.matrixIn[0]", info[i]["world"] * target_worlds[i].inverse())
+        builder.connect(f"{target}.worldMatrix[0]", f"{mult}.matrixIn[1]")
+        if info[i]["parent"]:
+            builder.connect(f"{info[i]['parent']}.worldInverseMatrix[0]", f"{mult}.matrixIn[2]")
+        builder.connect(f"{mult}.outputMatrix", f"{joint}.offsetParentMatrix")
+        for attr in ("translate", "rotate", "jointOrient"):
+            builder.set_value(f"{joint}.{attr}", (0.0, 0.0, 0.0))
+
+    counts = builder.execute()
+
+    indice = obtener_indice()
+    for i, (loc, target) in enumerate(zip(locators, targets), 1):
+        indice.anotar(builder.uuid(loc), "spine_control", parte=loc_base, orden=i)
+        indice.anotar(builder.uuid(target), "spine_target", parte=target_base, orden=i)
+
+    counts["seconds"] = round(time.perf_counter() - start, 4)
+    print(f"✅ Spine rig por lotes ({mode}): {num} joints, {counts['nodes']} nodos, "
+          f"{counts['connections']} conexiones, {counts['commands']} comandos en {counts['seconds']} s")
+    return {"locators": locators, "targets": targets, "counts": counts}
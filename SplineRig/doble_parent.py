@@ -1,4 +1,5 @@
 import maya.cmds as cmds
+from Utils.scene_index import obtener_indice
 
 
 def connect_locators_to_curve(
@@ -37,8 +38,8 @@ def connect_locators_to_curve(
         cmds.warning(f"⚠️ No pude leer controlPoints de {curve_shape}.")
         return []
 
-    # Listar locators existentes (fullPath)
-    existing_locs = cmds.ls(f"{base_name}_*", type="transform", long=True) or []
+    # Listar locators existentes (fullPath, en orden de CV)
+    existing_locs = obtener_indice().buscar_o_escanear("spine_control", f"{base_name}_*", parte=base_name)
     if not existing_locs:
         cmds.warning(f"⚠️ No se encontraron locators con el prefijo {base_name}_")
         return []
@@ -49,14 +50,8 @@ def connect_locators_to_curve(
     num_locs = min(num_locs, len(existing_locs), num_cvs)
 
     processed = []
-    for i in range(num_locs):
-        loc_short = f"{base_name}_{i + 1:03d}"
-        # resolver fullPath del locator específico
-        loc_full = cmds.ls(loc_short, long=True) or []
-        if not loc_full:
-            cmds.warning(f"⚠️ Locator esperado {loc_short} no existe (se omite).")
-            continue
-        loc = loc_full[0]
+    for i, loc in enumerate(existing_locs[:num_locs]):
+        loc_short = loc.split("|")[-1]
 
         # crear o reutilizar decomposeMatrix con nombre consistente
         decomp_name = f"{loc_short}_decompMatrix"
@@ -1,4 +1,5 @@
 import maya.cmds as cmds
+from Utils.scene_index import obtener_indice
 
 
 def create_spine_locators(
@@ -39,6 +40,7 @@ def create_spine_locators(
         world_pos = cmds.pointPosition(f"{curve_name}.cv[{i}]", world=True)
         cmds.xform(loc, ws=True, t=world_pos)
 
+        obtener_indice().registrar(loc, "spine_control", parte=base_name, orden=i + 1)
         locators.append(loc)
         print(f"✅ {loc} posicionado sobre {curve_name}.cv[{i}]")
 
@@ -1,18 +1,19 @@
 import maya.cmds as cmds
+from Utils.scene_index import obtener_indice
 
 
 def constrain_joints_to_targets(
     joint_base="core_plane_joint", target_base="spineTarget_ctrl", num_pairs=None
 ):
-    joints = cmds.ls(f"{joint_base}_*", type="joint")
-    targets = cmds.ls(f"{target_base}_*", type="transform")
+    indice = obtener_indice()
+    joints = [
+        j for j in indice.buscar_todos("joint_core")
+        if j.split("|")[-1].startswith(f"{joint_base}_")
+    ] or sorted(cmds.ls(f"{joint_base}_*", type="joint", long=True) or [], key=lambda j: j.split("|")[-1])
+    targets = indice.buscar_o_escanear("spine_target", f"{target_base}_*", parte=target_base)
     num_pairs = num_pairs or min(len(joints), len(targets))
 
-    for i in range(num_pairs):
-        jnt = f"{joint_base}_{i + 1:03d}"
-        tgt = f"{target_base}_{i + 1:03d}"
-        if not cmds.objExists(jnt) or not cmds.objExists(tgt):
-            continue
+    for jnt, tgt in list(zip(joints, targets))[:num_pairs]:
         cmds.parentConstraint(tgt, jnt, maintainOffset=True)
         print(f"✅ ParentConstraint: {jnt} ← {tgt}")
 
@@ -1,4 +1,6 @@
 import maya.cmds as cmds
+from Utils.bspline import curva_desde_maya
+from Utils.scene_index import obtener_indice
 
 
 def create_spine_targets(
@@ -6,7 +8,8 @@ def create_spine_targets(
 ):
     """
     Crea locators 'spineTarget_ctrl_###' distribuidos uniformemente sobre una curva.
-    Usa arcLengthDimension para parametrizar de 0 a 1 independientemente de la longitud real.
+    Los parámetros se calculan con la tabla de longitud de arco de Utils.bspline, así que
+    los targets quedan exactamente a la misma distancia entre sí sobre la curva.
     """
     if not cmds.objExists(curve_name):
         cmds.warning(f"⚠️ La curva {curve_name} no existe.")
@@ -22,12 +25,8 @@ def create_spine_targets(
     num_cvs = cmds.getAttr(f"{curve_shape}.controlPoints", size=True)
     num_targets = num_targets or num_cvs
 
-    # Crear un nodo temporal para obtener la longitud total
-    arc_len_node = cmds.arclen(curve_name, constructionHistory=True)
-    curve_length = cmds.getAttr(f"{arc_len_node}.arcLength")
-    cmds.delete(arc_len_node)
-
-    step = curve_length / (num_targets - 1)
+    # Parámetros a igual longitud de arco (sin nodo arclen temporal)
+    params = curva_desde_maya(curve_name).parametros_uniformes(num_targets)
     targets = []
 
     for i in range(num_targets):
@@ -38,9 +37,10 @@ def create_spine_targets(
         )
         cmds.connectAttr(f"{poc}.position", f"{loc}.translate", force=True)
         cmds.setAttr(f"{poc}.turnOnPercentage", 0)
-        cmds.setAttr(f"{poc}.parameter", i * step)
+        cmds.setAttr(f"{poc}.parameter", params[i])
+        obtener_indice().registrar(loc, "spine_target", parte=base_name, orden=i + 1)
         targets.append(loc)
-        print(f"✅ {loc} colocado a lo largo de la curva (param={i * step:.2f})")
+        print(f"✅ {loc} colocado a lo largo de la curva (param={params[i]:.2f})")
 
     print(f"📍 {len(targets)} targets creados sobre {curve_name}")
     return targets
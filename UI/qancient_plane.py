@@ -1,14 +1,25 @@
 import maya.cmds as cmds
 from Utils.tools import generar_parte
+from Utils.deform import aleatorizar_forma
+from Utils.manifest import obtener_manifest
+from Utils.asset_pool import obtener_pool
+from Utils.preproceso import preprocesar_variantes
 from Utils.emerge import emerge_plane
 from PlaneRig import create_joints, spline_auto_rig, cntrl_curve
-from Environment.terrain import crear_terreno_montanoso
+from Environment.terrain import (
+    crear_terreno_montanoso,
+    crear_terreno_por_tiles,
+    exportar_heightmap,
+    crear_terreno_desde_heightmap,
+    colorear_terreno_por_vertices,
+)
 from Environment.cloud import crear_campo_nubes
 from Materials.materials import aplicar_material_oro, aplicar_material_montanas, aplicar_material_nubes, cambiar_color_montanas_aleatorio
 from Materials.select_color import ajustar_color_oro
 from Animation.fly_curve import crear_curva_vuelo
 from Animation.dyn_fly_curve import crear_curva_dinamica
 from Animation.flight_controller import crear_controlador_vuelo, eliminar_vuelo
+from Environment.visibility import culling_por_vuelo, restaurar_visibilidad
 from Utils.emerge_full_setup import emerge_all_scene
 
 # === IMPORTAR SISTEMA DE ILUMINACIÓN MODULAR ===
@@ -61,11 +72,35 @@ def crear_ui():
     cmds.frameLayout(label="Generar Partes", collapsable=True, collapse=False, marginWidth=10, marginHeight=8)
     cmds.columnLayout(adj=True, rowSpacing=5)
     
-    cmds.button(label="Generar Fuselaje", c=lambda *_: generar_parte("FUSELAJE"))
-    cmds.button(label="Generar Alas", c=lambda *_: generar_parte("ALAS"))
-    cmds.button(label="Generar Cabeza", c=lambda *_: generar_parte("CABEZA"))
-    cmds.button(label="Generar Cola", c=lambda *_: generar_parte("COLA"))
-    cmds.button(label="Generar Ornamentación", c=lambda *_: generar_parte("ORNAMENTACION"))
+    partes_blendshapes = cmds.checkBoxGrp(label="Deformación", label1="Targets blendShape", value1=False)
+    con_targets = lambda: cmds.checkBoxGrp(partes_blendshapes, q=True, value1=True)
+
+    cmds.button(label="Generar Fuselaje", c=lambda *_: generar_parte("FUSELAJE", usar_blendshapes=con_targets()))
+    cmds.button(label="Generar Alas", c=lambda *_: generar_parte("ALAS", usar_blendshapes=con_targets()))
+    cmds.button(label="Generar Cabeza", c=lambda *_: generar_parte("CABEZA", usar_blendshapes=con_targets()))
+    cmds.button(label="Generar Cola", c=lambda *_: generar_parte("COLA", usar_blendshapes=con_targets()))
+    cmds.button(label="Generar Ornamentación", c=lambda *_: generar_parte("ORNAMENTACION", usar_blendshapes=con_targets()))
+    cmds.button(
+        label="Aleatorizar Forma",
+        c=lambda *_: [aleatorizar_forma(p) for p in ("FUSELAJE", "ALAS", "CABEZA", "COLA", "ORNAMENTACION")
+                      if cmds.objExists(f"{p}_GENERADO")],
+        annotation="Nuevos pesos para los targets de las partes generadas con blendShapes (sin reimportar)"
+    )
+    cmds.button(
+        label="Actualizar Manifest de Variantes",
+        c=lambda *_: obtener_manifest().actualizar(),
+        annotation="Analiza solo las variantes nuevas o modificadas de la librería de modelos"
+    )
+    cmds.button(
+        label="Preprocesar Variantes (.mb)",
+        c=lambda *_: preprocesar_variantes(),
+        annotation="Hornea las normales de cada variante en un .mb junto al .ma (solo las nuevas o modificadas)"
+    )
+    cmds.button(
+        label="Vaciar Pool de Variantes",
+        c=lambda *_: obtener_pool().vaciar(),
+        annotation="Descarga las variantes importadas una vez y copiadas en cada generación"
+    )
     
     cmds.setParent("..")
     cmds.setParent("..")
@@ -77,6 +112,17 @@ def crear_ui():
     
     cmds.button(label="Crear Joints", c=lambda *_: create_joints.crear_rig_completo())
     cmds.button(label="Crear Rig Spline", c=lambda *_: spline_auto_rig.build_spine_from_core_joints())
+    cmds.button(
+        label="Crear Rig Spline (Matricial)",
+        c=lambda *_: spline_auto_rig.build_spine_from_core_joints(mode="matrix"),
+        annotation="Sin constraints: aimMatrix/multMatrix conectados a offsetParentMatrix"
+    )
+    cmds.button(label="Comparar FPS de Rigs Spline", c=lambda *_: spline_auto_rig.compare_spine_modes())
+    cmds.button(
+        label="Medir Rig Spline (100 joints)",
+        c=lambda *_: spline_auto_rig.time_spine_build(),
+        annotation="Tiempo de construcción por lotes de una cadena de prueba en cada modo"
+    )
     cmds.button(label="Crear Curva de Control", c=lambda *_: cntrl_curve.crear_control_avion())
     
     cmds.setParent("..")
@@ -226,6 +272,45 @@ def crear_ui():
         backgroundColor=[0.3, 0.5, 0.3]
     )
     
+    cmds.button(
+        label="Generar Terreno por Tiles (LOD según vuelo)",
+        c=lambda *_: crear_terreno_por_tiles(
+            extension=600,
+            tamanio_chunk=75,
+            curva="curva_vuelo_actual"
+        ),
+        backgroundColor=[0.3, 0.45, 0.3],
+        annotation="Terreno extenso dividido en chunks: más detalle cerca de la curva de vuelo"
+    )
+
+    # === HEIGHTMAP: exportar / importar terreno como imagen de 16 bits ===
+    filtro_heightmap = "Heightmap (*.png *.r16 *.raw)"
+
+    def exportar_heightmap_ui(*_):
+        ruta = cmds.fileDialog2(fileFilter=filtro_heightmap, fileMode=0, caption="Exportar Heightmap")
+        if ruta:
+            exportar_heightmap(ruta[0], "terreno")
+
+    def importar_heightmap_ui(*_):
+        ruta = cmds.fileDialog2(fileFilter=filtro_heightmap, fileMode=1, caption="Importar Heightmap")
+        if ruta:
+            crear_terreno_desde_heightmap(ruta[0], "terreno")
+
+    cmds.rowLayout(numberOfColumns=2, adjustableColumn=1, columnAttach=[(1, "both", 0), (2, "both", 4)])
+    cmds.button(
+        label="💾 Exportar Heightmap",
+        c=exportar_heightmap_ui,
+        backgroundColor=[0.3, 0.4, 0.45],
+        annotation="Guarda el terreno actual como PNG de 16 bits o RAW .r16"
+    )
+    cmds.button(
+        label="📂 Importar Heightmap",
+        c=importar_heightmap_ui,
+        backgroundColor=[0.3, 0.4, 0.45],
+        annotation="Crea el terreno desde un heightmap sin regenerar el ruido"
+    )
+    cmds.setParent('..')  # Salir del rowLayout
+    
     cmds.button(
         label="Aplicar Material Metálico a Montañas",
         c=lambda *_: aplicar_material_montanas("terreno"),
@@ -233,6 +318,14 @@ def crear_ui():
         height=30
     )
     
+    cmds.button(
+        label="⚡ Color por Vértice (Preview Rápido)",
+        c=lambda *_: colorear_terreno_por_vertices("terreno"),
+        backgroundColor=[0.35, 0.40, 0.35],
+        height=30,
+        annotation="Colorea el terreno según altura, pendiente y curvatura con una paleta metálica y un shader mínimo"
+    )
+    
     # === NUEVO BOTÓN: Cambiar Color Aleatorio ===
     cmds.button(
         label="🎨 Cambiar Color Metálico Aleatorio",
@@ -257,6 +350,14 @@ def crear_ui():
     terreno_pos_x = cmds.floatSliderGrp(label="Posición en X", min=-100, max=50, value=0, field=True)
     terreno_pos_y = cmds.floatSliderGrp(label="Posición en Y", min=-100, max=50, value=-35, field=True)
     terreno_pos_z = cmds.floatSliderGrp(label="Posición en Z", min=-100, max=50, value=0, field=True)
+    terreno_seed = cmds.intFieldGrp(label="Semilla (0 = aleatoria)", value1=0)
+    terreno_ruido = cmds.optionMenuGrp(label="Tipo de Ruido")
+    for tipo in ("trig", "fbm", "ridged", "warp"):
+        cmds.menuItem(label=tipo)
+    terreno_erosion_t = cmds.intSliderGrp(label="Erosión Térmica", min=0, max=200, value=0, field=True)
+    terreno_erosion_h = cmds.intSliderGrp(label="Erosión Hidráulica", min=0, max=200, value=0, field=True)
+    terreno_cache = cmds.checkBoxGrp(label="Caché en disco", label1="Reutilizar heightfield", value1=True)
+    terreno_vertices = cmds.checkBoxGrp(label="Sombreado", label1="Color por vértice (rápido)", value1=False)
     
     cmds.button(
         label="Generar Terreno Personalizado",
@@ -267,7 +368,13 @@ def crear_ui():
             octavas=cmds.intSliderGrp(terreno_octavas, q=True, v=True),
             pos_y=cmds.floatSliderGrp(terreno_pos_y, q=True, v=True),
             pos_x=cmds.floatSliderGrp(terreno_pos_x, q=True, v=True),
-            pos_z=cmds.floatSliderGrp(terreno_pos_z, q=True, v=True)
+            pos_z=cmds.floatSliderGrp(terreno_pos_z, q=True, v=True),
+            seed=cmds.intFieldGrp(terreno_seed, q=True, value1=True) or None,
+            tipo_ruido=cmds.optionMenuGrp(terreno_ruido, q=True, value=True),
+            erosion_termica=cmds.intSliderGrp(terreno_erosion_t, q=True, v=True),
+            erosion_hidraulica=cmds.intSliderGrp(terreno_erosion_h, q=True, v=True),
+            usar_cache=cmds.checkBoxGrp(terreno_cache, q=True, value1=True),
+            colores_vertices=cmds.checkBoxGrp(terreno_vertices, q=True, value1=True)
         ),
         backgroundColor=[0.3, 0.5, 0.3]
     )
@@ -303,10 +410,19 @@ def crear_ui():
     
     cmds.text(label="Configuración Personalizada del Cielo", align="left", height=20, font="boldLabelFont")
     
-    nubes_cantidad = cmds.intSliderGrp(label="Nubes", min=1, max=100, value=25, field=True)
+    nubes_cantidad = cmds.intSliderGrp(label="Nubes", min=1, max=100, fieldMaxValue=5000, value=25, field=True)
     nubes_radio = cmds.floatSliderGrp(label="Radio Dist.", min=20, max=300, value=100, field=True)
     nubes_alt_min = cmds.floatSliderGrp(label="Altura Mín", min=-50, max=20, value=-18, field=True)
     nubes_alt_max = cmds.floatSliderGrp(label="Altura Máx", min=-20, max=50, value=0, field=True)
+    nubes_modo = cmds.optionMenuGrp(label="Modo",
+                                    annotation="instancias/instancer: prototipos biselados una sola vez; malla: una malla NumPy por nube")
+    for modo in ("cubos", "instancias", "instancer", "malla"):
+        cmds.menuItem(label=modo)
+    nubes_distribucion = cmds.optionMenuGrp(label="Distribución",
+                                            annotation="poisson: nubes repartidas sin grumos ni solapes")
+    for distribucion in ("aleatoria", "poisson"):
+        cmds.menuItem(label=distribucion)
+    nubes_caida = cmds.floatSliderGrp(label="Caída Radial", min=0, max=1, value=0, field=True)
     
     cmds.button(
         label="Generar Cielo Personalizado",
@@ -314,7 +430,10 @@ def crear_ui():
             num_nubes=cmds.intSliderGrp(nubes_cantidad, q=True, v=True),
             radio_distribucion=cmds.floatSliderGrp(nubes_radio, q=True, v=True),
             altura_min=cmds.floatSliderGrp(nubes_alt_min, q=True, v=True),
-            altura_max=cmds.floatSliderGrp(nubes_alt_max, q=True, v=True)
+            altura_max=cmds.floatSliderGrp(nubes_alt_max, q=True, v=True),
+            modo=cmds.optionMenuGrp(nubes_modo, q=True, value=True),
+            distribucion=cmds.optionMenuGrp(nubes_distribucion, q=True, value=True),
+            caida_radial=cmds.floatSliderGrp(nubes_caida, q=True, v=True)
         ),
         backgroundColor=[0.4, 0.6, 0.8]
     )
@@ -472,6 +591,21 @@ def crear_ui():
     )
     cmds.setParent('..')
 
+    # === CULLING POR VISIBILIDAD A LO LARGO DEL VUELO ===
+    cmds.rowLayout(numberOfColumns=2, columnWidth2=(160, 160))
+    cmds.button(
+        label="Ocultar No Visible",
+        height=30,
+        c=lambda *_: culling_por_vuelo(accion="ocultar"),
+        annotation="Oculta nubes y chunks de terreno que la cámara de seguimiento nunca ve durante el vuelo"
+    )
+    cmds.button(
+        label="Restaurar Visibilidad",
+        height=30,
+        c=lambda *_: restaurar_visibilidad()
+    )
+    cmds.setParent('..')
+
     cmds.setParent('..')  # end columnLayout principal
     cmds.setParent('..')  # end frameLayout Animación de Vuelo
 
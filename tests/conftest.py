@@ -0,0 +1,19 @@
+"""
+Las pruebas cubren solo los núcleos NumPy que no dependen de Maya.
+El código importa `Utils.` (el proyecto se usa en Windows, sin distinción de mayúsculas):
+fuera de Windows se enlaza ese nombre al paquete `utils` del repo.
+"""
+
+import importlib
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+if "Utils" not in sys.modules:
+    try:
+        importlib.import_module("Utils")
+    except ImportError:
+        sys.modules["Utils"] = importlib.import_module("utils")
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from Utils.bspline import CurvaBSpline, nudos_desde_maya
+
+
+def _longitud_densa(curva, muestras=200000):
+    puntos = curva.posiciones(np.linspace(*curva.dominio, muestras))
+    return np.linalg.norm(np.diff(puntos, axis=0), axis=1).sum()
+
+
+def _curva_cubica():
+    cvs = [(0, 0, 0), (2, 5, 0), (6, -1, 2), (9, 4, 3), (12, 0, -2), (15, 3, 0)]
+    return CurvaBSpline(cvs, grado=3)
+
+
+def test_grado_1_es_la_polilinea():
+    cvs = np.array([(0, 0, 0), (3, 4, 0), (3, 4, 12)], dtype=np.float64)
+    curva = CurvaBSpline(cvs, grado=1)
+    assert curva.longitud() == pytest.approx(5.0 + 12.0, abs=1e-12)
+    np.testing.assert_allclose(curva.posiciones(curva.parametros_por_longitud([5.0, 11.0])),
+                               [(3, 4, 0), (3, 4, 6)], atol=1e-12)
+
+
+def test_longitud_de_un_cuarto_de_circulo():
+    # Cúbica por 40 puntos de un arco de radio 10: casi 2 * pi * 10 / 4
+    angulos = np.linspace(0.0, math.pi / 2.0, 40)
+    cvs = np.column_stack([np.cos(angulos), np.sin(angulos), np.zeros_like(angulos)]) * 10.0
+    curva = CurvaBSpline(cvs, grado=3)
+    assert curva.longitud() == pytest.approx(_longitud_densa(curva), rel=1e-7)
+    assert curva.longitud() == pytest.approx(5.0 * math.pi, rel=1e-3)
+
+
+def test_longitud_cubica_contra_muestreo_denso():
+    curva = _curva_cubica()
+    assert curva.longitud() == pytest.approx(_longitud_densa(curva), rel=1e-7)
+
+
+@pytest.mark.parametrize("cantidad", [2, 7, 25])
+def test_parametros_uniformes_a_igual_longitud(cantidad):
+    curva = _curva_cubica()
+    parametros = curva.parametros_uniformes(cantidad)
+    assert parametros[0] == pytest.approx(curva.dominio[0])
+    assert parametros[-1] == pytest.approx(curva.dominio[1])
+    assert np.all(np.diff(parametros) > 0.0)
+
+    longitudes = curva._longitud_hasta(parametros)
+    np.testing.assert_allclose(longitudes, np.linspace(0.0, curva.longitud(), cantidad), atol=1e-9)
+
+
+def test_tangentes_unitarias_y_curvatura_de_recta():
+    recta = CurvaBSpline([(0, 0, 0), (1, 1, 0), (2, 2, 0), (3, 3, 0)], grado=3)
+    parametros = np.linspace(*recta.dominio, 11)
+    np.testing.assert_allclose(recta.tangentes(parametros), np.tile([1, 1, 0], (11, 1)) / math.sqrt(2), atol=1e-12)
+    np.testing.assert_allclose(recta.curvatura(parametros), 0.0, atol=1e-12)
+
+
+def test_nudos_desde_maya_completa_los_extremos():
+    # Maya guarda num_cvs + grado - 1 nudos para una cúbica de 4 CVs: [0, 0, 0, 1, 1, 1]
+    nudos = nudos_desde_maya([0, 0, 0, 1, 1, 1])
+    assert len(nudos) == 4 + 3 + 1
+    curva = CurvaBSpline([(0, 0, 0), (1, 2, 0), (3, 2, 0), (4, 0, 0)], 3, nudos)
+    np.testing.assert_allclose(curva.posiciones([0.0, 1.0]), [(0, 0, 0), (4, 0, 0)], atol=1e-12)
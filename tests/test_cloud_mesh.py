@@ -0,0 +1,57 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from Environment.cloud_mesh import cubo_biselado, malla_nube, partes_nube_aleatorias
+
+
+def _aristas(caras):
+    """Aristas dirigidas (a, b) de todos los quads."""
+    return [(int(c[i]), int(c[(i + 1) % 4])) for c in caras for i in range(4)]
+
+
+def _volumen(vertices, caras):
+    """Volumen con signo (teorema de la divergencia sobre los quads triangulados)."""
+    a, b, c, d = (vertices[caras[:, i]] for i in range(4))
+    return (np.einsum("ij,ij->i", a, np.cross(b, c)) + np.einsum("ij,ij->i", a, np.cross(c, d))).sum() / 6.0
+
+
+@pytest.mark.parametrize("fraccion, segmentos", [(0.05, 1), (0.2, 2), (0.35, 4), (0.5, 6)])
+def test_cubo_biselado_es_cerrado_y_manifold(fraccion, segmentos):
+    vertices, caras, normales = cubo_biselado(fraccion, segmentos)
+    dirigidas = Counter(_aristas(caras))
+
+    # Cada arista dirigida aparece una sola vez y su inversa también: cerrada, manifold y
+    # con todas las caras orientadas igual
+    assert max(dirigidas.values()) == 1
+    assert all((b, a) in dirigidas for a, b in dirigidas)
+    assert len(np.unique(caras)) == len(vertices)
+
+    # Característica de Euler de una esfera
+    aristas = len(dirigidas) // 2
+    assert len(vertices) - aristas + len(caras) == 2
+
+    # Orientadas hacia fuera y con normales unitarias
+    assert _volumen(vertices, caras) > 0.0
+    np.testing.assert_allclose(np.linalg.norm(normales, axis=1), 1.0, atol=1e-9)
+    assert np.all(np.abs(vertices) <= 0.5 + 1e-9)
+
+
+def test_malla_nube_une_partes_cerradas_sin_compartir_vertices():
+    rng = np.random.default_rng(5)
+    traslaciones, tamanios, rotaciones = partes_nube_aleatorias(rng, (0.0, 50.0, 0.0), 10.0, 6)
+    vertices, caras, normales = malla_nube(traslaciones, tamanios, rotaciones)
+    base_vertices, base_caras, _ = cubo_biselado()
+
+    assert vertices.shape == (6 * len(base_vertices), 3)
+    assert caras.shape == (6 * len(base_caras), 4)
+    dirigidas = Counter(_aristas(caras))
+    assert max(dirigidas.values()) == 1
+    assert all((b, a) in dirigidas for a, b in dirigidas)
+
+    # Cada parte conserva el volumen del cubo escalado (la rotación no lo cambia)
+    volumen_base = _volumen(base_vertices, base_caras)
+    for i, tamanio in enumerate(tamanios):
+        parte = caras[i * len(base_caras):(i + 1) * len(base_caras)]
+        assert _volumen(vertices, parte) == pytest.approx(volumen_base * tamanio ** 3)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from Environment.erosion import aplicar_erosion, erosion_hidraulica, erosion_termica
+from Environment.heightfield import generar_heightfield
+
+
+def _terreno(seed=11):
+    return generar_heightfield(48, 150, 27, 4, seed)
+
+
+def test_termica_conserva_el_volumen():
+    alturas = _terreno()
+    erosionado = erosion_termica(alturas, 60, paso=150 / 48, angulo_talud=20.0)
+    assert not np.allclose(erosionado, alturas)
+    assert erosionado.sum() == pytest.approx(alturas.sum(), rel=1e-12, abs=1e-9)
+
+
+def test_hidraulica_conserva_terreno_mas_sedimento():
+    # El sedimento que queda en suspensión se devuelve al terreno al final
+    alturas = _terreno()
+    erosionado = erosion_hidraulica(alturas, 50)
+    assert not np.allclose(erosionado, alturas)
+    assert erosionado.sum() == pytest.approx(alturas.sum(), rel=1e-12, abs=1e-9)
+
+
+def test_termica_suaviza_las_pendientes():
+    alturas = _terreno()
+    erosionado = erosion_termica(alturas, 60, paso=150 / 48, angulo_talud=20.0)
+    assert np.abs(np.diff(erosionado, axis=1)).max() < np.abs(np.diff(alturas, axis=1)).max()
+
+
+def test_no_modifica_la_entrada():
+    alturas = _terreno()
+    copia = alturas.copy()
+    erosion_termica(alturas, 5)
+    erosion_hidraulica(alturas, 5)
+    np.testing.assert_array_equal(alturas, copia)
+
+
+@pytest.mark.parametrize("kernel", [erosion_termica, erosion_hidraulica])
+def test_deterministica_para_una_semilla(kernel):
+    np.testing.assert_array_equal(kernel(_terreno(5), 30), kernel(_terreno(5), 30))
+
+
+@pytest.mark.parametrize("kernel", [erosion_termica, erosion_hidraulica])
+def test_terreno_plano_no_cambia(kernel):
+    plano = np.full((33, 33), 7.5)
+    np.testing.assert_array_equal(kernel(plano, 40), plano)
+
+
+def test_aplicar_erosion_sin_iteraciones_devuelve_la_entrada():
+    alturas = _terreno()
+    assert aplicar_erosion(alturas, 1.0) is alturas
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from Environment.heightfield import coordenadas_grid, generar_heightfield, normales_heightfield
+from Environment.heightfield_parallel import generar_heightfield_paralelo
+
+
+def _altura_por_vertice(x, z, escala, altura_max, octavas, seed):
+    """Fórmula original de crear_terreno_montanoso, vértice a vértice."""
+    altura = 0
+    amplitud = altura_max
+    frecuencia = 1.0 / escala
+    for octava in range(octavas):
+        offset_base = seed + octava * 1000
+        offset_multiplier_1 = math.sin(offset_base * 0.001) * 10
+        offset_multiplier_2 = math.cos(offset_base * 0.001) * 10
+        seed_x = x * frecuencia + octava * 100 + offset_multiplier_1
+        seed_z = z * frecuencia + octava * 100 + offset_multiplier_2
+        noise = (math.sin(seed_x * 2.5) * math.cos(seed_z * 3.7) +
+                 math.sin(seed_x * 1.3 + seed_z * 2.1) * 0.5 +
+                 math.cos(seed_x * 4.2 - seed_z * 1.8) * 0.25)
+        altura += noise * amplitud
+        amplitud *= 0.5
+        frecuencia *= 2
+    return altura
+
+
+@pytest.mark.parametrize("seed", [0, 1234, 987654])
+def test_heightfield_igual_a_la_formula_por_vertice(seed):
+    subdivisiones, escala, altura_max, octavas = 20, 150, 27, 4
+    alturas = generar_heightfield(subdivisiones, escala, altura_max, octavas, seed)
+    x, z = coordenadas_grid(subdivisiones, escala)
+
+    esperadas = np.vectorize(_altura_por_vertice)(x, z, escala, altura_max, octavas, seed)
+    assert alturas.shape == (subdivisiones + 1, subdivisiones + 1)
+    np.testing.assert_allclose(alturas, esperadas, rtol=0, atol=1e-9)
+
+
+def test_heightfield_por_filas_coincide_con_el_completo():
+    completo = generar_heightfield(30, 100, 10, 3, 42)
+    banda = generar_heightfield(30, 100, 10, 3, 42, filas=(7, 19))
+    np.testing.assert_array_equal(banda, completo[7:19])
+
+
+def test_normales_de_un_plano_inclinado():
+    x, z = coordenadas_grid(10, 10)
+    normales = normales_heightfield(0.5 * x, paso=1.0)
+    esperada = np.array([-0.5, 1.0, 0.0]) / math.sqrt(1.25)
+    np.testing.assert_allclose(normales, np.broadcast_to(esperada, normales.shape), atol=1e-6)
+
+
+@pytest.mark.parametrize("tipo_ruido", ["trig", "fbm", "ridged", "warp"])
+def test_paralelo_identico_bit_a_bit(tipo_ruido):
+    parametros = dict(subdivisiones=60, escala=150, altura_max=27, octavas=4, seed=77, tipo_ruido=tipo_ruido)
+    paralelo = generar_heightfield_paralelo(procesos=2, **parametros)
+    np.testing.assert_array_equal(paralelo, generar_heightfield(**parametros))
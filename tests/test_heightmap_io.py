@@ -0,0 +1,68 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from Environment.heightfield import generar_heightfield
+from Environment.heightmap_io import (
+    _FIRMA_PNG,
+    _chunk,
+    _paeth,
+    escribir_heightmap,
+    leer_heightmap,
+    leer_png16,
+)
+
+
+@pytest.fixture
+def alturas():
+    # Rectangular para detectar filas y columnas cruzadas
+    return generar_heightfield(40, 150, 27, 4, 321)[:, :33]
+
+
+@pytest.mark.parametrize("extension", [".png", ".r16"])
+def test_ida_y_vuelta(tmp_path, alturas, extension):
+    ruta = str(tmp_path / f"terreno{extension}")
+    escritos = escribir_heightmap(ruta, alturas, {"escala": 150, "seed": 321})
+    leidas, metadatos = leer_heightmap(ruta)
+
+    assert leidas.shape == alturas.shape
+    paso = (alturas.max() - alturas.min()) / 65535.0
+    np.testing.assert_allclose(leidas, alturas, rtol=0, atol=paso / 2.0 + 1e-9)
+    assert metadatos["escala"] == 150
+    assert metadatos["seed"] == 321
+    assert metadatos["altura_min"] == pytest.approx(escritos["altura_min"])
+    assert metadatos["altura_max"] == pytest.approx(escritos["altura_max"])
+
+
+def _filtrar(tipo, fila, anterior):
+    """Aplica un filtro PNG a una fila de bytes (2 bytes por píxel)."""
+    salida = []
+    for i, valor in enumerate(fila):
+        izquierda = fila[i - 2] if i >= 2 else 0
+        diagonal = anterior[i - 2] if i >= 2 else 0
+        prediccion = (0, izquierda, anterior[i], (izquierda + anterior[i]) // 2,
+                      _paeth(izquierda, anterior[i], diagonal))[tipo]
+        salida.append((valor - prediccion) % 256)
+    return bytes([tipo] + salida)
+
+
+def test_lee_png_con_todos_los_filtros(tmp_path):
+    # PNG como los de otros programas: cada fila usa uno de los 5 filtros
+    valores = np.random.default_rng(7).integers(0, 65536, (10, 6)).astype(np.uint16)
+    filas = [list(fila.astype(">u2").tobytes()) for fila in valores]
+    crudo = b"".join(
+        _filtrar(i % 5, fila, filas[i - 1] if i else [0] * len(fila)) for i, fila in enumerate(filas)
+    )
+
+    ruta = tmp_path / "externo.png"
+    with open(ruta, "wb") as f:
+        f.write(_FIRMA_PNG)
+        _chunk(f, b"IHDR", struct.pack(">IIBBBBB", 6, 10, 16, 0, 0, 0, 0))
+        _chunk(f, b"IDAT", zlib.compress(crudo))
+        _chunk(f, b"IEND", b"")
+
+    leidas, metadatos = leer_png16(str(ruta))
+    assert metadatos == {}
+    np.testing.assert_array_equal(leidas, valores.astype(np.float64))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from Environment.poisson import centros_nubes_poisson, muestreo_poisson
+
+
+def _distancia_minima(puntos):
+    diferencias = puntos[:, None, :] - puntos[None, :, :]
+    distancias = np.sqrt((diferencias ** 2).sum(axis=-1))
+    np.fill_diagonal(distancias, np.inf)
+    return distancias.min()
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_muestreo_respeta_distancia_minima(dim):
+    puntos = muestreo_poisson(np.zeros(dim), np.full(dim, 50.0), 4.0, np.random.default_rng(3))
+    assert len(puntos) > 20
+    assert _distancia_minima(puntos) >= 4.0 - 1e-9
+    assert np.all((puntos >= 0.0) & (puntos <= 50.0))
+
+
+@pytest.mark.parametrize("semilla", range(20))
+@pytest.mark.parametrize("caida", [0.0, 0.5, 1.0])
+def test_centros_devuelve_todas_las_nubes(semilla, caida):
+    centros = centros_nubes_poisson(25, 150, 40, 60, np.random.default_rng(semilla),
+                                    caida_radial=caida, caida_altura=caida)
+    assert centros.shape == (25, 3)
+    radial = np.hypot(centros[:, 0], centros[:, 2])
+    assert np.all((radial >= 45.0) & (radial <= 150.0))
+    assert np.all((centros[:, 1] >= 40.0) & (centros[:, 1] <= 60.0))
+
+
+def test_centros_separados_en_planta():
+    centros = centros_nubes_poisson(25, 150, 40, 60, np.random.default_rng(0), separacion=20.0)
+    assert _distancia_minima(centros[:, [0, 2]]) >= 20.0 - 1e-9
+
+
+def test_centros_sobre_el_suelo():
+    suelo = lambda x, z: 0.05 * x + 45.0
+    centros = centros_nubes_poisson(25, 150, 40, 60, np.random.default_rng(1), suelo=suelo, despeje=2.0)
+    assert len(centros)
+    assert np.all(centros[:, 1] >= suelo(centros[:, 0], centros[:, 2]) + 2.0)
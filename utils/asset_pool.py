@@ -0,0 +1,229 @@
+import maya.cmds as cmds
+import os
+import time
+from collections import OrderedDict
+from Utils.manifest import sin_namespace, tipo_archivo, vertices_de_sets
+from Utils.normales import obtener_finalizador
+from Utils.deform import nombre_blendshape
+
+GRUPO_POOL = "QAP_POOL"
+PREFIJO_NAMESPACE = "qapPool_"
+
+
+class PoolVariantes:
+    """
+    Pool oculto de variantes dentro de la escena. Cada variante se importa una sola vez
+    en su propio namespace, se le corrigen las normales y queda como copia prístina;
+    las siguientes generaciones la duplican en lugar de volver a leer el archivo.
+    Si se piden targets de deformación, se hornean una vez sobre una segunda copia
+    residente y las generaciones duplican esa copia junto con sus blendShapes.
+    Las variantes menos usadas recientemente se descargan al superar `max_variantes`.
+
+    Args:
+        max_variantes: Número máximo de variantes residentes en el pool.
+    """
+
+    def __init__(self, max_variantes=8):
+        self.max_variantes = max_variantes
+        self._entradas = OrderedDict()  # ruta -> {namespace, grupo, tamanio, mtime, sets, horneada}
+        self.estadisticas = {"importaciones": 0, "duplicados": 0, "descargas": 0, "horneados": 0}
+
+    def _grupo_pool(self):
+        if not cmds.objExists(GRUPO_POOL):
+            cmds.group(empty=True, name=GRUPO_POOL)
+            cmds.setAttr(GRUPO_POOL + ".visibility", 0)
+        return GRUPO_POOL
+
+    def _vigente(self, ruta, entrada):
+        """La entrada sigue en la escena y el archivo no cambió desde que se importó."""
+        if not cmds.objExists(entrada["grupo"]):
+            return False
+        stat = os.stat(ruta)
+        return entrada["tamanio"] == stat.st_size and entrada["mtime"] == stat.st_mtime
+
+    def _importar(self, ruta):
+        """Importa la variante en su namespace, la agrupa bajo el pool y corrige sus normales."""
+        stem = os.path.splitext(os.path.basename(ruta))[0]
+        namespace = PREFIJO_NAMESPACE + stem
+        if cmds.namespace(exists=namespace):
+            cmds.namespace(removeNamespace=namespace, deleteNamespaceContent=True)
+
+        nuevos = cmds.file(
+            ruta, i=True, type=tipo_archivo(ruta), ignoreVersion=True, namespace=namespace,
+            returnNewNodes=True, options="v=0;", pr=True
+        ) or []
+        raices = cmds.ls(nuevos, assemblies=True)
+        if not raices:
+            cmds.namespace(removeNamespace=namespace, deleteNamespaceContent=True)
+            return None
+
+        grupo = cmds.group(raices, name=f"{namespace}:pool", parent=self._grupo_pool())
+        if ruta.lower().endswith(".mb"):
+            # Los .mb de la librería salen del preprocesado: normales ya finalizadas
+            obtener_finalizador().marcar(grupo, etapa="pool")
+        else:
+            obtener_finalizador().corregir(grupo, etapa="pool")
+        sets = vertices_de_sets(nuevos)
+
+        stat = os.stat(ruta)
+        self.estadisticas["importaciones"] += 1
+        return {"namespace": namespace, "grupo": cmds.ls(grupo, long=True)[0],
+                "tamanio": stat.st_size, "mtime": stat.st_mtime, "sets": sets}
+
+    def _descargar(self, ruta):
+        entrada = self._entradas.pop(ruta)
+        horneada = entrada.get("horneada")
+        for namespace in [entrada["namespace"]] + ([horneada["namespace"]] if horneada else []):
+            if cmds.namespace(exists=namespace):
+                cmds.namespace(removeNamespace=namespace, deleteNamespaceContent=True)
+        self.estadisticas["descargas"] += 1
+
+    def obtener(self, ruta):
+        """Entrada residente de la variante (importándola si no lo está) y la marca como usada."""
+        entrada = self._entradas.get(ruta)
+        if entrada is not None and not self._vigente(ruta, entrada):
+            self._descargar(ruta)
+            entrada = None
+
+        if entrada is None:
+            entrada = self._importar(ruta)
+            if entrada is None:
+                return None
+            self._entradas[ruta] = entrada
+            while len(self._entradas) > self.max_variantes:
+                self._descargar(next(iter(self._entradas)))
+
+        self._entradas.move_to_end(ruta)
+        return entrada
+
+    def _copiar(self, origen, destino, prefijo="", historial=False):
+        """
+        Duplica los hijos de `origen` bajo `destino` y renombra cada nodo copiado (raíces y
+        descendientes) como su original sin namespace, precedido de `prefijo`. Con historial
+        también se duplican los nodos aguas arriba (blendShapes de targets horneados).
+
+        Returns:
+            Tupla ({nombre original sin namespace: uuid de la copia}, uuids de las raíces).
+        """
+        originales = cmds.listRelatives(origen, children=True, fullPath=True) or []
+        copias = cmds.duplicate(originales, upstreamNodes=historial, returnRootsOnly=True)
+        # Bajo un padre propio los nombres cortos no chocan con nodos homónimos del resto
+        # de la escena (otra parte, una importación suelta)
+        copias = cmds.parent(copias, destino)
+
+        # Se trabaja con UUIDs porque las rutas cambian al renombrar los padres
+        nombres = {}
+        uuids_raices = []
+        renombrados = []
+        for original, copia in zip(originales, copias):
+            pares = [(original, copia)] + list(zip(
+                cmds.listRelatives(original, allDescendents=True, fullPath=True) or [],
+                cmds.listRelatives(copia, allDescendents=True, fullPath=True) or [],
+            ))
+            uuids = [(orig, cmds.ls(nueva, uuid=True)[0]) for orig, nueva in pares]
+            uuids_raices.append(uuids[0][1])
+            for orig, uuid in uuids:
+                esperado = prefijo + sin_namespace(orig)
+                obtenido = cmds.rename(cmds.ls(uuid, long=True)[0], esperado)
+                if obtenido.split("|")[-1] != esperado:
+                    renombrados.append(f"{esperado} -> {obtenido}")
+                nombres[sin_namespace(orig)] = uuid
+        if renombrados:
+            cmds.warning(f"Nombres ocupados al copiar {origen}: {', '.join(renombrados)}")
+
+        if historial:
+            mallas = cmds.ls(list(nombres.values()), type="mesh", long=True) or []
+            for blend in cmds.ls(cmds.listHistory(mallas) if mallas else [], type="blendShape"):
+                base = cmds.blendShape(blend, query=True, geometry=True)[0]
+                transform = cmds.listRelatives(base, parent=True)[0]
+                cmds.rename(blend, prefijo + sin_namespace(nombre_blendshape(transform)))
+        return nombres, uuids_raices
+
+    def _crear_sets(self, sets, nombres, prefijo=""):
+        """Vuelve a crear los selection sets de deformación sobre las copias de `nombres`."""
+        for nombre_set, por_objeto in sets.items():
+            nombre_set = prefijo + nombre_set
+            if cmds.objExists(nombre_set):
+                cmds.delete(nombre_set)
+            componentes = [
+                f"{cmds.ls(nombres[objeto], long=True)[0]}.vtx[{a}:{b}]"
+                for objeto, rangos in por_objeto.items() if objeto in nombres
+                for a, b in rangos
+            ]
+            if componentes:
+                cmds.sets(componentes, name=nombre_set)
+
+    def _horneada(self, entrada, hornear, clave):
+        """
+        Copia de la variante con targets horneados, residente junto a la prístina en su
+        propio namespace. Se hornea la primera vez y cuando cambia `clave`.
+        """
+        horneada = entrada.get("horneada")
+        if horneada is not None and horneada["clave"] == clave and cmds.objExists(horneada["grupo"]):
+            return horneada["grupo"]
+
+        namespace = entrada["namespace"] + "_targets"
+        if cmds.namespace(exists=namespace):
+            cmds.namespace(removeNamespace=namespace, deleteNamespaceContent=True)
+        cmds.namespace(add=namespace)
+        prefijo = namespace + ":"
+
+        grupo = cmds.group(empty=True, name=f"{namespace}:pool", parent=self._grupo_pool())
+        nombres, _ = self._copiar(entrada["grupo"], grupo, prefijo=prefijo)
+        self._crear_sets(entrada["sets"], nombres, prefijo=prefijo)
+        hornear(grupo, prefijo)
+
+        entrada["horneada"] = {"namespace": namespace, "grupo": cmds.ls(grupo, long=True)[0], "clave": clave}
+        self.estadisticas["horneados"] += 1
+        return entrada["horneada"]["grupo"]
+
+    def instanciar(self, ruta, nombre_grupo, hornear=None, clave=None):
+        """
+        Copia la variante del pool a la escena con los nombres originales (sin namespace),
+        vuelve a crear sus selection sets de deformación y agrupa el resultado.
+
+        Args:
+            ruta: Archivo de la variante.
+            nombre_grupo: Nombre del grupo de la copia.
+            hornear: Función (grupo, prefijo de sets) que crea targets de blendShape sobre una
+                copia del pool. Se llama una sola vez por variante y `clave`; después la copia
+                horneada se duplica con sus blendShapes.
+            clave: Identifica lo horneado (p. ej. la configuración de la parte).
+
+        Returns:
+            Tupla (grupo, raíces nuevas) o (None, []) si no se pudo importar.
+        """
+        inicio = time.perf_counter()
+        entrada = self.obtener(ruta)
+        if entrada is None:
+            return None, []
+
+        origen = entrada["grupo"] if hornear is None else self._horneada(entrada, hornear, clave)
+        grupo = cmds.group(empty=True, name=nombre_grupo)
+        nombres, uuids_raices = self._copiar(origen, grupo, historial=hornear is not None)
+        raices = [cmds.ls(uuid, long=True)[0] for uuid in uuids_raices]
+        self._crear_sets(entrada["sets"], nombres)
+
+        obtener_finalizador().marcar(grupo, etapa="partes_pool")
+        self.estadisticas["duplicados"] += 1
+        print(f"[i] {os.path.basename(ruta)} copiado del pool en {time.perf_counter() - inicio:.3f} s")
+        return grupo, raices
+
+    def vaciar(self):
+        """Descarga todas las variantes y elimina el grupo del pool."""
+        for ruta in list(self._entradas):
+            self._descargar(ruta)
+        if cmds.objExists(GRUPO_POOL):
+            cmds.delete(GRUPO_POOL)
+
+    def residentes(self):
+        """Rutas residentes, de la menos a la más usada recientemente."""
+        return list(self._entradas)
+
+
+_pool = PoolVariantes()
+
+
+def obtener_pool():
+    """Pool de variantes compartido por la sesión."""
+    return _pool
@@ -0,0 +1,121 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+
+class CacheCajas:
+    """
+    Caché compartida de cajas de mundo (exactWorldBoundingBox) por nodo, indexada por UUID.
+    La entrada de un nodo se invalida sola cuando se ensucia el propio nodo o cualquiera de
+    sus descendientes (transform o geometría), cambia su matriz de mundo (p. ej. al mover
+    un padre) o cambia su jerarquía (hijos añadidos o quitados, nodo borrado); en ese último
+    caso los callbacks se rehacen en la siguiente consulta para vigilar a los hijos nuevos.
+    Las etapas que reconstruyen geometría pueden invalidar también a mano.
+    """
+
+    def __init__(self):
+        self._cajas = {}      # uuid -> [xmin, ymin, zmin, xmax, ymax, zmax]
+        self._callbacks = {}  # uuid -> [ids de MMessage]
+        self._callback_escena = []
+        self._revigilar = set()  # uuids cuya jerarquía cambió: callbacks a rehacer
+        self.estadisticas = {"aciertos": 0, "fallos": 0, "invalidaciones": 0}
+
+    def _uuid(self, nodo):
+        uuids = cmds.ls(nodo, uuid=True)
+        return uuids[0] if uuids else None
+
+    def _sucio(self, uuid):
+        if self._cajas.pop(uuid, None) is not None:
+            self.estadisticas["invalidaciones"] += 1
+
+    def _jerarquia_cambiada(self, uuid):
+        # No se quitan callbacks desde dentro de un callback: se hace en la próxima consulta
+        self._sucio(uuid)
+        self._revigilar.add(uuid)
+
+    def _dejar_de_vigilar(self, uuid):
+        for id_callback in self._callbacks.pop(uuid, []):
+            try:
+                om.MMessage.removeCallback(id_callback)
+            except RuntimeError:
+                pass  # el nodo ya no existe
+
+    def _vigilar(self, nodo, uuid):
+        """Registra los callbacks de suciedad y de jerarquía del nodo y de sus descendientes."""
+        if uuid in self._callbacks:
+            return
+        if not self._callback_escena:
+            for mensaje in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+                self._callback_escena.append(om.MSceneMessage.addCallback(mensaje, lambda *_: self.vaciar()))
+
+        sel = om.MSelectionList()
+        sel.add(nodo)
+        ids = []
+        nodos = [nodo] + (cmds.listRelatives(nodo, allDescendents=True, fullPath=True) or [])
+        for miembro in nodos:
+            sel_miembro = om.MSelectionList()
+            sel_miembro.add(miembro)
+            ids.append(om.MNodeMessage.addNodeDirtyCallback(
+                sel_miembro.getDependNode(0), lambda *_, u=uuid: self._sucio(u)))
+            dag = sel_miembro.getDagPath(0)
+            if dag.node().hasFn(om.MFn.kTransform):
+                ids.append(om.MDagMessage.addChildAddedDagPathCallback(
+                    dag, lambda *_, u=uuid: self._jerarquia_cambiada(u)))
+                ids.append(om.MDagMessage.addChildRemovedDagPathCallback(
+                    dag, lambda *_, u=uuid: self._jerarquia_cambiada(u)))
+        ids.append(om.MDagMessage.addWorldMatrixModifiedCallback(
+            sel.getDagPath(0), lambda *_, u=uuid: self._sucio(u)))
+        ids.append(om.MNodeMessage.addNodePreRemovalCallback(
+            sel.getDependNode(0), lambda *_, u=uuid: self._jerarquia_cambiada(u)))
+        self._callbacks[uuid] = ids
+
+    def caja(self, nodo):
+        """Caja de mundo del nodo; solo se calcula la primera vez o tras invalidarse."""
+        while self._revigilar:
+            self._dejar_de_vigilar(self._revigilar.pop())
+        uuid = self._uuid(nodo)
+        if uuid is None:
+            raise ValueError(f"No existe el nodo '{nodo}'")
+        if uuid in self._cajas:
+            self.estadisticas["aciertos"] += 1
+            return list(self._cajas[uuid])
+
+        self.estadisticas["fallos"] += 1
+        caja = cmds.exactWorldBoundingBox(nodo)
+        self._vigilar(nodo, uuid)
+        self._cajas[uuid] = caja
+        return list(caja)
+
+    def centro(self, nodo):
+        caja = self.caja(nodo)
+        return [(caja[0] + caja[3]) / 2.0, (caja[1] + caja[4]) / 2.0, (caja[2] + caja[5]) / 2.0]
+
+    def extension(self, nodo):
+        """Tamaño de la caja en (x, y, z)."""
+        caja = self.caja(nodo)
+        return [caja[3] - caja[0], caja[4] - caja[1], caja[5] - caja[2]]
+
+    def invalidar(self, nodos):
+        """Descarta las cajas de los nodos (y deja de vigilarlos hasta la próxima consulta)."""
+        if isinstance(nodos, str):
+            nodos = [nodos]
+        for nodo in nodos:
+            uuid = self._uuid(nodo)
+            if uuid is None:
+                continue
+            self._sucio(uuid)
+            self._dejar_de_vigilar(uuid)
+
+    def vaciar(self):
+        """Elimina todas las entradas y callbacks (se llama solo al cambiar de escena)."""
+        for uuid in list(self._callbacks):
+            self._dejar_de_vigilar(uuid)
+        self._revigilar.clear()
+        self._cajas.clear()
+
+
+_cache_cajas = CacheCajas()
+
+
+def obtener_cache_cajas():
+    """Caché de cajas compartida por toda la sesión."""
+    return _cache_cajas
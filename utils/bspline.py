@@ -0,0 +1,176 @@
+"""
+Evaluación de curvas B-spline (NURBS no racionales, como las que crea cmds.curve) en NumPy:
+posiciones, tangentes y curvatura para arrays de parámetros con el algoritmo de de Boor, y
+tablas de longitud de arco para muestrear la curva a distancias iguales. Sin dependencias
+de Maya salvo curva_desde_maya, que lee una curva de la escena.
+"""
+
+import numpy as np
+
+# Gauss-Legendre de 5 puntos en [0, 1] para integrar |C'(u)| entre muestras de la tabla
+_GL_X, _GL_W = np.polynomial.legendre.leggauss(5)
+_GL_X = (_GL_X + 1.0) * 0.5
+_GL_W = _GL_W * 0.5
+
+
+def nudos_uniformes(num_cvs, grado=3):
+    """Vector de nudos abierto y uniforme (extremos con multiplicidad grado + 1)."""
+    internos = np.arange(1, num_cvs - grado, dtype=np.float64)
+    fin = float(num_cvs - grado)
+    return np.concatenate([np.zeros(grado + 1), internos, np.full(grado + 1, fin)])
+
+
+def nudos_desde_maya(nudos_maya):
+    """Maya guarda num_cvs + grado - 1 nudos; el vector completo repite el primero y el último."""
+    nudos = np.asarray(nudos_maya, dtype=np.float64)
+    return np.concatenate([nudos[:1], nudos, nudos[-1:]])
+
+
+def _de_boor(cvs, nudos, grado, parametros):
+    """Puntos de la curva (M, dim) para los parámetros (M,) con de Boor vectorizado."""
+    n = len(cvs)
+    u = np.clip(np.asarray(parametros, dtype=np.float64), nudos[grado], nudos[n])
+    # Tramo k tal que nudos[k] <= u < nudos[k + 1]; el final del dominio cae en el último tramo
+    k = np.clip(np.searchsorted(nudos, u, side="right") - 1, grado, n - 1)
+
+    d = cvs[k[:, None] + np.arange(-grado, 1)[None, :]]  # (M, grado + 1, dim)
+    for r in range(1, grado + 1):
+        for j in range(grado, r - 1, -1):
+            izquierda = nudos[k + j - grado]
+            derecha = nudos[k + 1 + j - r]
+            denominador = derecha - izquierda
+            alfa = np.divide(u - izquierda, denominador, out=np.zeros_like(u), where=denominador > 0)
+            d[:, j] = (1.0 - alfa)[:, None] * d[:, j - 1] + alfa[:, None] * d[:, j]
+    return d[:, grado]
+
+
+def _derivada(cvs, nudos, grado):
+    """Puntos de control, nudos y grado de la curva derivada."""
+    diferencias = nudos[grado + 1:grado + len(cvs)] - nudos[1:len(cvs)]
+    factor = np.divide(grado, diferencias, out=np.zeros_like(diferencias), where=diferencias > 0)
+    return (cvs[1:] - cvs[:-1]) * factor[:, None], nudos[1:-1], grado - 1
+
+
+class CurvaBSpline:
+    """
+    Curva B-spline definida por sus CVs (N, 3), el grado y el vector de nudos completo
+    (N + grado + 1 valores; por defecto abierto y uniforme).
+    """
+
+    def __init__(self, cvs, grado=3, nudos=None):
+        self.cvs = np.asarray(cvs, dtype=np.float64)
+        self.grado = min(grado, len(self.cvs) - 1)
+        self.nudos = nudos_uniformes(len(self.cvs), self.grado) if nudos is None \
+            else np.asarray(nudos, dtype=np.float64)
+        if len(self.nudos) != len(self.cvs) + self.grado + 1:
+            raise ValueError(f"Se esperaban {len(self.cvs) + self.grado + 1} nudos, hay {len(self.nudos)}")
+        self._derivadas = {}
+        self._tabla = None
+
+    @property
+    def dominio(self):
+        return float(self.nudos[self.grado]), float(self.nudos[len(self.cvs)])
+
+    def _curva_derivada(self, orden):
+        if orden not in self._derivadas:
+            cvs, nudos, grado = self.cvs, self.nudos, self.grado
+            for _ in range(orden):
+                if grado == 0:
+                    cvs = np.zeros((1, self.cvs.shape[1]))
+                    nudos = np.array([self.nudos[0], self.nudos[-1]])
+                    break
+                cvs, nudos, grado = _derivada(cvs, nudos, grado)
+            self._derivadas[orden] = (cvs, nudos, grado)
+        return self._derivadas[orden]
+
+    def posiciones(self, parametros):
+        return _de_boor(self.cvs, self.nudos, self.grado, np.atleast_1d(parametros))
+
+    def derivadas(self, parametros, orden=1):
+        cvs, nudos, grado = self._curva_derivada(orden)
+        return _de_boor(cvs, nudos, grado, np.atleast_1d(parametros))
+
+    def tangentes(self, parametros):
+        """Tangentes unitarias (M, 3)."""
+        d = self.derivadas(parametros, 1)
+        norma = np.linalg.norm(d, axis=1, keepdims=True)
+        return np.divide(d, norma, out=np.zeros_like(d), where=norma > 0)
+
+    def curvatura(self, parametros):
+        """|C' x C''| / |C'|^3 para cada parámetro (0 en tramos rectos)."""
+        d1 = self.derivadas(parametros, 1)
+        d2 = self.derivadas(parametros, 2)
+        velocidad = np.linalg.norm(d1, axis=1)
+        return np.divide(np.linalg.norm(np.cross(d1, d2), axis=1), velocidad ** 3,
+                         out=np.zeros_like(velocidad), where=velocidad > 1e-12)
+
+    # --- Longitud de arco ---
+
+    def tabla_longitud(self, muestras_por_tramo=16):
+        """
+        Tabla (parámetros, longitud acumulada) integrando |C'(u)| con Gauss-Legendre entre
+        muestras. Cada tramo de nudos se subdivide para que la tabla sea exacta en las
+        uniones de tramos (curvas de grado 1 incluidas).
+        """
+        if self._tabla is None:
+            nudos = np.unique(self.nudos[self.grado:len(self.cvs) + 1])
+            parametros = np.concatenate([
+                np.linspace(a, b, muestras_por_tramo, endpoint=False) for a, b in zip(nudos[:-1], nudos[1:])
+            ] + [nudos[-1:]])
+            a, b = parametros[:-1], parametros[1:]
+            nodos = a[:, None] + (b - a)[:, None] * _GL_X[None, :]
+            velocidad = np.linalg.norm(self.derivadas(nodos.ravel(), 1), axis=1).reshape(nodos.shape)
+            tramos = (velocidad * _GL_W[None, :]).sum(axis=1) * (b - a)
+            self._tabla = (parametros, np.concatenate([[0.0], np.cumsum(tramos)]))
+        return self._tabla
+
+    def longitud(self):
+        return float(self.tabla_longitud()[1][-1])
+
+    def _longitud_hasta(self, u):
+        """Longitud de arco exacta desde el inicio hasta cada parámetro (tabla + resto)."""
+        parametros, longitudes = self.tabla_longitud()
+        j = np.clip(np.searchsorted(parametros, u, side="right") - 1, 0, len(parametros) - 2)
+        inicio = parametros[j]
+        nodos = inicio[:, None] + (u - inicio)[:, None] * _GL_X[None, :]
+        velocidad = np.linalg.norm(self.derivadas(nodos.ravel(), 1), axis=1).reshape(nodos.shape)
+        return longitudes[j] + (velocidad * _GL_W[None, :]).sum(axis=1) * (u - inicio)
+
+    def parametros_por_longitud(self, distancias, iteraciones=2):
+        """
+        Parámetros a las distancias de arco indicadas desde el inicio de la curva:
+        interpolación en la tabla refinada con pasos de Newton sobre la longitud exacta.
+        """
+        parametros, longitudes = self.tabla_longitud()
+        distancias = np.clip(np.atleast_1d(np.asarray(distancias, dtype=np.float64)), 0.0, longitudes[-1])
+        u = np.interp(distancias, longitudes, parametros)
+        inicio, fin = self.dominio
+        for _ in range(iteraciones):
+            velocidad = np.linalg.norm(self.derivadas(u, 1), axis=1)
+            paso = np.divide(self._longitud_hasta(u) - distancias, velocidad,
+                             out=np.zeros_like(u), where=velocidad > 1e-12)
+            u = np.clip(u - paso, inicio, fin)
+        return u
+
+    def parametros_uniformes(self, cantidad):
+        """`cantidad` parámetros repartidos a igual longitud de arco, extremos incluidos."""
+        return self.parametros_por_longitud(np.linspace(0.0, self.longitud(), cantidad))
+
+    def muestrear(self, cantidad):
+        """Puntos (cantidad, 3) a igual distancia a lo largo de la curva."""
+        return self.posiciones(self.parametros_uniformes(cantidad))
+
+
+def curva_desde_maya(curva, espacio_mundo=True):
+    """CurvaBSpline con los CVs, nudos y grado de una nurbsCurve de la escena. Requiere Maya."""
+    import maya.api.OpenMaya as om
+
+    sel = om.MSelectionList()
+    sel.add(curva)
+    dag = sel.getDagPath(0)
+    dag.extendToShape()
+    fn_curva = om.MFnNurbsCurve(dag)
+
+    espacio = om.MSpace.kWorld if espacio_mundo else om.MSpace.kObject
+    cvs = np.array([[p.x, p.y, p.z] for p in fn_curva.cvPositions(espacio)])
+    return CurvaBSpline(cvs, fn_curva.degree, nudos_desde_maya(fn_curva.knots()))
@@ -10,3 +10,7 @@ CONFIG_JSON = os.getenv("CONFIG_JSON")
 
 with open(CONFIG_JSON, "r") as f:
     CONFIG = json.load(f)
+
+CARPETA_CACHE = os.getenv("CARPETA_CACHE") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), ".cache"
+)
@@ -1,22 +1,68 @@
 import maya.cmds as cmds
-from Utils.config import CONFIG
+import maya.api.OpenMaya as om
+import numpy as np
+import json
 import random
+import time
+from Utils.config import CONFIG
+from Utils.bbox_cache import obtener_cache_cajas
+from Utils.deform_kernel import escala_final, centro_caja, escalar_desde_pivote, desplazamientos_escala
 
+ATRIBUTO_TARGETS = "qapTargets"
 
-def aplicar_deformaciones(parte, objeto_generado):
+
+def indices_de_set(set_name):
     """
-    Aplica deformaciones a partir de los objectSets definidos en CONFIG[parte]["deformaciones"].
-    Cada deformación toma un set de edges o vértices y realiza un escalado aleatorio controlado.
+    Resuelve un selection set a arrays de índices de vértice por malla, sin pasar por
+    strings de componentes. Si el set tiene vértices se usan solo esos; si solo tiene
+    edges, se convierten a sus vértices.
+
+    Returns:
+        {ruta del shape: np.ndarray de índices únicos}.
     """
+    sel = om.MSelectionList()
+    sel.add(set_name)
+    miembros = om.MFnSet(sel.getDependNode(0)).getMembers(flatten=False)
+
+    vertices, edges = {}, {}
+    for i in range(miembros.length()):
+        try:
+            dag, componente = miembros.getComponent(i)
+        except RuntimeError:
+            continue  # miembro que no es DAG
+        if componente.isNull():
+            continue
+        dag.extendToShape()
+        ruta = dag.fullPathName()
+        if componente.apiType() == om.MFn.kMeshVertComponent:
+            vertices.setdefault(ruta, []).extend(om.MFnSingleIndexedComponent(componente).getElements())
+        elif componente.apiType() == om.MFn.kMeshEdgeComponent:
+            iterador = om.MItMeshEdge(dag, componente)
+            lista = edges.setdefault(ruta, [])
+            while not iterador.isDone():
+                lista.extend((iterador.vertexId(0), iterador.vertexId(1)))
+                iterador.next()
+
+    origen = vertices if vertices else edges
+    return {ruta: np.unique(np.asarray(indices, dtype=np.int64)) for ruta, indices in origen.items() if indices}
+
+
+def _fn_mesh(ruta):
+    sel = om.MSelectionList()
+    sel.add(ruta)
+    return om.MFnMesh(sel.getDagPath(0))
 
-    if parte not in CONFIG or "deformaciones" not in CONFIG[parte]:
-        return
 
-    deformaciones = CONFIG[parte]["deformaciones"]
-    if not deformaciones:
+def _deformaciones_activas(parte, prefijo_sets=""):
+    """
+    Recorre CONFIG[parte]["deformaciones"] y produce (def_data, set, índices por malla)
+    de las activas cuyo set (precedido de prefijo_sets, p. ej. un namespace) existe y
+    tiene vértices.
+    """
+    if parte not in CONFIG or "deformaciones" not in CONFIG[parte]:
         return
 
-    for def_data in deformaciones:
+    for def_data in CONFIG[parte]["deformaciones"] or []:
         # Saltar deformaciones desactivadas
         if not def_data.get("activo", True):
             print(
@@ -25,27 +71,41 @@ def aplicar_deformaciones(parte, objeto_generado):
             continue
 
         set_name = def_data.get("selection_set")
-        if not set_name or not cmds.objExists(set_name):
-            print(f"[!] Selection set no encontrado: {set_name}")
+        if not set_name or not cmds.objExists(prefijo_sets + set_name):
+            print(f"[!] Selection set no encontrado: {prefijo_sets}{set_name}")
             continue
 
-        # Obtener los componentes del set
-        componentes = cmds.sets(set_name, query=True)
-        if not componentes:
-            print(f"[!] Set vacío: {set_name}")
+        indices = indices_de_set(prefijo_sets + set_name)
+        if not indices:
+            print(f"[!] No se encontraron vértices en {set_name}")
             continue
 
-        # Determinar tipo (edge o vértice)
-        edges = [c for c in componentes if ".e[" in c]
-        verts = [c for c in componentes if ".vtx[" in c]
+        yield def_data, set_name, indices
 
-        if edges and not verts:
-            verts = cmds.polyListComponentConversion(edges, toVertex=True)
-            verts = cmds.ls(verts, flatten=True)
 
-        if not verts:
-            print(f"[!] No se encontraron vértices en {set_name}")
-            continue
+def _leer_puntos(malla):
+    return np.array(_fn_mesh(malla).getPoints(om.MSpace.kWorld))[:, :3]
+
+
+def _escribir_puntos(malla, puntos):
+    _fn_mesh(malla).setPoints(om.MPointArray(puntos.tolist()), om.MSpace.kWorld)
+
+
+def aplicar_deformaciones(parte, objeto_generado):
+    """
+    Aplica deformaciones a partir de los objectSets definidos en CONFIG[parte]["deformaciones"].
+    Cada deformación toma un set de edges o vértices y realiza un escalado aleatorio controlado.
+    Los sets se resuelven a índices enteros, los puntos de cada malla se leen una vez, los
+    escalados se aplican en NumPy y cada malla se escribe con un solo setPoints.
+    """
+
+    inicio = time.perf_counter()
+    puntos = {}  # ruta del shape -> (N, 3) en espacio mundo, leída una sola vez
+
+    for def_data, set_name, indices in _deformaciones_activas(parte):
+        for malla in indices:
+            if malla not in puntos:
+                puntos[malla] = _leer_puntos(malla)
 
         # --- Escalado aleatorio controlado ---
         base_scale = def_data.get("escala", [1, 1, 1])
@@ -53,19 +113,133 @@ def aplicar_deformaciones(parte, objeto_generado):
         ejes = def_data.get("ejes", [1, 1, 1])
 
         factor = random.uniform(rango_random[0], rango_random[1])
-        escala_final = [base_scale[i] * factor if ejes[i] else 1.0 for i in range(3)]
+        escala = escala_final(base_scale, factor, ejes)
 
-        # Calcular el centro del grupo de vértices usando bounding box
-        bbox = cmds.exactWorldBoundingBox(verts)
-        centro = [
-            (bbox[0] + bbox[3]) / 2.0,
-            (bbox[1] + bbox[4]) / 2.0,
-            (bbox[2] + bbox[5]) / 2.0,
-        ]
+        # Pivote en el centro de la caja de los vértices del set
+        centro = centro_caja(puntos, indices)
+        for malla, idx in indices.items():
+            escalar_desde_pivote(puntos[malla], idx, escala, centro)
 
-        # Aplicar la escala
-        cmds.xform(verts, scale=escala_final, ws=True, pivots=centro)
+        print(f"[✓] {parte}: {set_name} escalado {escala.round(3).tolist()} (factor {factor:.3f})")
 
-        print(f"[✓] {parte}: {set_name} escalado {escala_final} (factor {factor:.3f})")
+    for malla, array in puntos.items():
+        _escribir_puntos(malla, array)
+    if puntos and cmds.objExists(objeto_generado):
+        obtener_cache_cajas().invalidar(objeto_generado)
 
+    if puntos:
+        vertices = sum(len(a) for a in puntos.values())
+        print(f"[i] {parte}: {len(puntos)} mallas ({vertices} vértices) deformadas en "
+              f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
     cmds.select(clear=True)
+
+
+def _nombre_target(set_name):
+    """Nombre válido de nodo (y alias del peso) a partir del nombre del set."""
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in set_name)
+
+
+def nombre_blendshape(transform):
+    """Nombre del blendShape de targets de deformación de una malla."""
+    return transform.split("|")[-1] + "_deformaciones_BS"
+
+
+def crear_targets_deformacion(parte, objeto_generado, prefijo_sets=""):
+    """
+    Hornea cada deformación activa de CONFIG[parte]["deformaciones"] como un target de
+    blendShape (uno por malla afectada). La malla base queda en el extremo inferior de
+    rango_random y el peso 1 corresponde al superior, así que el escalado es exacto para
+    cualquier peso y cambiar de forma solo requiere escribir pesos (aleatorizar_forma).
+    Los desplazamientos se calculan sobre la malla sin deformar, de modo que sets que se
+    solapan se suman en vez de encadenarse.
+    prefijo_sets se antepone a los nombres de los sets (p. ej. el namespace de la copia
+    del pool donde se hornean).
+
+    Returns:
+        Lista de nodos blendShape creados.
+    """
+    inicio = time.perf_counter()
+    entradas = list(_deformaciones_activas(parte, prefijo_sets))
+    if not entradas:
+        return []
+
+    neutros = {malla: _leer_puntos(malla) for _, _, indices in entradas for malla in indices}
+    base = {malla: puntos.copy() for malla, puntos in neutros.items()}
+    targets = {}  # malla -> [(set, rango, índices, desplazamiento de mínimo a máximo)]
+
+    for def_data, set_name, indices in entradas:
+        base_scale = def_data.get("escala", [1, 1, 1])
+        rango_random = def_data.get("rango_random", [0.9, 1.1])
+        ejes = def_data.get("ejes", [1, 1, 1])
+
+        minimo = desplazamientos_escala(neutros, indices, escala_final(base_scale, rango_random[0], ejes))
+        maximo = desplazamientos_escala(neutros, indices, escala_final(base_scale, rango_random[1], ejes))
+        for malla, idx in indices.items():
+            base[malla][idx] += minimo[malla]
+            targets.setdefault(malla, []).append((set_name, rango_random, idx, maximo[malla] - minimo[malla]))
+
+    nodos = []
+    for malla, lista in targets.items():
+        _escribir_puntos(malla, base[malla])
+        transform = cmds.listRelatives(malla, parent=True, fullPath=True)[0]
+        blend, datos = None, {}
+
+        for i, (set_name, rango_random, idx, delta) in enumerate(lista):
+            copia = cmds.duplicate(transform, name=_nombre_target(set_name))[0]
+            cmds.delete(cmds.listRelatives(copia, children=True, type="transform", fullPath=True) or [])
+            forma = cmds.listRelatives(copia, shapes=True, type="mesh", noIntermediate=True, fullPath=True)[0]
+            objetivo = base[malla].copy()
+            objetivo[idx] += delta
+            _escribir_puntos(forma, objetivo)
+
+            if blend is None:
+                blend = cmds.blendShape(copia, transform, name=nombre_blendshape(transform),
+                                        origin="local", frontOfChain=True)[0]
+            else:
+                cmds.blendShape(blend, edit=True, target=(transform, i, copia, 1.0))
+            datos[cmds.aliasAttr(f"{blend}.w[{i}]", q=True)] = {"set": set_name, "rango": list(rango_random)}
+            cmds.delete(copia)
+
+        cmds.addAttr(blend, longName=ATRIBUTO_TARGETS, dataType="string")
+        cmds.setAttr(f"{blend}.{ATRIBUTO_TARGETS}", json.dumps(datos), type="string")
+        nodos.append(blend)
+
+    obtener_cache_cajas().invalidar(objeto_generado)
+    print(f"[✓] {parte}: {sum(len(l) for l in targets.values())} targets de deformación en "
+          f"{len(nodos)} blendShapes ({time.perf_counter() - inicio:.3f} s)")
+    cmds.select(clear=True)
+    return nodos
+
+
+def aleatorizar_forma(parte, objeto_generado=None):
+    """
+    Nueva forma para una parte ya generada con targets: escribe un peso aleatorio por
+    deformación (compartido por todas las mallas del set) sin reimportar ni tocar vértices.
+
+    Returns:
+        {set: factor equivalente dentro de rango_random}.
+    """
+    objeto = objeto_generado or f"{parte}_GENERADO"
+    if not cmds.objExists(objeto):
+        cmds.warning(f"No existe '{objeto}'.")
+        return {}
+
+    mallas = cmds.listRelatives(objeto, allDescendents=True, type="mesh", fullPath=True) or []
+    nodos = {b for b in cmds.ls(cmds.listHistory(mallas) if mallas else [], type="blendShape")
+             if cmds.attributeQuery(ATRIBUTO_TARGETS, node=b, exists=True)}
+    if not nodos:
+        cmds.warning(f"{parte} no tiene targets de deformación. Genera la parte con usar_blendshapes=True.")
+        return {}
+
+    pesos, factores = {}, {}
+    for blend in nodos:
+        for alias, datos in json.loads(cmds.getAttr(f"{blend}.{ATRIBUTO_TARGETS}")).items():
+            peso = pesos.setdefault(datos["set"], random.random())
+            cmds.setAttr(f"{blend}.{alias}", peso)
+            minimo, maximo = datos["rango"]
+            factores[datos["set"]] = minimo + peso * (maximo - minimo)
+
+    obtener_cache_cajas().invalidar(objeto)
+    for set_name, factor in factores.items():
+        print(f"[✓] {parte}: {set_name} factor {factor:.3f}")
+    return factores
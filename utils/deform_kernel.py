@@ -0,0 +1,51 @@
+"""
+Kernel NumPy de las deformaciones por selection set: escalados con pivote en el centro de
+la caja de los vértices afectados, aplicados sobre arrays de puntos completos e índices
+enteros. Utils.deform lee y escribe los puntos de cada malla una sola vez. Sin
+dependencias de Maya.
+"""
+
+import numpy as np
+
+
+def escala_final(base, factor, ejes):
+    """Escala por eje: base * factor en los ejes activos y 1.0 en el resto."""
+    return np.array([base[i] * factor if ejes[i] else 1.0 for i in range(3)], dtype=np.float64)
+
+
+def centro_caja(puntos_por_malla, indices_por_malla):
+    """
+    Centro de la caja que envuelve los vértices indicados de todas las mallas
+    (equivalente a exactWorldBoundingBox sobre los componentes).
+
+    Args:
+        puntos_por_malla: {malla: (N, 3)}.
+        indices_por_malla: {malla: array de índices}.
+    """
+    minimos, maximos = [], []
+    for malla, indices in indices_por_malla.items():
+        seleccion = puntos_por_malla[malla][indices]
+        minimos.append(seleccion.min(axis=0))
+        maximos.append(seleccion.max(axis=0))
+    return (np.min(minimos, axis=0) + np.max(maximos, axis=0)) * 0.5
+
+
+def escalar_desde_pivote(puntos, indices, escala, pivote):
+    """Escala en sitio los puntos indicados alrededor del pivote (ejes de mundo)."""
+    puntos[indices] = (puntos[indices] - pivote) * escala + pivote
+    return puntos
+
+
+
+def desplazamientos_escala(puntos_por_malla, indices_por_malla, escala):
+    """
+    Desplazamiento de cada vértice del set al escalarlo con `escala` alrededor del centro
+    de su caja, calculado sobre los puntos sin deformar.
+
+    Returns:
+        {malla: (len(indices), 3)}.
+    """
+    pivote = centro_caja(puntos_por_malla, indices_por_malla)
+    escala = np.asarray(escala, dtype=np.float64)
+    return {malla: (puntos_por_malla[malla][indices] - pivote) * (escala - 1.0)
+            for malla, indices in indices_por_malla.items()}
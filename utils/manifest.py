@@ -0,0 +1,307 @@
+"""
+Manifest persistente de las variantes de la librería de modelos (*_QAP_*.ma).
+Guarda por archivo: parte, hash, tamaño, mtime, bbox, número de vértices, locators y los
+índices de vértice de cada selection set de deformación, para poder elegir y validar
+variantes sin listar la carpeta ni importar nada. Se reconstruye de forma incremental:
+solo se vuelven a analizar los archivos cuyo tamaño/mtime (y hash) cambiaron.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from Utils.config import CARPETA_MODELOS, CARPETA_CACHE, CONFIG
+
+VERSION_MANIFEST = 1
+MARCA_VARIANTE = "_QAP_"
+EXTENSIONES_VARIANTE = (".ma",)
+_NAMESPACE_TEMPORAL = "qapManifest"
+
+
+def parte_de_archivo(archivo):
+    """'fuselaje_QAP_001.ma' -> 'FUSELAJE'."""
+    return archivo.split(MARCA_VARIANTE)[0].upper()
+
+
+def es_variante(archivo):
+    return MARCA_VARIANTE in archivo and archivo.lower().endswith(EXTENSIONES_VARIANTE)
+
+
+def hash_archivo(ruta, bloque=1 << 20):
+    """SHA-1 del contenido leyendo por bloques."""
+    sha = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for trozo in iter(lambda: f.read(bloque), b""):
+            sha.update(trozo)
+    return sha.hexdigest()
+
+
+def a_rangos(indices):
+    """[0, 1, 2, 5, 7, 8] -> [[0, 2], [5, 5], [7, 8]] (como los vtx[a:b] de Maya)."""
+    rangos = []
+    for i in sorted(set(indices)):
+        if rangos and i == rangos[-1][1] + 1:
+            rangos[-1][1] = i
+        else:
+            rangos.append([i, i])
+    return rangos
+
+
+def expandir_rangos(rangos):
+    """Inversa de a_rangos."""
+    return [i for inicio, fin in rangos for i in range(inicio, fin + 1)]
+
+
+def sin_namespace(nombre):
+    """'|grupo|ns:objeto' -> 'objeto'."""
+    return nombre.split("|")[-1].split(":")[-1]
+
+
+def tipo_archivo(ruta):
+    return "mayaBinary" if ruta.lower().endswith(".mb") else "mayaAscii"
+
+
+def vertices_de_sets(nodos):
+    """
+    Vértices de cada objectSet (no shadingEngine) entre los nodos indicados. Requiere Maya.
+
+    Returns:
+        {set: {objeto: [[inicio, fin], ...]}} con nombres sin namespace.
+    """
+    import maya.cmds as cmds
+
+    sets = {}
+    for conjunto in cmds.ls(nodos, type="objectSet"):
+        if cmds.nodeType(conjunto) != "objectSet":
+            continue  # shadingEngine y otros derivados
+        miembros = cmds.sets(conjunto, query=True) or []
+        componentes = cmds.polyListComponentConversion(miembros, toVertex=True) or []
+        por_malla = {}
+        for vtx in cmds.ls(componentes, flatten=True):
+            coincidencia = re.match(r"(.+)\.vtx\[(\d+)\]$", vtx)
+            if coincidencia:
+                malla = sin_namespace(coincidencia.group(1))
+                por_malla.setdefault(malla, []).append(int(coincidencia.group(2)))
+        sets[sin_namespace(conjunto)] = {m: a_rangos(v) for m, v in por_malla.items()}
+    return sets
+
+
+def extraer_metadatos_maya(ruta):
+    """
+    Importa la variante en un namespace temporal, extrae bbox, vértices, locators y los
+    vértices de cada objectSet, y borra lo importado. Requiere Maya.
+    """
+    import maya.cmds as cmds
+
+    if cmds.namespace(exists=_NAMESPACE_TEMPORAL):
+        cmds.namespace(removeNamespace=_NAMESPACE_TEMPORAL, deleteNamespaceContent=True)
+
+    nuevos = cmds.file(
+        ruta, i=True, type=tipo_archivo(ruta), ignoreVersion=True, namespace=_NAMESPACE_TEMPORAL,
+        returnNewNodes=True, options="v=0;", pr=True
+    ) or []
+
+    try:
+        mallas = [m for m in cmds.ls(nuevos, type="mesh", long=True)
+                  if not cmds.getAttr(m + ".intermediateObject")]
+        bbox = cmds.exactWorldBoundingBox(mallas) if mallas else [0.0] * 6
+        vertices = sum(cmds.polyEvaluate(m, vertex=True) for m in mallas)
+
+        locators = sorted({
+            sin_namespace(t) for t in cmds.ls(nuevos, type="transform")
+            if "LOC" in sin_namespace(t)
+        })
+
+        sets = vertices_de_sets(nuevos)
+    finally:
+        cmds.namespace(removeNamespace=_NAMESPACE_TEMPORAL, deleteNamespaceContent=True)
+
+    return {
+        "bbox": [round(v, 6) for v in bbox],
+        "mallas": len(mallas),
+        "vertices": int(vertices),
+        "locators": locators,
+        "sets": sets,
+    }
+
+
+class ManifestVariantes:
+    """
+    Índice persistente de variantes.
+
+    Args:
+        carpeta: Carpeta de modelos (por defecto CARPETA_MODELOS).
+        ruta: Archivo JSON del manifest (por defecto en la carpeta de caché).
+    """
+
+    def __init__(self, carpeta=None, ruta=None):
+        self.carpeta = carpeta or CARPETA_MODELOS
+        self.ruta = ruta or os.path.join(CARPETA_CACHE, "manifest_variantes.json")
+        self.variantes_por_archivo = {}
+        self.cargar()
+
+    # --- Persistencia ---
+
+    def cargar(self):
+        if not os.path.exists(self.ruta):
+            self.variantes_por_archivo = {}
+            return
+        with open(self.ruta, "r") as f:
+            datos = json.load(f)
+        if datos.get("version") != VERSION_MANIFEST or datos.get("carpeta") != self.carpeta:
+            self.variantes_por_archivo = {}
+            return
+        self.variantes_por_archivo = datos.get("variantes", {})
+
+    def guardar(self):
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w") as f:
+            json.dump({"version": VERSION_MANIFEST, "carpeta": self.carpeta,
+                       "variantes": self.variantes_por_archivo}, f, indent=1)
+        os.replace(temporal, self.ruta)
+
+    # --- Reconstrucción incremental ---
+
+    def cambios(self):
+        """
+        Compara la carpeta con el manifest usando solo tamaño y mtime.
+
+        Returns:
+            Tupla (cambiados: {archivo: stat}, eliminados: [archivo]).
+        """
+        actuales = {}
+        with os.scandir(self.carpeta) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and es_variante(entrada.name):
+                    actuales[entrada.name] = entrada.stat()
+
+        cambiados = {
+            archivo: stat for archivo, stat in actuales.items()
+            if archivo not in self.variantes_por_archivo
+            or self.variantes_por_archivo[archivo]["tamanio"] != stat.st_size
+            or self.variantes_por_archivo[archivo]["mtime"] != stat.st_mtime
+        }
+        eliminados = [a for a in self.variantes_por_archivo if a not in actuales]
+        return cambiados, eliminados
+
+    def actualizar(self, extractor=extraer_metadatos_maya, forzar=False):
+        """
+        Reconstruye el manifest de forma incremental y lo guarda.
+
+        Args:
+            extractor: Función ruta -> metadatos (por defecto importa en Maya).
+            forzar: Vuelve a analizar todas las variantes.
+
+        Returns:
+            Dict con las cuentas: analizadas, solo_stat, eliminadas, sin_cambios, segundos.
+        """
+        inicio = time.perf_counter()
+        if forzar:
+            self.variantes_por_archivo = {}
+        cambiados, eliminados = self.cambios()
+
+        analizadas = solo_stat = 0
+        for archivo, stat in sorted(cambiados.items()):
+            ruta = os.path.join(self.carpeta, archivo)
+            contenido = hash_archivo(ruta)
+            anterior = self.variantes_por_archivo.get(archivo)
+
+            if anterior and anterior["hash"] == contenido:
+                # Solo cambió el mtime (copia, touch): no hace falta volver a importar
+                anterior["tamanio"], anterior["mtime"] = stat.st_size, stat.st_mtime
+                solo_stat += 1
+                continue
+
+            entrada = {"parte": parte_de_archivo(archivo), "hash": contenido,
+                       "tamanio": stat.st_size, "mtime": stat.st_mtime}
+            entrada.update(extractor(ruta))
+            self.variantes_por_archivo[archivo] = entrada
+            analizadas += 1
+
+        for archivo in eliminados:
+            del self.variantes_por_archivo[archivo]
+
+        self.guardar()
+        resumen = {
+            "analizadas": analizadas,
+            "solo_stat": solo_stat,
+            "eliminadas": len(eliminados),
+            "sin_cambios": len(self.variantes_por_archivo) - analizadas - solo_stat,
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
+        print(f"[✓] Manifest de variantes actualizado: {resumen}")
+        return resumen
+
+    # --- Consultas (sin tocar el sistema de archivos) ---
+
+    def __len__(self):
+        return len(self.variantes_por_archivo)
+
+    def variantes(self, parte):
+        """Archivos de variante de la parte, según el manifest."""
+        return sorted(a for a, datos in self.variantes_por_archivo.items()
+                      if datos["parte"] == parte.upper())
+
+    def info(self, archivo):
+        return self.variantes_por_archivo.get(archivo)
+
+    def vertices_de_set(self, archivo, selection_set):
+        """{malla: [índices]} del selection set en la variante (vacío si no existe)."""
+        sets = self.variantes_por_archivo.get(archivo, {}).get("sets", {})
+        return {malla: expandir_rangos(r) for malla, r in sets.get(selection_set, {}).items()}
+
+    def validar(self, archivo, parte=None, estricto=False):
+        """
+        Comprueba la variante contra CONFIG: geometría presente y locators requeridos.
+        Con estricto=True también exige los selection sets de deformación propios de la
+        variante (sin ellos la deformación solo se salta, no impide generar la parte).
+
+        Returns:
+            Lista de problemas (vacía si es válida).
+        """
+        datos = self.variantes_por_archivo.get(archivo)
+        if datos is None:
+            return [f"{archivo} no está en el manifest"]
+
+        parte = (parte or datos["parte"]).upper()
+        config = CONFIG.get(parte, {})
+        problemas = []
+
+        if not datos.get("vertices"):
+            problemas.append("sin geometría")
+
+        for locator in config.get("locator_names", []):
+            if locator not in datos.get("locators", []):
+                problemas.append(f"falta el locator {locator}")
+
+        if not estricto:
+            return problemas
+
+        prefijo = os.path.splitext(archivo)[0]
+        for deformacion in config.get("deformaciones", []):
+            nombre_set = deformacion.get("selection_set", "")
+            if deformacion.get("activo", True) and nombre_set.startswith(prefijo) \
+                    and not datos.get("sets", {}).get(nombre_set):
+                problemas.append(f"falta o está vacío el set {nombre_set}")
+
+        return problemas
+
+    def variantes_validas(self, parte):
+        return [a for a in self.variantes(parte) if not self.validar(a, parte)]
+
+
+_manifest = None
+
+
+def obtener_manifest():
+    """Manifest compartido de la librería de modelos (se carga una vez por sesión)."""
+    global _manifest
+    if _manifest is None:
+        _manifest = ManifestVariantes()
+    return _manifest
+
+
+if __name__ == "__main__":
+    obtener_manifest().actualizar()
@@ -0,0 +1,183 @@
+"""
+Librería de ruido procedural (gradient/Perlin y simplex) vectorizada con NumPy.
+Cada semilla genera una tabla de permutación que se calcula una sola vez y se
+reutiliza. Sin dependencias de Maya: la comparten terreno, nubes y materiales.
+"""
+
+import math
+from functools import lru_cache
+import numpy as np
+
+# Direcciones de gradiente en 2D (8 direcciones, las diagonales normalizadas)
+_D = 1.0 / math.sqrt(2.0)
+_GRADIENTES = np.array([
+    [_D, _D], [-_D, _D], [_D, -_D], [-_D, -_D],
+    [1.0, 0.0], [-1.0, 0.0], [0.0, 1.0], [0.0, -1.0],
+])
+
+_F2 = 0.5 * (math.sqrt(3.0) - 1.0)
+_G2 = (3.0 - math.sqrt(3.0)) / 6.0
+
+
+@lru_cache(maxsize=32)
+def tabla_permutacion(seed):
+    """
+    Tabla de permutación de 512 entradas (256 duplicadas) para una semilla.
+    Se guarda en caché: pedir la misma semilla no vuelve a barajar.
+    """
+    rng = np.random.default_rng(int(seed))
+    perm = rng.permutation(256).astype(np.intp)
+    tabla = np.concatenate([perm, perm])
+    tabla.setflags(write=False)
+    return tabla
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def _gradiente(perm, hash_, x, y):
+    g = _GRADIENTES[perm[hash_] & 7]
+    return g[..., 0] * x + g[..., 1] * y
+
+
+class Ruido:
+    """
+    Generador de ruido con semilla.
+
+    Args:
+        seed: Semilla; define la tabla de permutación y los desplazamientos por octava.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = int(seed)
+        self.perm = tabla_permutacion(self.seed)
+        rng = np.random.default_rng(self.seed + 1)
+        # Desplazamientos por octava para que las octavas no queden alineadas
+        self._offsets = rng.uniform(-1000.0, 1000.0, size=(32, 2))
+
+    def perlin(self, x, y):
+        """Ruido de gradiente (Perlin mejorado) en 2D. Rango aproximado [-1, 1]."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        perm = self.perm
+
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+        xf = x - x0
+        yf = y - y0
+        xi = x0.astype(np.intp) & 255
+        yi = y0.astype(np.intp) & 255
+
+        u = _fade(xf)
+        v = _fade(yf)
+
+        a = perm[xi] + yi
+        b = perm[xi + 1] + yi
+
+        n00 = _gradiente(perm, a, xf, yf)
+        n10 = _gradiente(perm, b, xf - 1.0, yf)
+        n01 = _gradiente(perm, a + 1, xf, yf - 1.0)
+        n11 = _gradiente(perm, b + 1, xf - 1.0, yf - 1.0)
+
+        nx0 = n00 + u * (n10 - n00)
+        nx1 = n01 + u * (n11 - n01)
+        return (nx0 + v * (nx1 - nx0)) * math.sqrt(2.0)
+
+    def simplex(self, x, y):
+        """Ruido simplex en 2D. Rango aproximado [-1, 1]."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        perm = self.perm
+
+        s = (x + y) * _F2
+        i = np.floor(x + s)
+        j = np.floor(y + s)
+        t = (i + j) * _G2
+        x0 = x - (i - t)
+        y0 = y - (j - t)
+
+        i1 = (x0 > y0).astype(np.intp)
+        j1 = 1 - i1
+
+        x1 = x0 - i1 + _G2
+        y1 = y0 - j1 + _G2
+        x2 = x0 - 1.0 + 2.0 * _G2
+        y2 = y0 - 1.0 + 2.0 * _G2
+
+        ii = i.astype(np.intp) & 255
+        jj = j.astype(np.intp) & 255
+
+        total = np.zeros(np.broadcast(x, y).shape)
+        esquinas = (
+            (x0, y0, ii + perm[jj]),
+            (x1, y1, ii + i1 + perm[jj + j1]),
+            (x2, y2, ii + 1 + perm[jj + 1]),
+        )
+        for cx, cy, hash_ in esquinas:
+            atenuacion = np.maximum(0.5 - cx * cx - cy * cy, 0.0)
+            atenuacion *= atenuacion
+            total += atenuacion * atenuacion * _gradiente(perm, hash_, cx, cy)
+
+        return total * 99.0
+
+    def _base(self, tipo):
+        if tipo == "perlin":
+            return self.perlin
+        if tipo == "simplex":
+            return self.simplex
+        raise ValueError(f"Tipo de ruido desconocido: {tipo}")
+
+    def fbm(self, x, y, octavas=4, lacunaridad=2.0, ganancia=0.5, base="simplex"):
+        """Fractional Brownian motion: suma de octavas normalizada a [-1, 1]."""
+        ruido = self._base(base)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        total = np.zeros(np.broadcast(x, y).shape)
+        amplitud = 1.0
+        frecuencia = 1.0
+        suma_amplitudes = 0.0
+
+        for octava in range(octavas):
+            ox, oy = self._offsets[octava % len(self._offsets)]
+            total += amplitud * ruido(x * frecuencia + ox, y * frecuencia + oy)
+            suma_amplitudes += amplitud
+            amplitud *= ganancia
+            frecuencia *= lacunaridad
+
+        return total / suma_amplitudes
+
+    def ridged(self, x, y, octavas=4, lacunaridad=2.0, ganancia=0.5, base="simplex"):
+        """Ruido multifractal de crestas (picos afilados). Rango [0, 1]."""
+        ruido = self._base(base)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        total = np.zeros(np.broadcast(x, y).shape)
+        peso = np.ones_like(total)
+        amplitud = 1.0
+        frecuencia = 1.0
+        suma_amplitudes = 0.0
+
+        for octava in range(octavas):
+            ox, oy = self._offsets[octava % len(self._offsets)]
+            senal = 1.0 - np.abs(ruido(x * frecuencia + ox, y * frecuencia + oy))
+            senal = senal * senal * peso
+            peso = np.clip(senal * 2.0, 0.0, 1.0)
+
+            total += senal * amplitud
+            suma_amplitudes += amplitud
+            amplitud *= ganancia
+            frecuencia *= lacunaridad
+
+        return total / suma_amplitudes
+
+    def warp(self, x, y, octavas=4, intensidad=1.5, base="simplex"):
+        """fBm con domain warping: las coordenadas se desplazan con otro fBm."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        qx = self.fbm(x, y, octavas, base=base)
+        qy = self.fbm(x + 5.2, y + 1.3, octavas, base=base)
+        return self.fbm(x + intensidad * qx, y + intensidad * qy, octavas, base=base)
@@ -0,0 +1,126 @@
+import maya.cmds as cmds
+import time
+
+
+class FinalizadorNormales:
+    """
+    Servicio único de finalización de normales (suavizado de aristas y corrección de winding).
+    Recuerda por UUID qué mallas ya están finalizadas, así que ninguna se procesa dos veces
+    aunque la pidan varios pasos del build, y aplica cada lote con una sola llamada.
+    Lleva la cuenta de mallas procesadas/omitidas y del tiempo por etapa.
+    """
+
+    def __init__(self):
+        self._finalizadas = {}  # uuid -> ángulo de suavizado aplicado
+        self.etapas = {}
+
+    def _mallas(self, objetos):
+        """Shapes de malla (sin repetir instancias) de los objetos o grupos indicados."""
+        if isinstance(objetos, str):
+            objetos = [objetos]
+        mallas = {}
+        for objeto in objetos:
+            if not cmds.objExists(objeto):
+                continue
+            if cmds.objectType(objeto) == "mesh":
+                encontradas = cmds.ls(objeto, long=True)
+            else:
+                encontradas = cmds.listRelatives(objeto, allDescendents=True, type="mesh", fullPath=True) or []
+            for malla in encontradas:
+                if cmds.getAttr(malla + ".intermediateObject"):
+                    continue
+                mallas.setdefault(cmds.ls(malla, uuid=True)[0], malla)
+        return mallas
+
+    def _registrar(self, etapa, procesadas, omitidas, inicio):
+        datos = self.etapas.setdefault(etapa, {"procesadas": 0, "omitidas": 0, "segundos": 0.0})
+        datos["procesadas"] += procesadas
+        datos["omitidas"] += omitidas
+        datos["segundos"] += time.perf_counter() - inicio
+        return {"etapa": etapa, "procesadas": procesadas, "omitidas": omitidas,
+                "segundos": time.perf_counter() - inicio}
+
+    def pendientes(self, objetos, angulo=180):
+        """Mallas de los objetos que aún no están finalizadas con ese ángulo: {uuid: ruta}."""
+        return {uuid: malla for uuid, malla in self._mallas(objetos).items()
+                if self._finalizadas.get(uuid) != angulo}
+
+    def suavizar(self, objetos, etapa="general", angulo=180):
+        """
+        Suaviza las aristas de las mallas pendientes con una sola llamada a polySoftEdge.
+
+        Returns:
+            Dict con etapa, procesadas, omitidas y segundos.
+        """
+        inicio = time.perf_counter()
+        todas = self._mallas(objetos)
+        pendientes = {uuid: malla for uuid, malla in todas.items()
+                      if self._finalizadas.get(uuid) != angulo}
+
+        if pendientes:
+            cmds.polySoftEdge(list(pendientes.values()), angle=angulo, ch=False)
+            for uuid in pendientes:
+                self._finalizadas[uuid] = angulo
+
+        return self._registrar(etapa, len(pendientes), len(todas) - len(pendientes), inicio)
+
+    def corregir(self, objetos, etapa="general", angulo=180):
+        """
+        Congela transformaciones, borra historial, unifica el winding y suaviza, todo por lotes
+        y solo sobre las mallas que no estaban finalizadas.
+        """
+        inicio = time.perf_counter()
+        todas = self._mallas(objetos)
+        pendientes = {uuid: malla for uuid, malla in todas.items()
+                      if self._finalizadas.get(uuid) != angulo}
+
+        if pendientes:
+            mallas = list(pendientes.values())
+            padres = []
+            for malla in mallas:
+                for padre in cmds.listRelatives(malla, parent=True, fullPath=True) or []:
+                    if padre not in padres:
+                        padres.append(padre)
+
+            cmds.makeIdentity(padres, apply=True, translate=True, rotate=True, scale=True)
+            cmds.delete(padres, ch=True)
+            mallas = cmds.ls(list(pendientes.keys()), long=True)  # rutas válidas tras borrar historial
+            cmds.polyNormalPerVertex(mallas, unFreezeNormal=True)
+            cmds.polyNormal(mallas, normalMode=2, userNormalMode=0, ch=False)
+            cmds.polySoftEdge(mallas, angle=angulo, ch=False)
+            for uuid in pendientes:
+                self._finalizadas[uuid] = angulo
+
+        return self._registrar(etapa, len(pendientes), len(todas) - len(pendientes), inicio)
+
+    def marcar(self, objetos, etapa="general", angulo=180):
+        """Registra como finalizadas mallas cuyas normales ya se escribieron de otra forma."""
+        inicio = time.perf_counter()
+        mallas = self._mallas(objetos)
+        for uuid in mallas:
+            self._finalizadas[uuid] = angulo
+        return self._registrar(etapa, 0, len(mallas), inicio)
+
+    def invalidar(self, objetos):
+        """Olvida las mallas indicadas para que se vuelvan a procesar (p. ej. tras editarlas)."""
+        for uuid in self._mallas(objetos):
+            self._finalizadas.pop(uuid, None)
+
+    def reporte(self):
+        """Imprime y devuelve las cuentas acumuladas por etapa."""
+        for etapa, datos in self.etapas.items():
+            print(f"  {etapa:<20} procesadas={datos['procesadas']:<5} "
+                  f"omitidas={datos['omitidas']:<5} {datos['segundos']:.3f} s")
+        return dict(self.etapas)
+
+    def reiniciar(self):
+        self._finalizadas.clear()
+        self.etapas.clear()
+
+
+_finalizador = FinalizadorNormales()
+
+
+def obtener_finalizador():
+    """Instancia compartida del servicio de normales para toda la sesión."""
+    return _finalizador
@@ -0,0 +1,257 @@
+"""
+Preprocesado offline de la librería de modelos: abre cada variante *_QAP_*.ma, le corrige
+las normales una sola vez (congelar, borrar historial, winding y suavizado) y la guarda
+como .mb junto al original. generar_parte usa el .mb si está al día y se salta la
+corrección en tiempo de generación.
+
+Se puede lanzar desde Maya (preprocesar_variantes()) o por línea de comandos:
+    mayapy utils/preproceso.py [--forzar] [--trabajadores N]
+Los archivos se reparten entre varios procesos mayapy que trabajan en paralelo; el proceso
+principal no necesita Maya.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.config import CARPETA_MODELOS
+from Utils.manifest import es_variante, hash_archivo
+
+VERSION_PREPROCESO = 1
+ARCHIVO_INDICE = ".qap_preprocesado.json"
+_PREFIJO_RESULTADO = "QAP_RESULTADO "
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ruta_binaria(ruta):
+    """'.../ala_QAP_001.ma' -> '.../ala_QAP_001.mb'."""
+    return os.path.splitext(ruta)[0] + ".mb"
+
+
+def ruta_mayapy():
+    """mayapy a usar para los trabajadores: $MAYAPY o el que está junto al ejecutable actual."""
+    if os.getenv("MAYAPY"):
+        return os.getenv("MAYAPY")
+    nombre = "mayapy.exe" if os.name == "nt" else "mayapy"
+    return os.path.join(os.path.dirname(sys.executable), nombre)
+
+
+# --- Índice de archivos preprocesados ---
+
+def _ruta_indice(carpeta):
+    return os.path.join(carpeta, ARCHIVO_INDICE)
+
+
+def cargar_indice(carpeta=None):
+    """{archivo.ma: {hash, tamanio, mtime, mb_tamanio, mb_mtime}} (vacío si no existe o es de otra versión)."""
+    ruta = _ruta_indice(carpeta or CARPETA_MODELOS)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r") as f:
+        datos = json.load(f)
+    if datos.get("version") != VERSION_PREPROCESO:
+        return {}
+    return datos.get("archivos", {})
+
+
+def guardar_indice(indice, carpeta=None):
+    ruta = _ruta_indice(carpeta or CARPETA_MODELOS)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w") as f:
+        json.dump({"version": VERSION_PREPROCESO, "archivos": indice}, f, indent=1)
+    os.replace(temporal, ruta)
+
+
+def _binario_intacto(ruta_ma, entrada):
+    """El .mb existe y es el que escribió el preprocesado."""
+    ruta_mb = ruta_binaria(ruta_ma)
+    if not os.path.exists(ruta_mb):
+        return False
+    stat = os.stat(ruta_mb)
+    return entrada.get("mb_tamanio") == stat.st_size and entrada.get("mb_mtime") == stat.st_mtime
+
+
+def ruta_preprocesada(ruta, indice=None):
+    """
+    Ruta del .mb preprocesado de la variante si está al día (comprobando solo tamaño y
+    mtime, sin leer el contenido); None si hay que usar el .ma.
+    """
+    if indice is None:
+        indice = cargar_indice(os.path.dirname(ruta))
+    entrada = indice.get(os.path.basename(ruta))
+    if entrada is None or not os.path.exists(ruta):
+        return None
+    stat = os.stat(ruta)
+    if entrada["tamanio"] != stat.st_size or entrada["mtime"] != stat.st_mtime:
+        return None
+    return ruta_binaria(ruta) if _binario_intacto(ruta, entrada) else None
+
+
+def pendientes(carpeta=None, indice=None, forzar=False):
+    """
+    Variantes cuyo .mb falta o no corresponde al contenido actual del .ma.
+    Si solo cambió el mtime (mismo hash) se actualiza el índice sin reprocesar.
+
+    Returns:
+        Tupla (pendientes: {archivo: hash}, al_dia: int).
+    """
+    carpeta = carpeta or CARPETA_MODELOS
+    indice = cargar_indice(carpeta) if indice is None else indice
+    por_procesar, al_dia = {}, 0
+
+    with os.scandir(carpeta) as entradas:
+        archivos = sorted(e.name for e in entradas
+                          if e.is_file() and es_variante(e.name) and e.name.lower().endswith(".ma"))
+
+    for archivo in archivos:
+        ruta = os.path.join(carpeta, archivo)
+        entrada = indice.get(archivo)
+        if not forzar and entrada and _binario_intacto(ruta, entrada):
+            stat = os.stat(ruta)
+            if entrada["tamanio"] == stat.st_size and entrada["mtime"] == stat.st_mtime:
+                al_dia += 1
+                continue
+            contenido = hash_archivo(ruta)
+            if entrada["hash"] == contenido:
+                entrada["tamanio"], entrada["mtime"] = stat.st_size, stat.st_mtime
+                al_dia += 1
+                continue
+            por_procesar[archivo] = contenido
+        else:
+            por_procesar[archivo] = hash_archivo(ruta)
+
+    return por_procesar, al_dia
+
+
+# --- Trabajador (dentro de mayapy) ---
+
+def procesar_archivo(ruta):
+    """
+    Abre la variante, corrige las normales de todas sus mallas y la guarda como .mb.
+    Requiere Maya (GUI o standalone); reemplaza la escena abierta.
+    """
+    import maya.cmds as cmds
+    from Utils.normales import FinalizadorNormales
+
+    cmds.file(new=True, force=True)
+    cmds.file(ruta, open=True, force=True, ignoreVersion=True, options="v=0;", prompt=False)
+
+    raices = [r for r in cmds.ls(assemblies=True, long=True)
+              if not cmds.listRelatives(r, shapes=True, type="camera")]
+    conteo = FinalizadorNormales().corregir(raices, etapa="preproceso")
+    cmds.fileInfo("qapPreprocesado", str(VERSION_PREPROCESO))
+
+    ruta_mb = ruta_binaria(ruta)
+    cmds.file(rename=ruta_mb)
+    cmds.file(save=True, type="mayaBinary", force=True)
+    return conteo["procesadas"]
+
+
+def _trabajador(rutas):
+    """Punto de entrada de cada proceso mayapy: procesa sus archivos e informa por stdout."""
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        for ruta in rutas:
+            inicio = time.perf_counter()
+            try:
+                mallas = procesar_archivo(ruta)
+                resultado = {"archivo": os.path.basename(ruta), "mallas": mallas}
+            except Exception as e:
+                resultado = {"archivo": os.path.basename(ruta), "error": str(e)}
+            resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+            print(_PREFIJO_RESULTADO + json.dumps(resultado), flush=True)
+    finally:
+        maya.standalone.uninitialize()
+
+
+def _lanzar_trabajador(rutas, mayapy):
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [_RAIZ_PROYECTO, entorno.get("PYTHONPATH")]))
+    proceso = subprocess.run(
+        [mayapy, os.path.abspath(__file__), "--trabajador", *rutas],
+        env=entorno, capture_output=True, text=True
+    )
+    resultados = [json.loads(linea[len(_PREFIJO_RESULTADO):])
+                  for linea in proceso.stdout.splitlines() if linea.startswith(_PREFIJO_RESULTADO)]
+    procesados = {r["archivo"] for r in resultados}
+    for ruta in rutas:
+        if os.path.basename(ruta) not in procesados:
+            error = proceso.stderr.strip().splitlines()[-1:] or [f"código {proceso.returncode}"]
+            resultados.append({"archivo": os.path.basename(ruta), "error": error[0]})
+    return resultados
+
+
+# --- Orquestación ---
+
+def preprocesar_variantes(carpeta=None, trabajadores=None, forzar=False, mayapy=None):
+    """
+    Genera los .mb preprocesados de las variantes nuevas o modificadas.
+
+    Args:
+        carpeta: Carpeta de modelos (por defecto CARPETA_MODELOS).
+        trabajadores: Procesos mayapy en paralelo (por defecto núm. de CPUs - 1, máx. 4).
+        forzar: Reprocesa todas las variantes.
+        mayapy: Intérprete de Maya para los trabajadores (por defecto ruta_mayapy()).
+
+    Returns:
+        Dict con las cuentas: procesadas, al_dia, errores, segundos.
+    """
+    inicio = time.perf_counter()
+    carpeta = carpeta or CARPETA_MODELOS
+    indice = cargar_indice(carpeta)
+    por_procesar, al_dia = pendientes(carpeta, indice, forzar)
+
+    resultados = []
+    if por_procesar:
+        trabajadores = trabajadores or max(1, min(4, (os.cpu_count() or 2) - 1))
+        trabajadores = min(trabajadores, len(por_procesar))
+        rutas = [os.path.join(carpeta, a) for a in por_procesar]
+        lotes = [rutas[i::trabajadores] for i in range(trabajadores)]
+        mayapy = mayapy or ruta_mayapy()
+        with ThreadPoolExecutor(max_workers=trabajadores) as ejecutor:
+            for lote in ejecutor.map(lambda l: _lanzar_trabajador(l, mayapy), lotes):
+                resultados.extend(lote)
+
+    errores = {}
+    for resultado in resultados:
+        archivo = resultado["archivo"]
+        if "error" in resultado:
+            errores[archivo] = resultado["error"]
+            indice.pop(archivo, None)
+            print(f"[!] Error preprocesando {archivo}: {resultado['error']}")
+            continue
+        ruta = os.path.join(carpeta, archivo)
+        stat, stat_mb = os.stat(ruta), os.stat(ruta_binaria(ruta))
+        indice[archivo] = {"hash": por_procesar[archivo], "tamanio": stat.st_size, "mtime": stat.st_mtime,
+                           "mb_tamanio": stat_mb.st_size, "mb_mtime": stat_mb.st_mtime}
+
+    for archivo in [a for a in indice if not os.path.exists(os.path.join(carpeta, a))]:
+        del indice[archivo]
+    guardar_indice(indice, carpeta)
+
+    resumen = {
+        "procesadas": len(resultados) - len(errores),
+        "al_dia": al_dia,
+        "errores": len(errores),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    print(f"[✓] Preprocesado de variantes: {resumen}")
+    return resumen
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ["--trabajador"]:
+        _trabajador(argumentos[1:])
+    else:
+        num = int(argumentos[argumentos.index("--trabajadores") + 1]) if "--trabajadores" in argumentos else None
+        en_mayapy = os.path.basename(sys.executable).lower().startswith("mayapy")
+        preprocesar_variantes(trabajadores=num, forzar="--forzar" in argumentos,
+                              mayapy=sys.executable if en_mayapy else None)
@@ -0,0 +1,132 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+ATRIBUTOS = {"rol": "qapRol", "parte": "qapParte", "lado": "qapLado", "orden": "qapOrden"}
+
+
+def valores_atributos(rol, parte="", lado="", orden=0):
+    """{atributo qap*: valor} con que se marca un nodo (para escribirlos dentro de un lote)."""
+    valores = {"rol": rol, "parte": parte or "", "lado": lado or "", "orden": int(orden)}
+    return {ATRIBUTOS[clave]: valor for clave, valor in valores.items()}
+
+
+class IndiceEscena:
+    """
+    Registro de los nodos que genera el pipeline (partes, locators, joints, controles y
+    targets del rig). Cada nodo se marca al crearlo con los atributos qapRol, qapParte,
+    qapLado y qapOrden y se guarda por UUID, así que las búsquedas son accesos a diccionario
+    que no dependen del tamaño de la escena. Al abrir una escena el índice se reconstruye a
+    partir de los atributos.
+    """
+
+    def __init__(self):
+        self._por_clave = {}  # (rol, parte, lado) -> {uuid: orden}
+        self._por_uuid = {}   # uuid -> (rol, parte, lado, orden)
+        self._callbacks = []
+
+    def _escuchar_escena(self):
+        if self._callbacks:
+            return
+        self._callbacks = [
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, lambda *_: self.vaciar()),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, lambda *_: self.reconstruir()),
+        ]
+
+    def _guardar(self, uuid, rol, parte, lado, orden):
+        self._olvidar(uuid)
+        self._por_uuid[uuid] = (rol, parte, lado, orden)
+        self._por_clave.setdefault((rol, parte, lado), {})[uuid] = orden
+
+    def _olvidar(self, uuid):
+        anterior = self._por_uuid.pop(uuid, None)
+        if anterior is not None:
+            self._por_clave.get(anterior[:3], {}).pop(uuid, None)
+
+    def registrar(self, nodo, rol, parte="", lado="", orden=0):
+        """Marca el nodo con sus atributos qap* y lo añade al índice. Devuelve el nodo."""
+        for atributo, valor in valores_atributos(rol, parte, lado, orden).items():
+            if not cmds.attributeQuery(atributo, node=nodo, exists=True):
+                if isinstance(valor, int):
+                    cmds.addAttr(nodo, longName=atributo, attributeType="long")
+                else:
+                    cmds.addAttr(nodo, longName=atributo, dataType="string")
+            if isinstance(valor, int):
+                cmds.setAttr(f"{nodo}.{atributo}", valor)
+            else:
+                cmds.setAttr(f"{nodo}.{atributo}", valor, type="string")
+
+        self.anotar(cmds.ls(nodo, uuid=True)[0], rol, parte, lado, orden)
+        return nodo
+
+    def anotar(self, uuid, rol, parte="", lado="", orden=0):
+        """Añade al índice un nodo cuyos atributos qap* ya están escritos (p. ej. por un lote de rig)."""
+        self._escuchar_escena()
+        self._guardar(uuid, rol, parte or "", lado or "", int(orden))
+
+    def buscar(self, rol, parte="", lado=""):
+        """
+        Nodos (rutas completas) con ese rol, parte y lado, ordenados por qapOrden.
+        Los que ya no existen en la escena se descartan del índice.
+        """
+        entradas = self._por_clave.get((rol, parte or "", lado or ""), {})
+        nodos = []
+        for uuid, orden in sorted(entradas.items(), key=lambda e: e[1]):
+            ruta = cmds.ls(uuid, long=True)
+            if ruta:
+                nodos.append(ruta[0])
+            else:
+                self._olvidar(uuid)
+        return nodos
+
+    def buscar_todos(self, rol):
+        """Nodos con ese rol de cualquier parte y lado, ordenados por qapOrden."""
+        nodos = []
+        for parte, lado in [clave[1:] for clave in self._por_clave if clave[0] == rol]:
+            nodos.extend(self.buscar(rol, parte, lado))
+        return sorted(nodos, key=lambda nodo: self.datos(nodo)["orden"])
+
+    def primero(self, rol, parte="", lado=""):
+        nodos = self.buscar(rol, parte, lado)
+        return nodos[0] if nodos else None
+
+    def datos(self, nodo):
+        """{rol, parte, lado, orden} del nodo, o None si no está registrado."""
+        uuids = cmds.ls(nodo, uuid=True)
+        entrada = self._por_uuid.get(uuids[0]) if uuids else None
+        return dict(zip(ATRIBUTOS, entrada)) if entrada else None
+
+    def buscar_o_escanear(self, rol, patron, parte="", lado="", tipo="transform"):
+        """
+        Búsqueda en el índice con respaldo a cmds.ls(patron) para escenas construidas antes
+        de que existiera el índice (ordenado por nombre corto, como los sufijos _001, _002...).
+        """
+        return self.buscar(rol, parte, lado) or sorted(
+            cmds.ls(patron, type=tipo, long=True) or [], key=lambda nodo: nodo.split("|")[-1]
+        )
+
+    def reconstruir(self):
+        """Vuelve a llenar el índice a partir de los atributos qap* de la escena."""
+        self.vaciar()
+        self._escuchar_escena()
+        for nodo in cmds.ls(f"*.{ATRIBUTOS['rol']}", objectsOnly=True, recursive=True) or []:
+            valores = [cmds.getAttr(f"{nodo}.{ATRIBUTOS[c]}") if cmds.attributeQuery(ATRIBUTOS[c], node=nodo, exists=True)
+                       else None for c in ATRIBUTOS]
+            rol, parte, lado, orden = valores
+            self._guardar(cmds.ls(nodo, uuid=True)[0], rol, parte or "", lado or "", orden or 0)
+        return len(self._por_uuid)
+
+    def vaciar(self):
+        self._por_clave.clear()
+        self._por_uuid.clear()
+
+
+_indice = None
+
+
+def obtener_indice():
+    """Índice de nodos generados compartido por la sesión (se reconstruye una vez al pedirlo)."""
+    global _indice
+    if _indice is None:
+        _indice = IndiceEscena()
+        _indice.reconstruir()
+    return _indice
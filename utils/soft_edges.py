@@ -1,8 +1,11 @@
 import maya.cmds as cmds
+from Utils.normales import obtener_finalizador
 
 def soften_edges_en_grupo(nombre_grupo, angle=180, keep_history=False, verbose=True):
     """
     Aplica polySoftEdge a todas las mallas dentro de un grupo.
+    Sin historial se delega en el servicio de normales: una sola llamada por grupo y
+    las mallas ya suavizadas se omiten.
     """
     grupos = cmds.ls(nombre_grupo, long=True) or []
     if not grupos:
@@ -10,6 +13,18 @@ def soften_edges_en_grupo(nombre_grupo, angle=180, keep_history=False, verbose=T
             cmds.warning(f"No se encontró ningún nodo que coincida con '{nombre_grupo}'.")
         return []
 
+    if not keep_history:
+        finalizador = obtener_finalizador()
+        applied = []
+        for grp in grupos:
+            pendientes = list(finalizador.pendientes(grp, angle).values())
+            conteo = finalizador.suavizar(grp, etapa="soften_grupo", angulo=angle)
+            applied.extend(pendientes)
+            if verbose:
+                print(f"Soften edge en '{grp}': {conteo['procesadas']} mallas, "
+                      f"{conteo['omitidas']} ya suavizadas")
+        return applied
+
     applied = []
     for grp in grupos:
         meshes = cmds.listRelatives(grp, allDescendents=True, type='mesh', fullPath=True) or []
@@ -1,11 +1,30 @@
 import os
+import json
 import random
 import maya.cmds as cmds
 from Utils.config import CARPETA_MODELOS, CONFIG
-from Utils.deform import aplicar_deformaciones
+from Utils.deform import aplicar_deformaciones, crear_targets_deformacion, aleatorizar_forma
+from Utils.normales import obtener_finalizador
+from Utils.manifest import obtener_manifest, tipo_archivo
+from Utils.preproceso import ruta_preprocesada
+from Utils.asset_pool import obtener_pool
+from Utils.bbox_cache import obtener_cache_cajas
+from Utils.scene_index import obtener_indice
 
 
 def obtener_variantes(parte):
+    """
+    Variantes disponibles de la parte. Si hay manifest se usa (sin listar la carpeta) y se
+    descartan las variantes que no pasan la validación; si no, se lista la carpeta.
+    """
+    manifest = obtener_manifest()
+    if len(manifest):
+        validas = manifest.variantes_validas(parte)
+        for archivo in manifest.variantes(parte):
+            if archivo not in validas:
+                print(f"[!] Variante descartada {archivo}: {', '.join(manifest.validar(archivo, parte))}")
+        return validas
+
     prefijo = parte.lower() + "_QAP_"
     return [
         f
@@ -14,7 +33,11 @@ def obtener_variantes(parte):
     ]
 
 def corregir_normales_forzado(objeto):
-    """Corrige normales y winding de todas las mallas dentro del objeto."""
+    """
+    Corrige normales y winding de todas las mallas dentro del objeto.
+    Usa el servicio compartido de normales: las mallas ya finalizadas se omiten y el
+    resto se procesa con una llamada por paso. Devuelve las cuentas de la etapa.
+    """
     if not cmds.objExists(objeto):
         cmds.warning(f"El objeto '{objeto}' no existe.")
         return
@@ -24,19 +47,31 @@ def corregir_normales_forzado(objeto):
         cmds.warning(f"No se encontraron meshes dentro de '{objeto}'.")
         return
 
-    for mesh in meshes:
-        parent = cmds.listRelatives(mesh, parent=True, fullPath=True)[0]
-        cmds.makeIdentity(parent, apply=True, translate=True, rotate=True, scale=True)
-        cmds.delete(parent, ch=True)
-        cmds.polyNormalPerVertex(mesh, unFreezeNormal=True)
-        cmds.polyNormal(mesh, normalMode=2, userNormalMode=0, ch=False)
-        cmds.polySoftEdge(mesh, angle=180, ch=False)
-
+    conteo = obtener_finalizador().corregir(objeto, etapa="partes")
     cmds.select(clear=True)
+    return conteo
+
+
+
+def _colocar(parte, grupo):
+    """Posición, rotación y escala de CONFIG[parte]."""
+    _colocar(parte, grupo)
+
 
+def _hornear_targets(parte):
+    """
+    Horneado de targets para el pool: la copia se coloca como la parte generada (los
+    desplazamientos se calculan en espacio de mundo) y se devuelve al origen; los targets
+    quedan en espacio local, así que sirven a cualquier copia colocada igual.
+    """
+    def hornear(grupo, prefijo_sets):
+        _colocar(parte, grupo)
+        crear_targets_deformacion(parte, grupo, prefijo_sets=prefijo_sets)
+        cmds.xform(grupo, translation=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1))
+    return hornear
 
 
-def generar_parte(parte, manejar_locators=True):
+def generar_parte(parte, manejar_locators=True, usar_pool=True, usar_blendshapes=False):
     variantes = obtener_variantes(parte)
     if not variantes:
         cmds.warning(f"No se encontraron modelos para {parte}")
@@ -44,31 +79,56 @@ def generar_parte(parte, manejar_locators=True):
 
     nombre_existente = f"{parte}_GENERADO"
     if cmds.objExists(nombre_existente):
+        obtener_cache_cajas().invalidar(nombre_existente)
         cmds.delete(nombre_existente)
         print(f"Se eliminó la versión anterior de {parte}")
 
     archivo = random.choice(variantes)
     ruta = os.path.join(CARPETA_MODELOS, archivo)
+    ruta_mb = ruta_preprocesada(ruta)
+    if ruta_mb:
+        # Versión binaria con las normales ya horneadas por el preprocesado offline
+        ruta = ruta_mb
+
+    if usar_pool:
+        # Copia desde el pool de la escena: el archivo solo se lee la primera vez
+        if usar_blendshapes:
+            # Targets horneados una vez por variante en el pool: la copia trae sus blendShapes
+            grupo, nuevos = obtener_pool().instanciar(
+                ruta, nombre_existente, hornear=_hornear_targets(parte),
+                clave=json.dumps(CONFIG.get(parte, {}), sort_keys=True),
+            )
+        else:
+            grupo, nuevos = obtener_pool().instanciar(ruta, nombre_existente)
+        if grupo is None:
+            cmds.warning(f"No se detectó objeto tras importar {archivo}")
+            return
+        print(f"[✓] {parte} copiado del pool desde {archivo} con {len(nuevos)} nodos")
+    else:
+        antes = set(cmds.ls(assemblies=True))
+        cmds.file(
+            ruta, i=True, type=tipo_archivo(ruta), ignoreVersion=True, ra=True,
+            mergeNamespacesOnClash=False, options="v=0;", pr=True
+        )
+        despues = set(cmds.ls(assemblies=True))
+        nuevos = list(despues - antes)
 
-    antes = set(cmds.ls(assemblies=True))
-    cmds.file(
-        ruta, i=True, type="mayaAscii", ignoreVersion=True, ra=True,
-        mergeNamespacesOnClash=False, options="v=0;", pr=True
-    )
-    despues = set(cmds.ls(assemblies=True))
-    nuevos = list(despues - antes)
+        if not nuevos:
+            cmds.warning(f"No se detectó objeto tras importar {archivo}")
+            return
 
-    if not nuevos:
-        cmds.warning(f"No se detectó objeto tras importar {archivo}")
-        return
+        # Agrupar todo lo importado bajo un mismo grupo
+        grupo = cmds.group(nuevos, n=nombre_existente)
+        print(f"[✓] {parte} importado desde {archivo} con {len(nuevos)} nodos")
 
-    # Agrupar todo lo importado bajo un mismo grupo
-    grupo = cmds.group(nuevos, n=nombre_existente)
-    print(f"[✓] {parte} importado desde {archivo} con {len(nuevos)} nodos")
+    indice = obtener_indice()
+    indice.registrar(grupo, "parte", parte=parte)
 
     # Si manejar_locators=True, preservar locators y no aplicarles transformaciones
     if manejar_locators:
         locators = cmds.ls(f"{nombre_existente}|*LOC*", type="transform")
+        for orden, locator in enumerate(locators, 1):
+            indice.registrar(locator, "locator", parte=parte, orden=orden)
         if locators:
             print(f"[i] {len(locators)} locators detectados en {parte}: {locators}")
         else:
@@ -80,18 +140,26 @@ def generar_parte(parte, manejar_locators=True):
             cmds.delete(locs)
             print(f"[i] Locators eliminados de {parte}")
 
-    data = CONFIG.get(parte, {})
-    cmds.move(*data.get("posicion", [0, 0, 0]), grupo)
-    cmds.rotate(*data.get("rotacion", [0, 0, 0]), grupo)
-    cmds.scale(*data.get("escala", [1, 1, 1]), grupo)
+    _colocar(parte, grupo)
 
-    corregir_normales_forzado(grupo)
+    if ruta_mb:
+        obtener_finalizador().marcar(grupo, etapa="partes_preprocesadas")
+    else:
+        # Las copias del pool ya vienen corregidas y marcadas: el servicio las omite
+        corregir_normales_forzado(grupo)
 
     print(f"[✓] {parte} generado correctamente con forzado aplicado")
 
     # 🔹 === APLICAR DEFORMACIONES AQUÍ === 🔹
     try:
-        aplicar_deformaciones(parte, grupo)
+        if usar_blendshapes:
+            if not usar_pool:
+                # Sin pool no hay copia donde reutilizarlos: se hornean sobre esta importación
+                crear_targets_deformacion(parte, grupo)
+            # Con los targets presentes, cada forma nueva son solo pesos
+            aleatorizar_forma(parte, grupo)
+        else:
+            aplicar_deformaciones(parte, grupo)
         print(f"[✓] Deformaciones aplicadas a {parte}")
     except Exception as e:
         print(f"[!] Error aplicando deformaciones a {parte}: {e}")